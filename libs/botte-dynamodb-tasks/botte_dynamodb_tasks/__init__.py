@@ -1,2 +1,3 @@
+from .batch_writer import *  # noqa: F403
 from .botte_message_dynamodb_task import *  # noqa: F403
 from .exceptions import *  # noqa: F403
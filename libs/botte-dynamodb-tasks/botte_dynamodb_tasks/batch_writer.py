@@ -0,0 +1,94 @@
+"""
+Write tasks to the DynamoDB task queue with BatchWriteItem, shared by the producers
+ (botte-dynamodb-client and Botte BE, when it enqueues HTTP messages).
+
+Tasks are written in chunks of 25 (a request per chunk), and the unprocessed items in
+ a response (fi. because of throttling) are retried with exponential backoff and full
+ jitter.
+
+It takes the low-level Boto3 DynamoDB client (`boto3.client("dynamodb")`), as the
+ items are in the DynamoDB JSON format (`BotteMessageDynamodbTask.to_dynamodb_item()`),
+ but Boto3 is not a dependency of this lib.
+
+```py
+import boto3
+import botte_dynamodb_tasks
+
+written_tasks = []
+try:
+    for tasks in botte_dynamodb_tasks.iter_batch_write_tasks(
+        boto3.client("dynamodb"), "botte-be-task-prod", all_tasks
+    ):
+        written_tasks += tasks
+except botte_dynamodb_tasks.UnprocessedItemsError as exc:
+    print(f"Not written: {exc.tasks}")
+```
+"""
+
+import random
+import time
+from collections.abc import Iterator
+
+from .botte_message_dynamodb_task import BATCH_WRITE_MAX_ITEMS, BotteMessageDynamodbTask
+from .exceptions import UnprocessedItemsError
+
+__all__ = [
+    "iter_batch_write_tasks",
+]
+
+BATCH_WRITE_MAX_RETRIES = 5
+BATCH_WRITE_BACKOFF_BASE_SECS = 0.05
+BATCH_WRITE_BACKOFF_MAX_SECS = 2.0
+
+
+def iter_batch_write_tasks(
+    client,
+    table_name: str,
+    tasks: list[BotteMessageDynamodbTask],
+    max_retries: int = BATCH_WRITE_MAX_RETRIES,
+    backoff_base_secs: float = BATCH_WRITE_BACKOFF_BASE_SECS,
+    backoff_max_secs: float = BATCH_WRITE_BACKOFF_MAX_SECS,
+) -> Iterator[list[BotteMessageDynamodbTask]]:
+    """
+    Write the tasks with a BatchWriteItem request per chunk of 25 tasks, and retry
+     the unprocessed ones.
+
+    Args:
+        client: the low-level Boto3 DynamoDB client.
+        table_name: name of the DynamoDB table used as task queue.
+        tasks: the tasks to write.
+        max_retries: max number of retries for the unprocessed items in a
+         BatchWriteItem response; then `UnprocessedItemsError` is raised.
+        backoff_base_secs: the backoff before the first retry, doubled at each retry.
+        backoff_max_secs: the max backoff.
+
+    Yields the tasks written by each BatchWriteItem request, as soon as they are
+     written. So, when it raises, the tasks not yielded yet are the ones not written.
+    Raise `UnprocessedItemsError`, with the tasks of the chunk not written, after
+     `max_retries`. The exceptions raised by the client (fi. botocore `ClientError`)
+     are not caught.
+    """
+    for i in range(0, len(tasks), BATCH_WRITE_MAX_ITEMS):
+        pending_tasks = tasks[i : i + BATCH_WRITE_MAX_ITEMS]
+        requests = [
+            {"PutRequest": {"Item": task.to_dynamodb_item()}} for task in pending_tasks
+        ]
+        n_retries = 0
+        while requests:
+            response = client.batch_write_item(RequestItems={table_name: requests})
+            # Retry the unprocessed requests as they are, as recommended by AWS.
+            requests = response.get("UnprocessedItems", {}).get(table_name, [])
+            unprocessed_sks = {x["PutRequest"]["Item"]["SK"]["S"] for x in requests}
+            yield [x for x in pending_tasks if x.sk not in unprocessed_sks]
+            pending_tasks = [x for x in pending_tasks if x.sk in unprocessed_sks]
+            if not requests:
+                break
+            if n_retries >= max_retries:
+                raise UnprocessedItemsError(pending_tasks)
+            # Exponential backoff with full jitter.
+            time.sleep(
+                random.uniform(
+                    0, min(backoff_max_secs, backoff_base_secs * 2**n_retries)
+                )
+            )
+            n_retries += 1
@@ -28,6 +28,7 @@ This lib provides means to create and parse tasks to be read and written to Bott
 
 ```py
 import json
+from collections.abc import Iterator
 from datetime import datetime, timezone
 import pytest
 from ksuid import KsuidMs
@@ -73,25 +74,44 @@ assert task.to_json() == json.dumps(
 """
 
 import json
-from datetime import timedelta, timezone
-from functools import lru_cache
+from collections.abc import Iterator
+from datetime import datetime, timedelta, timezone
 from typing import Any
 
 import datetime_utils
-from boto3.dynamodb.types import TypeDeserializer
 from ksuid import KsuidMs
 
-from . import exceptions
+from . import dynamodb_json, exceptions, ksuid_generator
 
 __all__ = [
     "BotteMessageDynamodbTask",
+    "ParsedRecord",
     "BOTTE_MESSAGE_TASK_ID",
+    "BATCH_WRITE_MAX_ITEMS",
 ]
 
 BOTTE_MESSAGE_TASK_ID = "BOTTE_MESSAGE"
+# Max number of items in a single DynamoDB BatchWriteItem request.
+BATCH_WRITE_MAX_ITEMS = 25
 
 
 class BotteMessageDynamodbTask:
+    # Slots to save memory, as producers and consumers might handle many tasks.
+    __slots__ = (
+        "text",
+        "sender_app",
+        "do_process_task_fifo",
+        "fifo_group_id",
+        "ksuid",
+        "expiration_ts",
+        # Memoised values, computed at most once, see `_memoise()`.
+        "_sk",
+        "_pk",
+        "_dict",
+        "_json",
+        "_dynamodb_item",
+    )
+
     def __init__(
         self,
         text: str,
@@ -125,29 +145,111 @@ class BotteMessageDynamodbTask:
              tests.
             expiration_ts: if you really want to customize the expiration; only useful
              in tests.
+
+        Mind that tasks are immutable, so the serialized forms (`to_dict()`,
+         `to_json()`, `to_dynamodb_item()`) are computed at most once per task.
         """
-        self.text = text
-        self.sender_app = sender_app
-        self.do_process_task_fifo = do_process_task_fifo
-        self.fifo_group_id = fifo_group_id
         if not ksuid:
             # Unique ID (like UUID), but with a timestamp info in it, and
             #  alphabetically sortable by timestamp.
             # Eg. str(KsuidMs()) -> '2XfZrNMydhTvwyWlHdzJPdz3wuA'.
             #  And: KsuidMs.from_base62('2XfZrNMydhTvwyWlHdzJPdz3wuA').
-            ksuid = KsuidMs()
-        self.ksuid = ksuid
+            # Monotonic, so tasks created in the same millisecond are still sorted by
+            #  creation order (see ksuid_generator.py).
+            ksuid = ksuid_generator.next_ksuid()
         # Mind that ExpirationTs is configured as automatic TTL in the DynamoDB Table.
         # Note that the deletion happens eventually, within 2 days.
         if not expiration_ts:
             # It's Unix epoch time format in seconds (UTC of course).
             ksuid_date = ksuid.datetime.astimezone(timezone.utc)
             expiration_ts = round((ksuid_date + timedelta(hours=1)).timestamp())
-        self.expiration_ts = expiration_ts
+
+        for name, value in (
+            ("text", text),
+            ("sender_app", sender_app),
+            ("do_process_task_fifo", do_process_task_fifo),
+            ("fifo_group_id", fifo_group_id),
+            ("ksuid", ksuid),
+            ("expiration_ts", expiration_ts),
+            ("_sk", None),
+            ("_pk", None),
+            ("_dict", None),
+            ("_json", None),
+            ("_dynamodb_item", None),
+        ):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __reduce__(self) -> tuple:
+        # For copy and pickle, which otherwise restore the attributes with
+        #  `setattr()`, that raises. The memoised values are computed again.
+        return (
+            self.__class__,
+            (
+                self.text,
+                self.sender_app,
+                self.do_process_task_fifo,
+                self.fifo_group_id,
+                self.ksuid,
+                self.expiration_ts,
+            ),
+        )
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(pk={self.pk!r}, sk={self.sk!r})"
+
+    def _memoise(self, name: str, value: Any) -> Any:
+        object.__setattr__(self, name, value)
+        return value
+
+    @property
+    def sk(self) -> str:
+        """
+        The SK (sort key) of the DynamoDB record: the KSUID as string.
+        """
+        if self._sk is None:
+            if isinstance(self.ksuid, KsuidMs):
+                return self._memoise("_sk", _ksuid_to_base62(self.ksuid))
+            # An invalid ksuid: not memoised, `to_dict()` will raise.
+            return str(self.ksuid)
+        return self._sk
+
+    @property
+    def pk(self) -> str:
+        """
+        The PK (partition key) of the DynamoDB record.
+        """
+        if self._pk is None:
+            return self._memoise("_pk", self._make_pk())
+        return self._pk
+
+    def _make_pk(self) -> str:
+        # Create suffix for the PK (partition key).
+        # IMP: this DynamoDB record will trigger Botte Lambda (via DynamoDB Stream).
+        #  Lambda can process only records with different PK (partition key)
+        #  concurrently. While records with the same PK will be processed sequentially,
+        #  with the order determined by SK (sort key, alphabetically).
+        # So, first, make the suffix unique (using ksuid).
+        suffix = f"#{self.sk}"
+        # Second, if the consumer wants this task to be processed sequentially (FIFO)
+        #  then remove the suffix, so this task will have the common PK.
+        if self.do_process_task_fifo:
+            suffix = ""
+            # Third, if the consumer wants only the tasks in a group to be processed
+            #  sequentially (FIFO) then the suffix should be fifo_group_id.
+            if self.fifo_group_id:
+                suffix = f"#{self.fifo_group_id}"
+        return BOTTE_MESSAGE_TASK_ID + suffix
 
     def to_dict(self) -> dict:
         """
         Used by consumers to build the DynamoDB Item to INSERT.
+        It is a copy of the memoised dict, so the caller can mutate it.
 
         Using `aws-dynamodb-client` lib (which uses Boto3 lib) this dict will be
          converted to this JSON:
@@ -176,11 +278,20 @@ class BotteMessageDynamodbTask:
                 }
             }
         """
+        data = self._to_dict()
+        return {**data, "Payload": {**data["Payload"]}}
+
+    def _to_dict(self) -> dict:
+        # Memoised, so not to be mutated: used by `to_json()` and
+        #  `to_dynamodb_item()` with no copy.
+        if self._dict is not None:
+            return self._dict
+
         data = {
             # Partition key.
-            "PK": BOTTE_MESSAGE_TASK_ID,  # + something, done later one.
+            "PK": None,  # self.pk, assigned later on.
             # Sort key, used for sorting alphabetically and de-duplicating.
-            "SK": None,  # str(self.ksuid), assigned later on.
+            "SK": None,  # self.sk, assigned later on.
             "TaskId": BOTTE_MESSAGE_TASK_ID,
             "SenderApp": self.sender_app,
             "Payload": {
@@ -200,24 +311,8 @@ class BotteMessageDynamodbTask:
 
         if not isinstance(self.ksuid, KsuidMs):
             raise exceptions.ValidationError(f"ksuid must be KsuidMs: {self.ksuid}")
-        data["SK"] = str(self.ksuid)
-
-        # Create suffix for the PK (partition key).
-        # IMP: this DynamoDB record will trigger Botte Lambda (via DynamoDB Stream).
-        #  Lambda can process only records with different PK (partition key)
-        #  concurrently. While records with the same PK will be processed sequentially,
-        #  with the order determined by SK (sort key, alphabetically).
-        # So, first, make the suffix unique (using ksuid).
-        suffix = f"#{self.ksuid}"
-        # Second, if the consumer wants this task to be processed sequentially (FIFO)
-        #  then remove the suffix, so this task will have the common PK.
-        if self.do_process_task_fifo:
-            suffix = ""
-            # Third, if the consumer wants only the tasks in a group to be processed
-            #  sequentially (FIFO) then the suffix should be fifo_group_id.
-            if self.fifo_group_id:
-                suffix = f"#{self.fifo_group_id}"
-        data["PK"] += suffix
+        data["SK"] = self.sk
+        data["PK"] = self.pk
 
         try:
             datetime_utils.timestamp_to_utc_datetime(self.expiration_ts)
@@ -225,15 +320,94 @@ class BotteMessageDynamodbTask:
             raise exceptions.ValidationError(
                 f"ExpirationTs must be int timestamp: {self.expiration_ts}"
             ) from exc
-        return data
+        return self._memoise("_dict", data)
 
-    @lru_cache  # noqa: B019
     def to_json(self) -> str:
-        return json.dumps(self.to_dict(), sort_keys=True)
+        if self._json is None:
+            return self._memoise("_json", json.dumps(self._to_dict(), sort_keys=True))
+        return self._json
+
+    def to_dynamodb_item(self) -> dict[str, dict[str, Any]]:
+        """
+        The DynamoDB Item to INSERT, in the low-level DynamoDB JSON format, like:
+            {
+                "PK": {"S": "BOTTE_MESSAGE#34sVCw69dftbK1MSWtRkv6T8vGp"},
+                "SK": {"S": "34sVCw69dftbK1MSWtRkv6T8vGp"},
+                "TaskId": {"S": "BOTTE_MESSAGE"},
+                "SenderApp": {"S": "BOTTE_DYNAMODB_CLIENT_PYTESTS"},
+                "Payload": {"M": {"text": {"S": "Hello world!"}}},
+                "ExpirationTs": {"N": "1762002142"},
+            }
+        So it can be used directly with the low-level Boto3 client, with no further
+         serialization (by Boto3 `TypeSerializer`):
+            client.put_item(TableName=..., Item=task.to_dynamodb_item())
+            client.batch_write_item(
+                RequestItems={
+                    table_name: [{"PutRequest": {"Item": task.to_dynamodb_item()}}]
+                }
+            )
+        Mind that the dict is memoised: do not mutate it.
+        """
+        if self._dynamodb_item is None:
+            # `_to_dict()` does the validation.
+            return self._memoise(
+                "_dynamodb_item", dynamodb_json.serialize_item(self._to_dict())
+            )
+        return self._dynamodb_item
 
     @staticmethod
-    def _make_from_record(record: dict) -> "BotteMessageDynamodbTask":
+    def build_many(
+        texts: list[str],
+        sender_app: str,
+        do_process_task_fifo: bool = False,
+        fifo_group_id: str | None = None,
+        expiration_ts: int | None = None,
+        chunk_size: int = BATCH_WRITE_MAX_ITEMS,
+    ) -> list[list["BotteMessageDynamodbTask"]]:
         """
+        Build many tasks at once, one per text, chunked for DynamoDB bulk writes.
+
+        The KSUIDs are strictly increasing in the order of `texts`, even if they are
+         all created in the same millisecond. So, with `do_process_task_fifo`, Botte
+         sends the messages in the same order as `texts`.
+
+        Args:
+            texts: the texts of the Telegram messages.
+            sender_app: identifier of the sender app.
+            do_process_task_fifo: see `__init__()`.
+            fifo_group_id: see `__init__()`.
+            expiration_ts: see `__init__()`, default: 1 hour from now, the same for
+             all tasks.
+            chunk_size: max number of tasks in a chunk, default: the max number of
+             items in a BatchWriteItem request.
+
+        Returns a list of chunks of tasks, like:
+            [[task1, ..., task25], [task26, ...]]
+        """
+        if not expiration_ts:
+            expiration_ts = round(
+                (datetime_utils.now_utc() + timedelta(hours=1)).timestamp()
+            )
+        tasks = [
+            BotteMessageDynamodbTask(
+                text=text,
+                sender_app=sender_app,
+                do_process_task_fifo=do_process_task_fifo,
+                fifo_group_id=fifo_group_id,
+                ksuid=ksuid_generator.next_ksuid(),
+                expiration_ts=expiration_ts,
+            )
+            for text in texts
+        ]
+        return [tasks[i : i + chunk_size] for i in range(0, len(tasks), chunk_size)]
+
+    @staticmethod
+    def make_from_record(record: dict) -> "BotteMessageDynamodbTask":
+        """
+        Make a task from a single DynamoDB stream record.
+        Raise `ValidationError` if the record is not a valid task.
+        To parse many records, use `parse_event()` instead.
+
         Record format:
         {
             "eventID": "4d2ea43eb5fd2c78ef00c1ab5f403cb9",
@@ -282,6 +456,18 @@ class BotteMessageDynamodbTask:
             "eventSourceARN": "arn:aws:dynamodb:eu-south-1:477353422995:table/botte-be-task-prod/stream/2025-10-31T18:41:51.551"
         }
         """
+        return BotteMessageDynamodbTask._make_from_record(
+            record, _get_min_ksuid_timestamp()
+        )
+
+    @staticmethod
+    def _make_from_record(
+        record: dict, min_ksuid_timestamp: float
+    ) -> "BotteMessageDynamodbTask":
+        if not isinstance(record, dict):
+            raise exceptions.ValidationError(
+                f"Malformed DynamoDB stream record: {record}"
+            )
         event_name = record.get("eventName")
         if event_name != "INSERT":
             raise exceptions.ValidationError(
@@ -300,10 +486,15 @@ class BotteMessageDynamodbTask:
         sender_app = _deserialize(new_image.get("SenderApp"))
         payload = _deserialize(new_image.get("Payload"))
         # Mind that ExpirationTs is configured as automatic TTL.
-        expiration_ts = _deserialize(new_image.get("ExpirationTs"))
+        try:
+            expiration_ts = _deserialize(new_image.get("ExpirationTs"))
+        except exceptions.ValidationError as exc:
+            raise exceptions.ValidationError(
+                f"Invalid format for ExpirationTs: {new_image.get('ExpirationTs')}"
+            ) from exc
 
         # Validation.
-        if not pk:
+        if not pk or not isinstance(pk, str):
             raise exceptions.ValidationError(f"Invalid PK: {pk}")
         hash_pos = pk.find("#") if pk.find("#") > -1 else len(pk)
         if pk[:hash_pos] != BOTTE_MESSAGE_TASK_ID:
@@ -311,18 +502,20 @@ class BotteMessageDynamodbTask:
 
         try:
             # Unfortunately it seems to never raise even for invalid strings like "XXX".
-            ksuid = KsuidMs.from_base62(sk)
+            ksuid = _ksuid_from_base62(sk)
         except Exception as exc:
             raise exceptions.ValidationError(f"SK must be KsuidMs: {sk}") from exc
 
-        # Unfortunately KsuidMs.from_base62() seems to never raise even for invalid
+        # Unfortunately _ksuid_from_base62() seems to never raise even for invalid
         #  strings like "XXX", so we check the timestamp.
-        if (
-            not datetime_utils.timestamp_to_utc_datetime(int(ksuid.timestamp)).year
-            >= datetime_utils.now().year - 1
-        ):
+        if ksuid.timestamp < min_ksuid_timestamp:
             raise exceptions.ValidationError(f"SK must be KsuidMs: {sk}")
 
+        # Rebuild the FIFO options from the PK suffix, see the `pk` property.
+        pk_suffix = pk[hash_pos + 1 :]
+        do_process_task_fifo = pk_suffix != sk
+        fifo_group_id = pk_suffix if do_process_task_fifo and pk_suffix else None
+
         if task_id != BOTTE_MESSAGE_TASK_ID:
             raise exceptions.ValidationError(f"Invalid TaskId: {task_id}")
 
@@ -348,12 +541,80 @@ class BotteMessageDynamodbTask:
                 f"Invalid format for ExpirationTs: {expiration_ts}"
             ) from exc
 
-        return BotteMessageDynamodbTask(
+        task = BotteMessageDynamodbTask(
             text=text,
             sender_app=sender_app,
+            do_process_task_fifo=do_process_task_fifo,
+            fifo_group_id=fifo_group_id,
             ksuid=ksuid,
             expiration_ts=expiration_ts,
         )
+        # The SK and PK are already known, so no need to encode the KSUID again.
+        task._memoise("_sk", sk)
+        task._memoise("_pk", pk)
+        return task
+
+    @staticmethod
+    def parse_event(event: dict[str, Any]) -> list["ParsedRecord"]:
+        """
+        Parse all the records in a DynamoDB stream event.
+        Unlike `yield_from_event()`, it does not raise for invalid records: it returns
+         one `ParsedRecord` per record, with either the task or the validation error.
+        Raise `ValidationError` only if the event itself is malformed.
+
+        ```py
+        for parsed in BotteMessageDynamodbTask.parse_event(event):
+            if parsed.error:
+                print(parsed.sequence_number, parsed.pk, parsed.error)
+            else:
+                print(parsed.task.text)
+        ```
+        """
+        return list(BotteMessageDynamodbTask.iter_parse_event(event))
+
+    @staticmethod
+    def iter_parse_event(event: dict[str, Any]) -> Iterator["ParsedRecord"]:
+        """
+        Same as `parse_event()`, but lazy: each record is parsed only when the
+         iterator gets to it, so consumers can start processing the first tasks
+         before the whole event is parsed, and without holding all the parsed
+         records at once.
+        Mind that `ValidationError` for a malformed event is raised right away, not
+         at the first iteration.
+        """
+        records = event.get("Records")
+        if records is None:
+            raise exceptions.ValidationError(
+                'Malformed DynamoDB stream: no ["Records"]'
+            )
+        return BotteMessageDynamodbTask._iter_parse_records(records)
+
+    @staticmethod
+    def _iter_parse_records(records: list[dict]) -> Iterator["ParsedRecord"]:
+        # Computed once for all the records in the batch.
+        min_ksuid_timestamp = _get_min_ksuid_timestamp()
+
+        for record in records:
+            parsed = ParsedRecord(
+                sequence_number=_get_str(record, "dynamodb", "SequenceNumber"),
+                # Read from the record (and not `task.pk`) so it is available also for
+                #  invalid records, and the KSUID is not encoded again.
+                pk=_get_str(record, "dynamodb", "NewImage", "PK", "S"),
+            )
+            try:
+                parsed.task = BotteMessageDynamodbTask._make_from_record(
+                    record, min_ksuid_timestamp
+                )
+            except exceptions.ValidationError as exc:
+                parsed.error = exc
+            # A malformed record, fi. {"dynamodb": "XXX"}, must be reported like the
+            #  invalid ones, and not stop the parsing of the other records.
+            except (AttributeError, TypeError, KeyError, ValueError) as exc:
+                parsed.error = exceptions.ValidationError(
+                    f"Malformed DynamoDB stream record: {record}"
+                )
+                parsed.error.__cause__ = exc
+            yield parsed
 
     @staticmethod
     def yield_from_event(event: dict[str, Any]):
@@ -363,19 +624,103 @@ class BotteMessageDynamodbTask:
                 'Malformed DynamoDB stream: no ["Records"]'
             )
 
+        min_ksuid_timestamp = _get_min_ksuid_timestamp()
         for record in records:
             try:
-                yield BotteMessageDynamodbTask._make_from_record(record)
+                yield BotteMessageDynamodbTask._make_from_record(
+                    record, min_ksuid_timestamp
+                )
             except exceptions.ValidationError:
                 raise
 
 
+class ParsedRecord:
+    def __init__(
+        self,
+        sequence_number: str | None,
+        pk: str | None,
+        task: BotteMessageDynamodbTask | None = None,
+        error: exceptions.ValidationError | None = None,
+    ):
+        """
+        The result of parsing a single DynamoDB stream record, see
+         `BotteMessageDynamodbTask.parse_event()`.
+
+        Args:
+            sequence_number: the SequenceNumber of the record, used to report failed
+             records in the partial batch response.
+            pk: the PK of the record, if available.
+            task: the task, if the record is valid.
+            error: the validation error, if the record is not valid.
+        """
+        self.sequence_number = sequence_number
+        self.pk = pk
+        self.task = task
+        self.error = error
+
+    def __repr__(self) -> str:
+        return (
+            f"ParsedRecord(sequence_number={self.sequence_number!r}, pk={self.pk!r},"
+            f" task={self.task!r}, error={self.error!r})"
+        )
+
+
+def _get_str(data: Any, *keys: str) -> str | None:
+    """
+    The string at the path of keys in nested dicts, or None if there is no string
+     there, like: _get_str(record, "dynamodb", "NewImage", "PK", "S").
+    """
+    for key in keys:
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    return data if isinstance(data, str) else None
+
+
+def _get_min_ksuid_timestamp() -> float:
+    """
+    The min valid timestamp for a task KSUID: the beginning of the previous year.
+    """
+    return datetime(
+        datetime_utils.now().year - 1, 1, 1, tzinfo=timezone.utc
+    ).timestamp()
+
+
+# Same alphabet as `baseconv.base62`, used by `KsuidMs`.
+_BASE62_ALPHABET = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+_BASE62_DIGITS = {char: i for i, char in enumerate(_BASE62_ALPHABET)}
+
+
+def _ksuid_from_base62(data: str) -> KsuidMs:
+    """
+    Same as `KsuidMs.from_base62()` but much faster: `baseconv` converts via strings
+     of decimal digits, which is the bottleneck when parsing large batches.
+    """
+    n = 0
+    for char in data:
+        n = n * 62 + _BASE62_DIGITS[char]
+    return KsuidMs.from_bytes(n.to_bytes(KsuidMs.BYTES_LENGTH, "big"))
+
+
+def _ksuid_to_base62(ksuid: KsuidMs) -> str:
+    """
+    Same as `str(ksuid)` but much faster, see `_ksuid_from_base62()`.
+    """
+    n = int.from_bytes(bytes(ksuid), "big")
+    chars = []
+    while n:
+        n, i = divmod(n, 62)
+        chars.append(_BASE62_ALPHABET[i])
+    return "".join(reversed(chars)).rjust(KsuidMs.BASE62_LENGTH, "0")
+
+
 def _deserialize(data: dict[str, Any]):
     """
     Deserialize a dict read from DynamoDB.
 
-    See: https://boto3.amazonaws.com/v1/documentation/api/latest/_modules/boto3/dynamodb/types.html
+    Mind that it does not use Boto3 `TypeDeserializer` (see dynamodb_json.py), so
+     numbers are int or float, not Decimal.
     """
     if not data:
         return None
-    return TypeDeserializer().deserialize(data)
+    return dynamodb_json.deserialize(data)
@@ -0,0 +1,127 @@
+"""
+Zero-dependency encoder and decoder for DynamoDB JSON, the format of the items in
+ DynamoDB stream records and in low-level DynamoDB API requests, like:
+    {
+        "SK": {"S": "34t1cou0pVRlvW8OECP0J1Q4nJC"},
+        "ExpirationTs": {"N": "1762018136"},
+        "Payload": {"M": {"text": {"S": "Hello world"}}},
+    }
+
+It supports only the attribute types used by Botte: S, N, M, L, BOOL, NULL.
+Unlike Boto3 `TypeDeserializer` and `TypeSerializer`, it does not require Boto3 and
+ `N` is decoded to int or float (instead of Decimal).
+
+```py
+from botte_dynamodb_tasks import dynamodb_json
+
+assert dynamodb_json.deserialize({"N": "1762018136"}) == 1762018136
+assert dynamodb_json.deserialize_item(
+    {"Payload": {"M": {"text": {"S": "Hello world"}}}}
+) == {"Payload": {"text": "Hello world"}}
+assert dynamodb_json.serialize_item({"ExpirationTs": 1762018136}) == {
+    "ExpirationTs": {"N": "1762018136"}
+}
+```
+"""
+
+import math
+from typing import Any
+
+from . import exceptions
+
+__all__ = [
+    "deserialize",
+    "deserialize_item",
+    "serialize",
+    "serialize_item",
+]
+
+
+def deserialize(attribute_value: dict[str, Any]) -> Any:
+    """
+    Deserialize a single DynamoDB JSON attribute value, like: {"S": "Hello world"}.
+
+    Raise `ValidationError` if the attribute value is malformed or its type is not
+     supported.
+    """
+    # Any malformed shape, fi. {"M": "XXX"} or {"L": 5}, raises `ValidationError`, so
+    #  callers have a single error type to handle.
+    try:
+        ((type_, value),) = attribute_value.items()
+
+        if type_ == "S":
+            return value
+        elif type_ == "N":
+            return _deserialize_number(value)
+        elif type_ == "M":
+            return {k: deserialize(v) for k, v in value.items()}
+        elif type_ == "L":
+            return [deserialize(v) for v in value]
+        elif type_ == "BOOL":
+            return value
+        elif type_ == "NULL":
+            return None
+    except (AttributeError, TypeError, ValueError) as exc:
+        raise exceptions.ValidationError(
+            f"Malformed DynamoDB attribute value: {attribute_value}"
+        ) from exc
+    raise exceptions.ValidationError(f"Unsupported DynamoDB attribute type: {type_}")
+
+
+def deserialize_item(item: dict[str, dict[str, Any]]) -> dict[str, Any]:
+    """
+    Deserialize a DynamoDB JSON item, fi. the NewImage in a DynamoDB stream record.
+    """
+    return {k: deserialize(v) for k, v in item.items()}
+
+
+def _deserialize_number(value: str | int | float) -> int | float:
+    # DynamoDB sends numbers as strings, but some producers (fi. test factories)
+    #  use JSON numbers.
+    if isinstance(value, (int, float)):
+        return value
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        pass
+    try:
+        return float(value)
+    except (TypeError, ValueError) as exc:
+        raise exceptions.ValidationError(f"Invalid DynamoDB number: {value}") from exc
+
+
+def serialize(value: Any) -> dict[str, Any]:
+    """
+    Serialize a Python value to a DynamoDB JSON attribute value, like:
+     "Hello world" -> {"S": "Hello world"}.
+
+    Raise `ValidationError` if the type of the value is not supported.
+    """
+    if isinstance(value, str):
+        return {"S": value}
+    # Before int, as bool is a subclass of int.
+    elif isinstance(value, bool):
+        return {"BOOL": value}
+    elif isinstance(value, int):
+        return {"N": str(value)}
+    elif isinstance(value, float):
+        if math.isnan(value) or math.isinf(value):
+            raise exceptions.ValidationError(f"Invalid DynamoDB number: {value}")
+        return {"N": repr(value)}
+    elif isinstance(value, dict):
+        return {"M": {k: serialize(v) for k, v in value.items()}}
+    elif isinstance(value, (list, tuple)):
+        return {"L": [serialize(v) for v in value]}
+    elif value is None:
+        return {"NULL": True}
+    raise exceptions.ValidationError(
+        f"Unsupported type for DynamoDB: {type(value).__name__}"
+    )
+
+
+def serialize_item(item: dict[str, Any]) -> dict[str, dict[str, Any]]:
+    """
+    Serialize a dict to a DynamoDB JSON item, like the `Item` arg of the low-level
+     `put_item()` or the `PutRequest.Item` in `batch_write_item()`.
+    """
+    return {k: serialize(v) for k, v in item.items()}
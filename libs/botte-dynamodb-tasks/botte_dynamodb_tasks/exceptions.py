@@ -1,6 +1,7 @@
 __all__ = [
     "BaseDynamodbTaskException",
     "ValidationError",
+    "UnprocessedItemsError",
 ]
 
 
@@ -10,3 +11,11 @@ class BaseDynamodbTaskException(Exception):
 
 class ValidationError(BaseDynamodbTaskException):
     pass
+
+
+class UnprocessedItemsError(BaseDynamodbTaskException):
+    def __init__(self, tasks: list):
+        # The tasks not written, as their items were not processed by BatchWriteItem.
+        self.tasks = tasks
+        self.n_items = len(tasks)
+        super().__init__(f"{self.n_items} items not processed by BatchWriteItem")
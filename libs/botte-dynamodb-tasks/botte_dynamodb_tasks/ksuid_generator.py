@@ -0,0 +1,79 @@
+"""
+Monotonic KSUID generator.
+
+`KsuidMs()` has a timestamp with a resolution of 1/256 sec (about 4 ms), followed by
+ a random payload. So KSUIDs created within the same tick are sorted by their random
+ payload, not by creation order. And Botte restores the FIFO order of the tasks by
+ sorting on the KSUID (the SK).
+
+This generator, instead, creates strictly increasing KSUIDs (in the same process):
+ within the same tick the payload of the previous KSUID is incremented by 1. So the
+ random payload (`os.urandom()`) is generated only once per tick.
+
+```py
+from botte_dynamodb_tasks import ksuid_generator
+
+ksuids = [ksuid_generator.next_ksuid() for _ in range(100)]
+assert ksuids == sorted(ksuids)
+```
+"""
+
+import secrets
+import threading
+import time
+
+from ksuid import KsuidMs
+from ksuid.ksuid import EPOCH_STAMP
+
+__all__ = [
+    "MonotonicKsuidMsGenerator",
+    "next_ksuid",
+]
+
+_PAYLOAD_MAX = 2 ** (KsuidMs.PAYLOAD_LENGTH_IN_BYTES * 8) - 1
+
+
+class MonotonicKsuidMsGenerator:
+    def __init__(self):
+        """
+        Thread-safe generator of strictly increasing `KsuidMs`.
+        """
+        self._last_tick = -1
+        self._last_payload = 0
+        self._lock = threading.Lock()
+
+    def next(self) -> KsuidMs:
+        # Same as `KsuidMs._inner_init()`.
+        tick = round((time.time() - EPOCH_STAMP) * KsuidMs.TIMESTAMP_MULTIPLIER)
+        with self._lock:
+            # The clock might go backwards (fi. NTP adjustments): stick to the last
+            #  tick, so the order is preserved.
+            if tick <= self._last_tick:
+                tick = self._last_tick
+                payload = self._last_payload + 1
+                if payload > _PAYLOAD_MAX:
+                    # Very unlikely: move to the next tick.
+                    tick += 1
+                    payload = secrets.randbits(KsuidMs.PAYLOAD_LENGTH_IN_BYTES * 8 - 1)
+            else:
+                # Leave the top bit unset, so there is room for increments.
+                payload = secrets.randbits(KsuidMs.PAYLOAD_LENGTH_IN_BYTES * 8 - 1)
+            self._last_tick = tick
+            self._last_payload = payload
+
+        return KsuidMs.from_bytes(
+            tick.to_bytes(KsuidMs.TIMESTAMP_LENGTH_IN_BYTES, "big")
+            + payload.to_bytes(KsuidMs.PAYLOAD_LENGTH_IN_BYTES, "big")
+        )
+
+
+# Global generator, so KSUIDs are increasing across all tasks in the process.
+_generator = MonotonicKsuidMsGenerator()
+
+
+def next_ksuid() -> KsuidMs:
+    """
+    Create a new `KsuidMs`, greater than any other created by this function in the
+     same process.
+    """
+    return _generator.next()
@@ -0,0 +1,58 @@
+import time
+
+import pytest
+
+import botte_dynamodb_tasks
+
+TABLE_NAME = "botte-be-task-pytest"
+
+
+class FakeDynamodbClient:
+    def __init__(self, n_unprocessed: int = 0):
+        # The last `n_unprocessed` items of each request are not processed.
+        self.n_unprocessed = n_unprocessed
+        self.requests = []
+
+    def batch_write_item(self, RequestItems):  # noqa: N803
+        ((table_name, requests),) = RequestItems.items()
+        self.requests.append(requests)
+        n_processed = max(len(requests) - self.n_unprocessed, 0)
+        return {"UnprocessedItems": {table_name: requests[n_processed:]}}
+
+
+class TestIterBatchWriteTasks:
+    def setup_method(self):
+        (self.tasks,) = botte_dynamodb_tasks.BotteMessageDynamodbTask.build_many(
+            [f"Hello {i}" for i in range(10)],
+            sender_app="BOTTE_DYNAMODB_TASKS_PYTEST",
+            chunk_size=50,
+        )
+
+    def test_happy_flow(self):
+        client = FakeDynamodbClient()
+        (tasks,) = botte_dynamodb_tasks.BotteMessageDynamodbTask.build_many(
+            [f"Hello {i}" for i in range(30)],
+            sender_app="BOTTE_DYNAMODB_TASKS_PYTEST",
+            chunk_size=50,
+        )
+        written = list(
+            botte_dynamodb_tasks.iter_batch_write_tasks(client, TABLE_NAME, tasks)
+        )
+        # A request per chunk of 25 tasks.
+        assert [len(x) for x in written] == [25, 5]
+        assert [len(x) for x in client.requests] == [25, 5]
+        assert [x for chunk in written for x in chunk] == tasks
+
+    def test_unprocessed_items(self, monkeypatch):
+        monkeypatch.setattr(time, "sleep", lambda _: None)
+        client = FakeDynamodbClient(n_unprocessed=8)
+        written = []
+        with pytest.raises(botte_dynamodb_tasks.UnprocessedItemsError) as exc_info:
+            for tasks in botte_dynamodb_tasks.iter_batch_write_tasks(
+                client, TABLE_NAME, self.tasks, max_retries=1
+            ):
+                written += tasks
+        # The first try writes 2 items, the retry writes none.
+        assert written == self.tasks[:2]
+        assert exc_info.value.tasks == self.tasks[2:]
+        assert len(client.requests) == 2
@@ -1,4 +1,8 @@
+import copy
+import gc
 import json
+import pickle
+import tracemalloc
 from datetime import datetime, timezone
 
 import pytest
@@ -8,6 +12,7 @@ from aws_utils.aws_testfactories.dynamodb_event_to_lambda_factory import (
 from ksuid import KsuidMs
 
 import botte_dynamodb_tasks
+from botte_dynamodb_tasks.botte_message_dynamodb_task import _ksuid_from_base62
 
 
 class TestBotteMessageDynamodbTask:
@@ -378,3 +383,322 @@ class TestBotteMessageDynamodbTask:
         with pytest.raises(botte_dynamodb_tasks.ValidationError) as exc:
             list(botte_dynamodb_tasks.BotteMessageDynamodbTask.yield_from_event(event))
         assert "Invalid format for ExpirationTs" in str(exc)
+
+    def test_yield_from_event_pk(self):
+        for pk, do_process_task_fifo, fifo_group_id in (
+            (
+                botte_dynamodb_tasks.BOTTE_MESSAGE_TASK_ID + f"#{self.ksuid}",
+                False,
+                None,
+            ),
+            (botte_dynamodb_tasks.BOTTE_MESSAGE_TASK_ID, True, None),
+            (botte_dynamodb_tasks.BOTTE_MESSAGE_TASK_ID + "#G1", True, "G1"),
+        ):
+            new_image = {
+                "PK": {"S": pk},
+                "SK": {"S": str(self.ksuid)},
+                "TaskId": {"S": botte_dynamodb_tasks.BOTTE_MESSAGE_TASK_ID},
+                "SenderApp": {"S": self.sender_app},
+                "Payload": {
+                    "M": {
+                        "text": {"S": self.text},
+                    }
+                },
+                "ExpirationTs": {"N": self.expiration_ts},
+            }
+            event = DynamodbEventToLambdaFactory.make_for_insert(new_image=new_image)
+            (task,) = botte_dynamodb_tasks.BotteMessageDynamodbTask.yield_from_event(
+                event
+            )
+            assert task.pk == pk
+            assert task.do_process_task_fifo is do_process_task_fifo
+            assert task.fifo_group_id == fifo_group_id
+
+    def test_parse_event(self):
+        records = []
+        for text in ("Hello 1", "", "Hello 3"):
+            new_image = {
+                "PK": {
+                    "S": botte_dynamodb_tasks.BOTTE_MESSAGE_TASK_ID + f"#{self.ksuid}"
+                },
+                "SK": {"S": str(self.ksuid)},
+                "TaskId": {"S": botte_dynamodb_tasks.BOTTE_MESSAGE_TASK_ID},
+                "SenderApp": {"S": self.sender_app},
+                "Payload": {
+                    "M": {
+                        "text": {"S": text},
+                    }
+                },
+                "ExpirationTs": {"N": self.expiration_ts},
+            }
+            event = DynamodbEventToLambdaFactory.make_for_insert(new_image=new_image)
+            records += event["Records"]
+
+        results = botte_dynamodb_tasks.BotteMessageDynamodbTask.parse_event(
+            {"Records": records}
+        )
+
+        assert [x.sequence_number for x in results] == [
+            x["dynamodb"]["SequenceNumber"] for x in records
+        ]
+        assert [x.pk for x in results] == [
+            botte_dynamodb_tasks.BOTTE_MESSAGE_TASK_ID + f"#{self.ksuid}"
+        ] * 3
+        assert results[0].task.text == "Hello 1"
+        assert results[0].error is None
+        assert results[1].task is None
+        assert isinstance(results[1].error, botte_dynamodb_tasks.ValidationError)
+        assert "Invalid text" in str(results[1].error)
+        assert results[2].task.text == "Hello 3"
+
+    def test_parse_event_malformed(self):
+        with pytest.raises(botte_dynamodb_tasks.ValidationError):
+            botte_dynamodb_tasks.BotteMessageDynamodbTask.parse_event({})
+
+    def test_iter_parse_event(self):
+        records = []
+        for text in ("Hello 1", ""):
+            new_image = {
+                "PK": {
+                    "S": botte_dynamodb_tasks.BOTTE_MESSAGE_TASK_ID + f"#{self.ksuid}"
+                },
+                "SK": {"S": str(self.ksuid)},
+                "TaskId": {"S": botte_dynamodb_tasks.BOTTE_MESSAGE_TASK_ID},
+                "SenderApp": {"S": self.sender_app},
+                "Payload": {
+                    "M": {
+                        "text": {"S": text},
+                    }
+                },
+                "ExpirationTs": {"N": self.expiration_ts},
+            }
+            event = DynamodbEventToLambdaFactory.make_for_insert(new_image=new_image)
+            records += event["Records"]
+
+        results = botte_dynamodb_tasks.BotteMessageDynamodbTask.iter_parse_event(
+            {"Records": records}
+        )
+
+        # Lazy: the records are parsed one by one.
+        parsed = next(results)
+        assert parsed.task.text == "Hello 1"
+        parsed = next(results)
+        assert "Invalid text" in str(parsed.error)
+        with pytest.raises(StopIteration):
+            next(results)
+
+    def test_parse_event_malformed_records(self):
+        ksuid = str(self.ksuid)
+
+        def make_record(**attributes):
+            new_image = {
+                "PK": {"S": botte_dynamodb_tasks.BOTTE_MESSAGE_TASK_ID + f"#{ksuid}"},
+                "SK": {"S": ksuid},
+                "TaskId": {"S": botte_dynamodb_tasks.BOTTE_MESSAGE_TASK_ID},
+                "SenderApp": {"S": self.sender_app},
+                "Payload": {"M": {"text": {"S": self.text}}},
+                "ExpirationTs": {"N": self.expiration_ts},
+            }
+            new_image.update(attributes)
+            event = DynamodbEventToLambdaFactory.make_for_insert(new_image=new_image)
+            return event["Records"][0]
+
+        records = [
+            make_record(Payload={"M": "x"}),
+            make_record(Payload={"L": 5}),
+            make_record(ExpirationTs={"N": None}),
+            make_record(PK={"N": "5"}),
+            None,
+            {"eventName": "INSERT", "dynamodb": "XXX"},
+            {"eventName": "INSERT", "dynamodb": {"NewImage": "XXX"}},
+            make_record(),
+        ]
+
+        results = botte_dynamodb_tasks.BotteMessageDynamodbTask.parse_event(
+            {"Records": records}
+        )
+
+        assert len(results) == len(records)
+        for parsed in results[:-1]:
+            assert parsed.task is None
+            assert isinstance(parsed.error, botte_dynamodb_tasks.ValidationError)
+        assert results[3].pk is None
+        assert "Invalid PK" in str(results[3].error)
+        assert results[4].sequence_number is None
+        assert results[-1].task.text == self.text
+        assert results[-1].error is None
+
+    def test_iter_parse_event_malformed(self):
+        # Raised right away, not at the first iteration.
+        with pytest.raises(botte_dynamodb_tasks.ValidationError):
+            botte_dynamodb_tasks.BotteMessageDynamodbTask.iter_parse_event({})
+
+    def test_ksuid_from_base62(self):
+        for _ in range(100):
+            ksuid = KsuidMs()
+            assert bytes(_ksuid_from_base62(str(ksuid))) == bytes(ksuid)
+
+    def test_immutable(self):
+        task = botte_dynamodb_tasks.BotteMessageDynamodbTask(
+            text=self.text,
+            sender_app=self.sender_app,
+            ksuid=self.ksuid,
+        )
+        with pytest.raises(AttributeError):
+            task.text = "XXX"
+        with pytest.raises(AttributeError):
+            del task.text
+        with pytest.raises(AttributeError):
+            task.new_attribute = "XXX"
+
+    def test_memoised(self):
+        task = botte_dynamodb_tasks.BotteMessageDynamodbTask(
+            text=self.text,
+            sender_app=self.sender_app,
+            ksuid=self.ksuid,
+        )
+        assert task.sk == str(self.ksuid)
+        assert task.to_json() is task.to_json()
+        assert task.to_dynamodb_item() is task.to_dynamodb_item()
+
+    def test_to_dict_copy(self):
+        task = botte_dynamodb_tasks.BotteMessageDynamodbTask(
+            text=self.text,
+            sender_app=self.sender_app,
+            ksuid=self.ksuid,
+        )
+        data = task.to_dict()
+        data["SenderApp"] = "XXX"
+        data["Payload"]["text"] = "XXX"
+        # The memoised dict is not mutated.
+        assert task.to_dict()["SenderApp"] == self.sender_app
+        assert task.to_dict()["Payload"] == {"text": self.text}
+        assert json.loads(task.to_json())["Payload"] == {"text": self.text}
+
+    def test_copy_and_pickle(self):
+        task = botte_dynamodb_tasks.BotteMessageDynamodbTask(
+            text=self.text,
+            sender_app=self.sender_app,
+            do_process_task_fifo=True,
+            fifo_group_id="G1",
+            ksuid=self.ksuid,
+            expiration_ts=self.expiration_ts,
+        )
+        task.to_dynamodb_item()
+        for task_copy in (
+            copy.copy(task),
+            copy.deepcopy(task),
+            pickle.loads(pickle.dumps(task)),
+        ):
+            assert task_copy is not task
+            assert task_copy.to_dict() == task.to_dict()
+            assert task_copy.to_dynamodb_item() == task.to_dynamodb_item()
+            with pytest.raises(AttributeError):
+                task_copy.text = "XXX"
+
+    def test_to_dynamodb_item(self):
+        task = botte_dynamodb_tasks.BotteMessageDynamodbTask(
+            text=self.text,
+            sender_app=self.sender_app,
+            do_process_task_fifo=True,
+            fifo_group_id="G1",
+            ksuid=self.ksuid,
+            expiration_ts=self.expiration_ts,
+        )
+        assert task.to_dynamodb_item() == {
+            "PK": {"S": botte_dynamodb_tasks.BOTTE_MESSAGE_TASK_ID + "#G1"},
+            "SK": {"S": str(self.ksuid)},
+            "TaskId": {"S": botte_dynamodb_tasks.BOTTE_MESSAGE_TASK_ID},
+            "SenderApp": {"S": self.sender_app},
+            "Payload": {"M": {"text": {"S": self.text}}},
+            "ExpirationTs": {"N": str(self.expiration_ts)},
+        }
+        # It is the same format of the NewImage in DynamoDB stream records.
+        event = DynamodbEventToLambdaFactory.make_for_insert(
+            new_image=task.to_dynamodb_item()
+        )
+        (parsed,) = botte_dynamodb_tasks.BotteMessageDynamodbTask.parse_event(event)
+        assert parsed.task.to_dict() == task.to_dict()
+
+    def test_to_dynamodb_item_invalid(self):
+        task = botte_dynamodb_tasks.BotteMessageDynamodbTask(
+            text=1, sender_app=self.sender_app, ksuid=self.ksuid
+        )
+        with pytest.raises(botte_dynamodb_tasks.ValidationError):
+            task.to_dynamodb_item()
+
+
+@pytest.mark.slow
+class TestBenchmark:
+    def test_benchmark_memory(self):
+        """
+        Benchmark: memory used by 100k tasks, compared to the same tasks as plain
+         `__dict__` objects (which was the previous implementation).
+        Run it with:
+        $ pytest -s -m slow tests/test_botte_message_dynamodb_task.py::TestBenchmark
+        """
+
+        class DictTask:
+            def __init__(self, **kwargs):
+                self.__dict__.update(kwargs)
+
+        ksuids = [KsuidMs() for _ in range(100_000)]
+        kwargs = dict(text="Hello world", sender_app="APP", expiration_ts=1762018136)
+
+        gc.collect()
+        tracemalloc.start()
+        try:
+            tasks = [
+                DictTask(
+                    do_process_task_fifo=False, fifo_group_id=None, ksuid=k, **kwargs
+                )
+                for k in ksuids
+            ]
+            dict_tasks_size, _ = tracemalloc.get_traced_memory()
+            del tasks
+            gc.collect()
+
+            start, _ = tracemalloc.get_traced_memory()
+            tasks = [
+                botte_dynamodb_tasks.BotteMessageDynamodbTask(ksuid=k, **kwargs)
+                for k in ksuids
+            ]
+            tasks_size = tracemalloc.get_traced_memory()[0] - start
+            # The serialized forms are released with their task.
+            for task in tasks[:10_000]:
+                task.to_json()
+            del tasks, task
+            gc.collect()
+            released_size = tracemalloc.get_traced_memory()[0] - start
+        finally:
+            tracemalloc.stop()
+
+        print(
+            f"\n100k __dict__ tasks: {dict_tasks_size / 2**20:.2f} MiB"
+            f"\n100k __slots__ tasks: {tasks_size / 2**20:.2f} MiB"
+        )
+        assert tasks_size < dict_tasks_size
+        assert released_size < 2**20
+
+
+class TestBuildMany:
+    def test_build_many(self):
+        texts = [f"Hello {i}" for i in range(60)]
+        chunks = botte_dynamodb_tasks.BotteMessageDynamodbTask.build_many(
+            texts, sender_app="BOTTE_DYNAMODB_TASKS_PYTEST", do_process_task_fifo=True
+        )
+        assert [len(x) for x in chunks] == [25, 25, 10]
+        tasks = [task for chunk in chunks for task in chunk]
+        assert [x.text for x in tasks] == texts
+        # The FIFO order is the order of the texts.
+        assert [x.text for x in sorted(tasks, key=lambda x: x.sk)] == texts
+        assert {x.pk for x in tasks} == {botte_dynamodb_tasks.BOTTE_MESSAGE_TASK_ID}
+        assert len({x.expiration_ts for x in tasks}) == 1
+
+    def test_build_many_empty(self):
+        assert (
+            botte_dynamodb_tasks.BotteMessageDynamodbTask.build_many(
+                [], sender_app="BOTTE_DYNAMODB_TASKS_PYTEST"
+            )
+            == []
+        )
@@ -0,0 +1,155 @@
+import time
+
+import pytest
+from aws_utils.aws_testfactories.dynamodb_event_to_lambda_factory import (
+    DynamodbEventToLambdaFactory,
+)
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+from ksuid import KsuidMs
+
+import botte_dynamodb_tasks
+from botte_dynamodb_tasks import dynamodb_json
+
+
+class TestDeserialize:
+    def test_types(self):
+        assert dynamodb_json.deserialize({"S": "Hello"}) == "Hello"
+        assert dynamodb_json.deserialize({"N": "1762018136"}) == 1762018136
+        assert dynamodb_json.deserialize({"N": 1762018136}) == 1762018136
+        assert dynamodb_json.deserialize({"N": "-1.5"}) == -1.5
+        assert dynamodb_json.deserialize({"BOOL": False}) is False
+        assert dynamodb_json.deserialize({"NULL": True}) is None
+        assert dynamodb_json.deserialize(
+            {"M": {"a": {"L": [{"S": "x"}, {"N": "2"}]}}}
+        ) == {"a": ["x", 2]}
+
+    def test_number_types(self):
+        assert isinstance(dynamodb_json.deserialize({"N": "1"}), int)
+        assert isinstance(dynamodb_json.deserialize({"N": "1.0"}), float)
+        assert isinstance(dynamodb_json.deserialize({"N": "1E2"}), float)
+
+    def test_same_as_boto3(self):
+        item = {
+            "PK": {"S": "BOTTE_MESSAGE#G1"},
+            "ExpirationTs": {"N": "1762018136"},
+            "Payload": {"M": {"text": {"S": "Hello"}, "tags": {"L": [{"S": "x"}]}}},
+            "IsUrgent": {"BOOL": True},
+            "Extra": {"NULL": True},
+        }
+        deserializer = TypeDeserializer()
+        assert dynamodb_json.deserialize_item(item) == {
+            k: deserializer.deserialize(v) for k, v in item.items()
+        }
+
+    def test_unsupported_type(self):
+        with pytest.raises(botte_dynamodb_tasks.ValidationError) as exc:
+            dynamodb_json.deserialize({"SS": ["a", "b"]})
+        assert "Unsupported DynamoDB attribute type: SS" in str(exc)
+
+    def test_malformed(self):
+        for value in ({}, {"S": "a", "N": "1"}, "XXX"):
+            with pytest.raises(botte_dynamodb_tasks.ValidationError):
+                dynamodb_json.deserialize(value)
+        with pytest.raises(botte_dynamodb_tasks.ValidationError):
+            dynamodb_json.deserialize({"N": "XXX"})
+
+    def test_malformed_value(self):
+        for value in (
+            {"M": "x"},
+            {"M": {"a": "x"}},
+            {"L": 5},
+            {"L": [None]},
+            {"N": None},
+            {"N": [1]},
+            None,
+        ):
+            with pytest.raises(botte_dynamodb_tasks.ValidationError):
+                dynamodb_json.deserialize(value)
+
+
+@pytest.mark.slow
+class TestBenchmark:
+    def test_benchmark(self):
+        """
+        Benchmark: parse a 1,000 records DynamoDB stream event with this decoder and with
+         Boto3 `TypeDeserializer` (a new one for each attribute, which was the previous
+         implementation).
+        Run it with:
+        $ pytest -s -m slow tests/test_dynamodb_json.py::TestBenchmark
+        """
+        records = []
+        for i in range(1000):
+            ksuid = KsuidMs()
+            new_image = {
+                "PK": {"S": botte_dynamodb_tasks.BOTTE_MESSAGE_TASK_ID + f"#{ksuid}"},
+                "SK": {"S": str(ksuid)},
+                "TaskId": {"S": botte_dynamodb_tasks.BOTTE_MESSAGE_TASK_ID},
+                "SenderApp": {"S": "BOTTE_DYNAMODB_TASKS_PYTEST"},
+                "Payload": {"M": {"text": {"S": f"Hello world {i}"}}},
+                "ExpirationTs": {"N": "1762018136"},
+            }
+            event = DynamodbEventToLambdaFactory.make_for_insert(new_image=new_image)
+            records += event["Records"]
+        images = [record["dynamodb"]["NewImage"] for record in records]
+
+        start = time.perf_counter()
+        for image in images:
+            {k: TypeDeserializer().deserialize(v) for k, v in image.items()}
+        elapsed_boto3 = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for image in images:
+            dynamodb_json.deserialize_item(image)
+        elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        tasks = list(
+            botte_dynamodb_tasks.BotteMessageDynamodbTask.yield_from_event(
+                {"Records": records}
+            )
+        )
+        elapsed_tasks = time.perf_counter() - start
+
+        print(
+            f"\nBoto3 TypeDeserializer: {elapsed_boto3 * 1000:.2f} ms"
+            f"\ndynamodb_json: {elapsed * 1000:.2f} ms"
+            f"\nyield_from_event: {elapsed_tasks * 1000:.2f} ms"
+        )
+        assert len(tasks) == 1000
+        assert elapsed < elapsed_boto3
+
+
+class TestSerialize:
+    def test_types(self):
+        assert dynamodb_json.serialize("Hello") == {"S": "Hello"}
+        assert dynamodb_json.serialize(1762018136) == {"N": "1762018136"}
+        assert dynamodb_json.serialize(-1.5) == {"N": "-1.5"}
+        assert dynamodb_json.serialize(True) == {"BOOL": True}
+        assert dynamodb_json.serialize(None) == {"NULL": True}
+        assert dynamodb_json.serialize({"a": ["x", 2]}) == {
+            "M": {"a": {"L": [{"S": "x"}, {"N": "2"}]}}
+        }
+
+    def test_same_as_boto3(self):
+        item = {
+            "PK": "BOTTE_MESSAGE#G1",
+            "ExpirationTs": 1762018136,
+            "Payload": {"text": "Hello", "tags": ["x"]},
+            "IsUrgent": True,
+            "Extra": None,
+        }
+        serializer = TypeSerializer()
+        assert dynamodb_json.serialize_item(item) == {
+            k: serializer.serialize(v) for k, v in item.items()
+        }
+
+    def test_round_trip(self):
+        item = {"a": {"b": [1, 2.5, "c", None, False]}}
+        assert dynamodb_json.deserialize_item(dynamodb_json.serialize_item(item)) == (
+            item
+        )
+
+    def test_unsupported_type(self):
+        for value in ({1, 2}, b"x", float("nan")):
+            with pytest.raises(botte_dynamodb_tasks.ValidationError):
+                dynamodb_json.serialize(value)
@@ -0,0 +1,27 @@
+import time
+
+from ksuid import KsuidMs
+
+from botte_dynamodb_tasks import ksuid_generator
+
+
+class TestMonotonicKsuidMsGenerator:
+    def test_strictly_increasing(self):
+        generator = ksuid_generator.MonotonicKsuidMsGenerator()
+        ksuids = [generator.next() for _ in range(10_000)]
+        assert all(a < b for a, b in zip(ksuids, ksuids[1:], strict=False))
+        # Also as strings, which is how DynamoDB sorts the SK.
+        sks = [str(x) for x in ksuids]
+        assert sks == sorted(sks)
+        assert len(set(sks)) == len(sks)
+
+    def test_timestamp(self):
+        ksuid = ksuid_generator.MonotonicKsuidMsGenerator().next()
+        assert isinstance(ksuid, KsuidMs)
+        assert abs(ksuid.timestamp - time.time()) < 1
+
+    def test_clock_backwards(self, monkeypatch):
+        generator = ksuid_generator.MonotonicKsuidMsGenerator()
+        first = generator.next()
+        monkeypatch.setattr(time, "time", lambda: first.timestamp - 60)
+        assert generator.next() > first
@@ -0,0 +1,426 @@
+"""
+** BOTTE CLIENT **
+==================
+
+A transport-agnostic Botte client: it knows all the Botte interfaces (transports):
+ - Lambda direct invocation, via `botte-lambda-client`
+ - HTTP, via `botte-http-client`
+ - DynamoDB task queue, via `botte-dynamodb-client`
+and it sends every message via the fastest healthy one, falling back to the next
+ one when a send fails. So consumers do not need to choose a transport at coding
+ time, and their messages are not lost when a transport is down.
+
+At the first send, it probes which transports are reachable from the current
+ environment: fi. the HTTP transport requires Internet access and an auth token,
+ the Lambda and DynamoDB transports require AWS credentials.
+Then it keeps rolling stats (latency and errors of the last sends) per transport:
+ the healthy transports are tried in order of latency, and a transport with too
+ many recent errors is skipped for a cooldown period (like a circuit breaker).
+
+Mind that the DynamoDB transport only enqueues the message, which is then sent by
+ Botte BE, so its latency does not include the Telegram send, and it would always
+ look the fastest. So the transports that only enqueue (`Transport.is_queue`) are
+ ranked after the ones that deliver, whatever their latency: they are used only
+ when the others are unreachable, unhealthy or failed.
+
+It falls back to the next transport only when the failure proves that the message
+ was not delivered: fi. connection refused, or the request rejected by Botte or AWS
+ (a 4xx response). When the outcome is unknown, fi. a timeout while waiting for the
+ response, a 5xx response or a crash of Botte Lambda, the message might have been
+ delivered, so `DeliveryUnknownError` is raised instead, and the message is not sent
+ again via another transport (which would duplicate it).
+
+```py
+import botte_client
+
+client = botte_client.BotteClient(
+    sender_app="MY_APP",
+    botte_be_api_auth_token="XXX",  # Optional, to enable the HTTP transport.
+)
+transport_name = client.send_message("Hello world!")
+print(f"Sent via: {transport_name}")
+print(client.get_stats())
+```
+"""
+
+import threading
+import time
+from collections import deque
+
+import boto3
+import botocore.exceptions
+import botte_dynamodb_client
+import botte_http_client
+import botte_lambda_client
+import requests
+import urllib3.exceptions
+
+__all__ = [
+    "BotteClient",
+    "Transport",
+    "LambdaTransport",
+    "HttpTransport",
+    "DynamodbTransport",
+    "TransportStats",
+    "BaseBotteClientException",
+    "TransportError",
+    "DeliveryUnknownError",
+    "NoTransportAvailable",
+    "AllTransportsFailed",
+]
+
+# Number of recent sends per transport used for the rolling stats.
+STATS_WINDOW_SIZE = 20
+# A transport is unhealthy when the error rate in the window is at least this...
+MAX_ERROR_RATE = 0.5
+# ...and there are at least this many sends in the window.
+MIN_SENDS_FOR_ERROR_RATE = 3
+# An unhealthy transport is skipped for this many secs, then it is tried again.
+UNHEALTHY_COOLDOWN_SECS = 60.0
+# An unreachable transport is probed again after this many secs.
+UNREACHABLE_COOLDOWN_SECS = 300.0
+
+
+class Transport:
+    """
+    Base class for a transport, that is a way to send messages to Botte.
+    """
+
+    name: str
+    # True if the transport only enqueues the message, which is sent later by Botte
+    #  BE: so its latency is not comparable with the transports that deliver.
+    is_queue: bool = False
+
+    def __init__(self, sender_app: str):
+        self.sender_app = sender_app
+
+    def probe(self) -> bool:
+        """
+        Return True if the transport is reachable from the current environment.
+        It should be cheap and it should not send any message.
+        """
+        raise NotImplementedError
+
+    def send_message(self, text: str) -> None:
+        """
+        Send a message. Raise on failure: `TransportError` when the message was
+         surely not delivered (or with `is_not_delivered=False` when it might have
+         been).
+        """
+        raise NotImplementedError
+
+    def is_not_delivered(self, exc: Exception) -> bool:
+        """
+        Return True if the exception raised by `send_message()` proves that the
+         message was not delivered, so it can be sent via another transport.
+        """
+        return _is_not_delivered(exc)
+
+
+class LambdaTransport(Transport):
+    name = "lambda"
+
+    def __init__(self, sender_app: str):
+        super().__init__(sender_app)
+        self.client = botte_lambda_client.BotteLambdaClient()
+
+    def probe(self) -> bool:
+        return _has_aws_credentials()
+
+    def send_message(self, text: str) -> None:
+        # It raises BotteLambdaFunctionError if Botte Lambda crashed (fi. it timed
+        #  out): the message might have been delivered.
+        body, status_code = self.client.send_message(text, sender_app=self.sender_app)
+        if status_code != 200:
+            raise TransportError(
+                self.name,
+                f"status code: {status_code}, {body}",
+                # A 4xx is a rejected request, but a 5xx (fi. a 504 when the Telegram
+                #  send did not end on time) might have been delivered.
+                is_not_delivered=status_code is not None and 400 <= status_code < 500,
+            )
+
+
+class HttpTransport(Transport):
+    name = "http"
+
+    def __init__(self, sender_app: str, botte_be_api_auth_token: str | None):
+        super().__init__(sender_app)
+        self.botte_be_api_auth_token = botte_be_api_auth_token
+        self.client = botte_http_client.BotteHttpClient()
+
+    def probe(self) -> bool:
+        if not self.botte_be_api_auth_token:
+            return False
+        try:
+            self.client.get_health()
+        except Exception:
+            return False
+        return True
+
+    def send_message(self, text: str) -> None:
+        self.client.send_message(
+            text,
+            botte_be_api_auth_token=self.botte_be_api_auth_token,
+            sender_app=self.sender_app,
+        )
+
+
+class DynamodbTransport(Transport):
+    name = "dynamodb"
+    is_queue = True
+
+    def __init__(self, sender_app: str):
+        super().__init__(sender_app)
+        self.client = botte_dynamodb_client.BotteDynamodbClient()
+
+    def probe(self) -> bool:
+        return _has_aws_credentials()
+
+    def send_message(self, text: str) -> None:
+        self.client.send_message(text, sender_app=self.sender_app)
+
+
+# Errors that prove that the request did not reach Botte, or that it was rejected.
+_NOT_DELIVERED_ERRORS = (
+    # AWS: the connection failed, or the request was rejected (fi. AccessDenied,
+    #  throttling, Lambda or table not found).
+    botocore.exceptions.EndpointConnectionError,
+    botocore.exceptions.ConnectTimeoutError,
+    botocore.exceptions.NoCredentialsError,
+    botocore.exceptions.ClientError,
+    botte_lambda_client.BotteLambdaNotFound,
+    # HTTP: the connection failed.
+    requests.ConnectTimeout,
+)
+
+
+def _is_not_delivered(exc: Exception) -> bool:
+    """
+    Return True if the exception, or one of its causes (as the Botte clients wrap the
+     errors), proves that the message was not delivered.
+    Mind that a timeout while waiting for the response, or a 5xx response, does not:
+     the message might have been delivered.
+    """
+    while exc is not None:
+        if isinstance(exc, TransportError):
+            return exc.is_not_delivered
+        if isinstance(exc, _NOT_DELIVERED_ERRORS):
+            return True
+        if isinstance(exc, requests.HTTPError):
+            # A 4xx response: the request was rejected, fi. 403 invalid auth token.
+            response = exc.response
+            if response is not None and 400 <= response.status_code < 500:
+                return True
+        elif isinstance(exc, requests.ConnectionError):
+            # Connection refused or DNS error, but not a connection dropped while
+            #  waiting for the response.
+            reason = getattr(exc.args[0], "reason", None) if exc.args else None
+            if isinstance(reason, urllib3.exceptions.NewConnectionError):
+                return True
+        exc = exc.__cause__
+    return False
+
+
+def _has_aws_credentials() -> bool:
+    try:
+        return boto3.Session().get_credentials() is not None
+    except Exception:
+        return False
+
+
+class TransportStats:
+    def __init__(self, window_size: int = STATS_WINDOW_SIZE):
+        """
+        Rolling stats of the recent sends via a transport.
+        """
+        # Recent sends, like: (latency secs, is_ok).
+        self.sends: deque[tuple[float, bool]] = deque(maxlen=window_size)
+        self.is_reachable: bool | None = None  # None: not probed yet.
+        self.probed_at = 0.0
+        self.unhealthy_until = 0.0
+
+    @property
+    def mean_latency(self) -> float | None:
+        latencies = [latency for latency, is_ok in self.sends if is_ok]
+        if not latencies:
+            return None
+        return sum(latencies) / len(latencies)
+
+    @property
+    def error_rate(self) -> float:
+        if not self.sends:
+            return 0.0
+        return sum(1 for _, is_ok in self.sends if not is_ok) / len(self.sends)
+
+    def to_dict(self) -> dict:
+        return dict(
+            is_reachable=self.is_reachable,
+            n_sends=len(self.sends),
+            mean_latency=self.mean_latency,
+            error_rate=self.error_rate,
+        )
+
+
+class BotteClient:
+    def __init__(
+        self,
+        sender_app: str = "BOTTE_CLIENT",
+        botte_be_api_auth_token: str | None = None,
+        transports: list[Transport] | None = None,
+        unhealthy_cooldown_secs: float = UNHEALTHY_COOLDOWN_SECS,
+        unreachable_cooldown_secs: float = UNREACHABLE_COOLDOWN_SECS,
+    ):
+        """
+        Args:
+            sender_app: just an identifier.
+            botte_be_api_auth_token: HTTP auth token for Botte HTTP interface; if
+             None, the HTTP transport is not used.
+            transports: the transports, in order of preference (used when there are
+             no stats yet), default: Lambda, HTTP, DynamoDB.
+            unhealthy_cooldown_secs: an unhealthy transport is skipped for this many
+             secs, then it is tried again.
+            unreachable_cooldown_secs: an unreachable transport is not probed again
+             for this many secs.
+
+        It is safe to share a single instance across threads.
+        """
+        if transports is None:
+            transports = [
+                LambdaTransport(sender_app),
+                HttpTransport(sender_app, botte_be_api_auth_token),
+                DynamodbTransport(sender_app),
+            ]
+        self.transports = transports
+        self.unhealthy_cooldown_secs = unhealthy_cooldown_secs
+        self.unreachable_cooldown_secs = unreachable_cooldown_secs
+        self._stats = {transport.name: TransportStats() for transport in transports}
+        self._lock = threading.Lock()
+
+    def send_message(self, text: str) -> str:
+        """
+        Send a message via the fastest healthy transport, and fall back to the next
+         ones on failures that prove that the message was not delivered.
+
+        Returns the name of the transport used.
+        Raise `NoTransportAvailable` if no transport is reachable,
+         `AllTransportsFailed` if all the reachable transports failed, or
+         `DeliveryUnknownError` if a transport failed but the message might have
+         been delivered.
+        """
+        errors: dict[str, Exception] = {}
+        for transport in self._get_ordered_transports():
+            start = time.monotonic()
+            try:
+                transport.send_message(text)
+            except Exception as exc:
+                self._record_send(transport, time.monotonic() - start, is_ok=False)
+                if not transport.is_not_delivered(exc):
+                    raise DeliveryUnknownError(transport.name, exc) from exc
+                errors[transport.name] = exc
+                continue
+            self._record_send(transport, time.monotonic() - start, is_ok=True)
+            return transport.name
+
+        if not errors:
+            raise NoTransportAvailable()
+        raise AllTransportsFailed(errors)
+
+    def get_stats(self) -> dict[str, dict]:
+        with self._lock:
+            return {name: stats.to_dict() for name, stats in self._stats.items()}
+
+    def _get_ordered_transports(self) -> list[Transport]:
+        """
+        The reachable transports: the healthy ones first, by latency (the ones with
+         no stats yet in order of preference) but the queues last, then the unhealthy
+         ones, as last resort.
+        """
+        healthy = []
+        unhealthy = []
+        for i, transport in enumerate(self.transports):
+            if not self._is_reachable(transport):
+                continue
+            with self._lock:
+                stats = self._stats[transport.name]
+                is_healthy = time.monotonic() >= stats.unhealthy_until
+                latency = stats.mean_latency
+            if is_healthy:
+                # Transports with no latency yet go first, so they get stats.
+                key = (transport.is_queue, latency is not None, latency or 0.0, i)
+                healthy.append((key, transport))
+            else:
+                unhealthy.append(transport)
+        healthy.sort(key=lambda x: x[0])
+        return [transport for _, transport in healthy] + unhealthy
+
+    def _is_reachable(self, transport: Transport) -> bool:
+        stats = self._stats[transport.name]
+        with self._lock:
+            is_probe_due = stats.is_reachable is None or (
+                not stats.is_reachable
+                and time.monotonic() - stats.probed_at >= self.unreachable_cooldown_secs
+            )
+            if not is_probe_due:
+                return stats.is_reachable
+        # Probe outside the lock, as it might be slow (fi. an HTTP request).
+        try:
+            is_reachable = transport.probe()
+        except Exception:
+            is_reachable = False
+        with self._lock:
+            stats.is_reachable = is_reachable
+            stats.probed_at = time.monotonic()
+        return is_reachable
+
+    def _record_send(self, transport: Transport, latency: float, is_ok: bool) -> None:
+        with self._lock:
+            stats = self._stats[transport.name]
+            stats.sends.append((latency, is_ok))
+            if is_ok:
+                stats.unhealthy_until = 0.0
+            elif (
+                len(stats.sends) >= MIN_SENDS_FOR_ERROR_RATE
+                and stats.error_rate >= MAX_ERROR_RATE
+            ):
+                stats.unhealthy_until = time.monotonic() + self.unhealthy_cooldown_secs
+
+
+class BaseBotteClientException(Exception):
+    pass
+
+
+class TransportError(BaseBotteClientException):
+    def __init__(
+        self, transport_name: str, message: str, is_not_delivered: bool = True
+    ):
+        # Raised by a transport when the message was not delivered; or, with
+        #  `is_not_delivered=False`, when it might have been (fi. a 5xx response).
+        self.transport_name = transport_name
+        self.is_not_delivered = is_not_delivered
+        super().__init__(f"{transport_name} transport failed: {message}")
+
+
+class DeliveryUnknownError(BaseBotteClientException):
+    def __init__(self, transport_name: str, error: Exception):
+        self.transport_name = transport_name
+        self.error = error
+        super().__init__(
+            f"{transport_name} transport failed, but the message might have been"
+            f" delivered: {error!r}"
+        )
+
+
+class NoTransportAvailable(BaseBotteClientException):
+    def __init__(self):
+        super().__init__("No Botte transport is reachable")
+
+
+class AllTransportsFailed(BaseBotteClientException):
+    def __init__(self, errors: dict[str, Exception]):
+        # Errors by transport name.
+        self.errors = errors
+        super().__init__(
+            "All Botte transports failed: "
+            + ", ".join(f"{name}: {exc!r}" for name, exc in errors.items())
+        )
@@ -0,0 +1,22 @@
+from _pytest.unittest import TestCaseFunction
+
+
+def pytest_collection_modifyitems(items: list[TestCaseFunction]):
+    """
+    Pytest markers:
+        slow
+            Slow tests are skipped by default. Use this marker for slow tests:
+            `@pytest.mark.slow` for functions and classes
+            `pytestmark = pytest.mark.slow` for modules.
+            Then, to run only the slow tests:
+            $ pytest -m slow tests/
+    """
+    for item in items:
+        if "slow" in item.keywords and (
+            not item.config.getoption("-m") or item.config.getoption("-m") != "slow"
+        ):
+            item.add_marker("skip")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "slow: slow test")
@@ -0,0 +1,230 @@
+import threading
+import time
+
+import botocore.exceptions
+import botte_lambda_client
+import pytest
+import requests
+import urllib3.exceptions
+
+from botte_client import (
+    AllTransportsFailed,
+    BotteClient,
+    DeliveryUnknownError,
+    LambdaTransport,
+    NoTransportAvailable,
+    Transport,
+    TransportError,
+)
+
+
+class FakeTransport(Transport):
+    def __init__(
+        self,
+        name: str,
+        delay: float = 0,
+        is_reachable: bool = True,
+        error: Exception | None = None,
+    ):
+        super().__init__(sender_app="BOTTE_CLIENT_PYTESTS")
+        self.name = name
+        self.delay = delay
+        self.is_reachable = is_reachable
+        self.error = error
+        self.texts = []
+        self.n_probes = 0
+
+    @classmethod
+    def make_queue(cls, name: str, **kwargs) -> "FakeTransport":
+        transport = cls(name, **kwargs)
+        transport.is_queue = True
+        return transport
+
+    def probe(self) -> bool:
+        self.n_probes += 1
+        return self.is_reachable
+
+    def send_message(self, text: str) -> None:
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        self.texts.append(text)
+
+
+class TestBotteClient:
+    def test_fastest_transport(self):
+        slow = FakeTransport("slow", delay=0.05)
+        fast = FakeTransport("fast", delay=0.01)
+        client = BotteClient(transports=[slow, fast])
+        # No stats yet: each transport is tried once, in order of preference.
+        assert client.send_message("Hello 0") == "slow"
+        assert client.send_message("Hello 1") == "fast"
+        for i in range(2, 5):
+            assert client.send_message(f"Hello {i}") == "fast"
+        assert slow.texts == ["Hello 0"]
+        assert client.get_stats()["fast"]["n_sends"] == 4
+
+    def test_unreachable_transport(self):
+        unreachable = FakeTransport("unreachable", is_reachable=False)
+        ok = FakeTransport("ok")
+        client = BotteClient(transports=[unreachable, ok])
+        for i in range(3):
+            assert client.send_message(f"Hello {i}") == "ok"
+        # Probed once only.
+        assert unreachable.n_probes == 1
+        assert ok.n_probes == 1
+        assert client.get_stats()["unreachable"]["is_reachable"] is False
+
+    def test_fallback(self):
+        broken = FakeTransport("broken", error=TransportError("broken", "boom"))
+        ok = FakeTransport("ok", delay=0.01)
+        client = BotteClient(transports=[broken, ok], unhealthy_cooldown_secs=60)
+        for i in range(5):
+            assert client.send_message(f"Hello {i}") == "ok"
+        assert ok.texts == [f"Hello {i}" for i in range(5)]
+        stats = client.get_stats()["broken"]
+        assert stats["error_rate"] == 1.0
+        # Skipped once unhealthy, after the min num of sends.
+        assert stats["n_sends"] == 3
+
+    def test_unhealthy_cooldown(self):
+        broken = FakeTransport("broken", error=TransportError("broken", "boom"))
+        ok = FakeTransport("ok", delay=0.01)
+        client = BotteClient(transports=[broken, ok], unhealthy_cooldown_secs=0.1)
+        for i in range(3):
+            client.send_message(f"Hello {i}")
+        broken.error = None
+        time.sleep(0.1)
+        # Tried again after the cooldown, and it is the fastest.
+        assert client.send_message("Hello 3") == "broken"
+
+    def test_all_failed(self):
+        client = BotteClient(
+            transports=[
+                FakeTransport("a", error=TransportError("a", "boom")),
+                FakeTransport("b", error=TransportError("b", "boom")),
+            ]
+        )
+        with pytest.raises(AllTransportsFailed) as exc_info:
+            client.send_message("Hello")
+        assert set(exc_info.value.errors) == {"a", "b"}
+
+    def test_fallback_on_not_delivered(self):
+        response = requests.Response()
+        response.status_code = 403
+        auth_error = Exception("The Botte BE Auth token is invalid")
+        auth_error.__cause__ = requests.HTTPError(response=response)
+        connection_refused = requests.ConnectionError(
+            urllib3.exceptions.MaxRetryError(
+                None, "/", urllib3.exceptions.NewConnectionError(None, "refused")
+            )
+        )
+        for error in (
+            auth_error,
+            connection_refused,
+            requests.ConnectTimeout(),
+            botocore.exceptions.EndpointConnectionError(endpoint_url="XXX"),
+        ):
+            ok = FakeTransport("ok")
+            client = BotteClient(transports=[FakeTransport("a", error=error), ok])
+            assert client.send_message("Hello") == "ok"
+            assert ok.texts == ["Hello"]
+
+    def test_no_fallback_when_maybe_delivered(self):
+        response = requests.Response()
+        response.status_code = 504
+        for error in (
+            requests.ReadTimeout(),
+            requests.HTTPError(response=response),
+            botocore.exceptions.ReadTimeoutError(endpoint_url="XXX"),
+            ValueError("boom"),
+        ):
+            ok = FakeTransport("ok")
+            client = BotteClient(transports=[FakeTransport("a", error=error), ok])
+            with pytest.raises(DeliveryUnknownError) as exc_info:
+                client.send_message("Hello")
+            assert exc_info.value.transport_name == "a"
+            assert exc_info.value.error is error
+            # Not sent again, as it might have been delivered.
+            assert ok.texts == []
+
+    def test_queue_last(self):
+        """
+        A transport that only enqueues is faster, but it is used only when the
+         others fail.
+        """
+        queue = FakeTransport.make_queue("queue")
+        slow = FakeTransport("slow", delay=0.02)
+        client = BotteClient(transports=[queue, slow])
+        for i in range(3):
+            assert client.send_message(f"Hello {i}") == "slow"
+        slow.error = TransportError("slow", "boom")
+        assert client.send_message("Hello 3") == "queue"
+        assert queue.texts == ["Hello 3"]
+
+    def test_no_transport(self):
+        client = BotteClient(
+            transports=[FakeTransport("a", is_reachable=False)],
+            unreachable_cooldown_secs=60,
+        )
+        with pytest.raises(NoTransportAvailable):
+            client.send_message("Hello")
+
+    def test_threads(self):
+        transport = FakeTransport("ok", delay=0.01)
+        client = BotteClient(transports=[transport])
+        threads = [
+            threading.Thread(target=client.send_message, args=(f"Hello {i}",))
+            for i in range(10)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert sorted(transport.texts) == sorted(f"Hello {i}" for i in range(10))
+
+
+class FakeBotteLambdaClient:
+    def __init__(self, status_code: int = 200, error: Exception | None = None):
+        self.status_code = status_code
+        self.error = error
+
+    def send_message(self, text: str, sender_app: str):
+        if self.error:
+            raise self.error
+        return {"text": text}, self.status_code
+
+
+class TestLambdaTransport:
+    def _send(self, lambda_client: FakeBotteLambdaClient) -> tuple[BotteClient, list]:
+        transport = LambdaTransport("BOTTE_CLIENT_PYTESTS")
+        transport.client = lambda_client
+        transport.probe = lambda: True
+        ok = FakeTransport("ok")
+        client = BotteClient(transports=[transport, ok])
+        return client, ok.texts
+
+    def test_ok(self):
+        client, fallback_texts = self._send(FakeBotteLambdaClient())
+        assert client.send_message("Hello") == "lambda"
+        assert fallback_texts == []
+
+    def test_4xx_fallback(self):
+        client, fallback_texts = self._send(FakeBotteLambdaClient(status_code=400))
+        assert client.send_message("Hello") == "ok"
+        assert fallback_texts == ["Hello"]
+
+    def test_maybe_delivered(self):
+        for lambda_client in (
+            FakeBotteLambdaClient(status_code=500),
+            FakeBotteLambdaClient(status_code=504),
+            FakeBotteLambdaClient(
+                error=botte_lambda_client.BotteLambdaFunctionError(
+                    "Unhandled", "Task timed out"
+                )
+            ),
+        ):
+            client, fallback_texts = self._send(lambda_client)
+            with pytest.raises(DeliveryUnknownError):
+                client.send_message("Hello")
+            assert fallback_texts == []
@@ -1 +1,2 @@
+from .buffered_dynamodb_client import *  # noqa: F403
 from .dynamodb_client import *  # noqa: F403
@@ -0,0 +1,225 @@
+"""
+** BUFFERED BOTTE DYNAMODB CLIENT **
+====================================
+
+Like `BotteDynamodbClient`, but `send_message()` returns immediately: messages are
+ buffered in memory and written by a background thread, with BatchWriteItem, when
+ the buffer is full (`max_buffer_size`) or its oldest message is old enough
+ (`max_buffer_age_secs`).
+So it adds no write latency to the main loop of the consumer.
+
+Mind that, in a Lambda, the background thread is frozen between invocations, so
+ call `flush()` at the end of the handler (or use the client as a context manager).
+
+Write errors are reported to the `on_error` callback, if given, otherwise they are
+ raised by the next `flush()` (or at the context manager exit).
+
+```py
+import botte_dynamodb_client
+
+with botte_dynamodb_client.BufferedBotteDynamodbClient(
+    sender_app="CONTABEL",
+    on_error=lambda exc, tasks: print(f"{len(tasks)} messages not sent: {exc}"),
+) as client:
+    for i in range(1000):
+        ...
+        client.send_message(f"Progress: {i}/1000")
+```
+"""
+
+import threading
+import time
+from collections.abc import Callable
+
+import botte_dynamodb_tasks
+
+from .dynamodb_client import (
+    TABLE_NAME,
+    BaseBotteDynamodbClientException,
+    BotteDynamodbClient,
+    UnprocessedItemsError,
+)
+
+__all__ = [
+    "BufferedBotteDynamodbClient",
+    "ClientClosedError",
+]
+
+# Flush when the buffer has this many messages: a single BatchWriteItem request.
+MAX_BUFFER_SIZE = botte_dynamodb_tasks.BATCH_WRITE_MAX_ITEMS
+# Flush when the oldest message in the buffer is this old.
+MAX_BUFFER_AGE_SECS = 1.0
+
+_OnErrorCallback = Callable[
+    [Exception, list[botte_dynamodb_tasks.BotteMessageDynamodbTask]], None
+]
+
+
+class BufferedBotteDynamodbClient:
+    def __init__(
+        self,
+        sender_app: str = "BOTTE_DYNAMODB_CLIENT",
+        do_send_msg_fifo: bool = False,
+        fifo_group_id: str | None = None,
+        table_name: str = TABLE_NAME,
+        max_buffer_size: int = MAX_BUFFER_SIZE,
+        max_buffer_age_secs: float = MAX_BUFFER_AGE_SECS,
+        on_error: _OnErrorCallback | None = None,
+        client: BotteDynamodbClient | None = None,
+    ):
+        """
+        Args:
+            sender_app: see `BotteDynamodbClient.send_message()`.
+            do_send_msg_fifo: see `BotteDynamodbClient.send_message()`.
+            fifo_group_id: see `BotteDynamodbClient.send_message()`.
+            table_name: see `BotteDynamodbClient.send_message()`.
+            max_buffer_size: flush when the buffer has this many messages.
+            max_buffer_age_secs: flush when the oldest message in the buffer is this
+             old.
+            on_error: callback invoked, in the background thread, with the exception
+             and the tasks that were not written: for `UnprocessedItemsError` only
+             its tasks (the others were written), otherwise all the tasks of the
+             failed write. If None, the exception is raised by the next `flush()`.
+            client: the client used to write, default: a new `BotteDynamodbClient`.
+        """
+        self.sender_app = sender_app
+        self.do_send_msg_fifo = do_send_msg_fifo
+        self.fifo_group_id = fifo_group_id
+        self.table_name = table_name
+        self.max_buffer_size = max_buffer_size
+        self.max_buffer_age_secs = max_buffer_age_secs
+        self.on_error = on_error
+        self.client = client or BotteDynamodbClient()
+
+        self._buffer: list[botte_dynamodb_tasks.BotteMessageDynamodbTask] = []
+        # Monotonic ts of the oldest message in the buffer.
+        self._buffer_start_ts = 0.0
+        self._n_in_flight = 0
+        self._is_flush_requested = False
+        self._is_closed = False
+        self._errors: list[Exception] = []
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+
+    def __enter__(self) -> "BufferedBotteDynamodbClient":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def send_message(self, text: str) -> botte_dynamodb_tasks.BotteMessageDynamodbTask:
+        """
+        Buffer a message, to be written in the background.
+        It returns immediately the task that will be written.
+        """
+        if self._is_closed:
+            raise ClientClosedError()
+
+        # The task (and so its KSUID) is built now, so the FIFO order is the order of
+        #  the calls. The default ExpirationTs is 1 hour after the task creation.
+        task = botte_dynamodb_tasks.BotteMessageDynamodbTask(
+            text=text,
+            sender_app=self.sender_app,
+            do_process_task_fifo=self.do_send_msg_fifo,
+            fifo_group_id=self.fifo_group_id,
+        )
+        with self._cond:
+            if not self._buffer:
+                self._buffer_start_ts = time.monotonic()
+            self._buffer.append(task)
+            self._ensure_thread()
+            self._cond.notify_all()
+        return task
+
+    def flush(self) -> None:
+        """
+        Block until all the buffered messages are written.
+        If there is no `on_error` callback, raise the first write error since the last
+         flush.
+        """
+        with self._cond:
+            self._is_flush_requested = True
+            self._cond.notify_all()
+            while self._buffer or self._n_in_flight:
+                self._ensure_thread()
+                self._cond.wait()
+            self._is_flush_requested = False
+            errors, self._errors = self._errors, []
+        if errors:
+            raise errors[0]
+
+    def close(self) -> None:
+        """
+        Flush and stop the background thread.
+        """
+        try:
+            self.flush()
+        finally:
+            with self._cond:
+                self._is_closed = True
+                self._cond.notify_all()
+            if self._thread:
+                self._thread.join()
+
+    def _ensure_thread(self) -> None:
+        # Lazily, and again if it died.
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run, name="BufferedBotteDynamodbClient", daemon=True
+            )
+            self._thread.start()
+
+    def _is_flush_due(self) -> bool:
+        return bool(self._buffer) and (
+            self._is_flush_requested
+            or self._is_closed
+            or len(self._buffer) >= self.max_buffer_size
+            or time.monotonic() - self._buffer_start_ts >= self.max_buffer_age_secs
+        )
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._is_flush_due():
+                    if self._is_closed:
+                        return
+                    timeout = None
+                    if self._buffer:
+                        timeout = self.max_buffer_age_secs - (
+                            time.monotonic() - self._buffer_start_ts
+                        )
+                    self._cond.wait(timeout)
+                tasks, self._buffer = self._buffer, []
+                self._n_in_flight = len(tasks)
+
+            try:
+                self.client.write_tasks(tasks, table_name=self.table_name)
+            except Exception as exc:
+                self._handle_error(exc, tasks)
+            finally:
+                with self._cond:
+                    self._n_in_flight = 0
+                    self._cond.notify_all()
+
+    def _handle_error(
+        self,
+        exc: Exception,
+        tasks: list[botte_dynamodb_tasks.BotteMessageDynamodbTask],
+    ) -> None:
+        if self.on_error is None:
+            with self._cond:
+                self._errors.append(exc)
+            return
+        if isinstance(exc, UnprocessedItemsError):
+            tasks = exc.tasks
+        try:
+            self.on_error(exc, tasks)
+        except Exception as callback_exc:
+            # Do not kill the background thread.
+            with self._cond:
+                self._errors.append(callback_exc)
+
+
+class ClientClosedError(BaseBotteDynamodbClientException):
+    def __init__(self):
+        super().__init__("The client is closed")
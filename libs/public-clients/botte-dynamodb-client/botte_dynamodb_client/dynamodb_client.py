@@ -28,21 +28,60 @@ response = client.send_message(
     "Hello world!",
     sender_app="BOTTE_DYNAMODB_CLIENT_PYTESTS",
 )
+
+# Many messages, in chunks of 25 with BatchWriteItem.
+tasks = client.send_messages(
+    ["Hello 1", "Hello 2"],
+    sender_app="BOTTE_DYNAMODB_CLIENT_PYTESTS",
+)
 ```
 """
 
 import aws_dynamodb_client
+
+# Boto3 is required by aws-dynamodb-client and botte-dynamodb-tasks.
+import boto3
 import botte_dynamodb_tasks
-import datetime_utils
 
 __all__ = [
     "BotteDynamodbClient",
+    "BaseBotteDynamodbClientException",
+    "UnprocessedItemsError",
 ]
 
 TABLE_NAME = "botte-be-task-prod"
 
+# Retries for the unprocessed items in a BatchWriteItem response (fi. because of
+#  throttling), with exponential backoff and full jitter (see
+#  `botte_dynamodb_tasks.iter_batch_write_tasks()`).
+BATCH_WRITE_MAX_RETRIES = 5
+BATCH_WRITE_BACKOFF_BASE_SECS = 0.05
+BATCH_WRITE_BACKOFF_MAX_SECS = 2.0
+
 
 class BotteDynamodbClient:
+    def __init__(self):
+        """
+        The DynamoDB handles are created at the first usage and re-used by all the
+         following calls, so use a single client instance for many messages.
+        """
+        self._tables: dict[str, aws_dynamodb_client.DynamodbTable] = {}
+        self._client = None
+
+    def _get_table(self, table_name: str) -> aws_dynamodb_client.DynamodbTable:
+        table = self._tables.get(table_name)
+        if table is None:
+            table = aws_dynamodb_client.DynamodbTable(table_name)
+            self._tables[table_name] = table
+        return table
+
+    def _get_client(self):
+        # Low-level client, as BatchWriteItem takes the items in the DynamoDB JSON
+        #  format (`BotteMessageDynamodbTask.to_dynamodb_item()`).
+        if self._client is None:
+            self._client = boto3.client("dynamodb")
+        return self._client
+
     def send_message(
         self,
         text: str,
@@ -79,14 +118,14 @@ class BotteDynamodbClient:
                 )
         """
 
-        table = aws_dynamodb_client.DynamodbTable(table_name)
-        now = datetime_utils.now_utc()
+        table = self._get_table(table_name)
+        # The default ExpirationTs is 1 hour after the task creation: Botte drops
+        #  the tasks past their ExpirationTs, so it must not be now.
         data = dict(
             text=text,
             sender_app=sender_app,
             do_process_task_fifo=do_send_msg_fifo,
             fifo_group_id=fifo_group_id,
-            expiration_ts=round(now.timestamp()),
         )
         data.update(botte_message_dynamodb_task_extra_kwargs or {})
         task = botte_dynamodb_tasks.BotteMessageDynamodbTask(**data)
@@ -114,3 +153,84 @@ class BotteDynamodbClient:
         #                     'x-amzn-requestid': 'AEMBQ9DAB9PGQ6KNQAUDK5DFKNVV4KQNSO5AEMVJF66Q9ASUAAJG'},
         #     'RetryAttempts': 0}}
         return response
+
+    def send_messages(
+        self,
+        texts: list[str],
+        sender_app: str = "BOTTE_DYNAMODB_CLIENT",
+        do_send_msg_fifo: bool = False,
+        fifo_group_id: str | None = None,
+        table_name: str = TABLE_NAME,
+        max_retries: int = BATCH_WRITE_MAX_RETRIES,
+    ) -> list[botte_dynamodb_tasks.BotteMessageDynamodbTask]:
+        """
+        Send many messages, with a BatchWriteItem request per chunk of 25 messages.
+        With `do_send_msg_fifo`, messages are sent in the same order as `texts`.
+
+        Args:
+            texts: the texts of the messages to send.
+            sender_app: see `send_message()`.
+            do_send_msg_fifo: see `send_message()`.
+            fifo_group_id: see `send_message()`.
+            table_name: see `send_message()`.
+            max_retries: max number of retries for the unprocessed items in a
+             BatchWriteItem response; then `UnprocessedItemsError` is raised.
+
+        Returns the tasks written to the DynamoDB table.
+        """
+        # The default ExpirationTs is 1 hour from now, see `send_message()`.
+        chunks = botte_dynamodb_tasks.BotteMessageDynamodbTask.build_many(
+            texts,
+            sender_app=sender_app,
+            do_process_task_fifo=do_send_msg_fifo,
+            fifo_group_id=fifo_group_id,
+        )
+
+        tasks = [task for chunk in chunks for task in chunk]
+        self.write_tasks(tasks, table_name=table_name, max_retries=max_retries)
+        return tasks
+
+    def write_tasks(
+        self,
+        tasks: list[botte_dynamodb_tasks.BotteMessageDynamodbTask],
+        table_name: str = TABLE_NAME,
+        max_retries: int = BATCH_WRITE_MAX_RETRIES,
+    ) -> None:
+        """
+        Write already built tasks, with a BatchWriteItem request per chunk of 25 tasks.
+
+        Args:
+            tasks: the tasks to write.
+            table_name: see `send_message()`.
+            max_retries: see `send_messages()`.
+
+        Raise `UnprocessedItemsError`, with the tasks not written (the unprocessed
+         ones and the ones in the following chunks), after `max_retries`.
+        """
+        written_sks = set()
+        try:
+            for chunk in botte_dynamodb_tasks.iter_batch_write_tasks(
+                self._get_client(),
+                table_name,
+                tasks,
+                max_retries=max_retries,
+                backoff_base_secs=BATCH_WRITE_BACKOFF_BASE_SECS,
+                backoff_max_secs=BATCH_WRITE_BACKOFF_MAX_SECS,
+            ):
+                written_sks.update(x.sk for x in chunk)
+        except botte_dynamodb_tasks.UnprocessedItemsError as exc:
+            raise UnprocessedItemsError(
+                [x for x in tasks if x.sk not in written_sks]
+            ) from exc
+
+
+class BaseBotteDynamodbClientException(Exception):
+    pass
+
+
+class UnprocessedItemsError(BaseBotteDynamodbClientException):
+    def __init__(self, tasks: list[botte_dynamodb_tasks.BotteMessageDynamodbTask]):
+        # The tasks not written, so the caller can retry only those.
+        self.tasks = tasks
+        self.n_items = len(tasks)
+        super().__init__(f"{self.n_items} items not processed by BatchWriteItem")
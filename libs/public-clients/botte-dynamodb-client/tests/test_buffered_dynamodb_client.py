@@ -0,0 +1,115 @@
+import threading
+import time
+
+import pytest
+
+import botte_dynamodb_client
+
+
+class FakeBotteDynamodbClient(botte_dynamodb_client.BotteDynamodbClient):
+    """
+    Records the written tasks, instead of writing to DynamoDB.
+    """
+
+    def __init__(self, delay: float = 0, error: Exception | None = None):
+        super().__init__()
+        self.delay = delay
+        self.error = error
+        self.writes = []
+        self.thread_names = set()
+        # Set at each write, so tests can wait for the background thread.
+        self.written = threading.Event()
+
+    def write_tasks(self, tasks, table_name=None, max_retries=None):
+        self.thread_names.add(threading.current_thread().name)
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        self.writes.append([x.text for x in tasks])
+        self.written.set()
+
+
+@pytest.mark.novcr
+class TestBufferedBotteDynamodbClient:
+    def test_send_message_returns_immediately(self):
+        fake = FakeBotteDynamodbClient(delay=0.5)
+        client = botte_dynamodb_client.BufferedBotteDynamodbClient(
+            max_buffer_size=1, client=fake
+        )
+        start = time.perf_counter()
+        task = client.send_message("Hello 1")
+        assert time.perf_counter() - start < 0.1
+        assert task.text == "Hello 1"
+        # Not expired when Botte reads it.
+        assert task.expiration_ts > time.time() + 50 * 60
+        client.flush()
+        assert fake.writes == [["Hello 1"]]
+        assert threading.current_thread().name not in fake.thread_names
+        client.close()
+
+    def test_flush_size(self):
+        fake = FakeBotteDynamodbClient()
+        with botte_dynamodb_client.BufferedBotteDynamodbClient(
+            max_buffer_size=3, max_buffer_age_secs=60, client=fake
+        ) as client:
+            for i in range(3):
+                client.send_message(f"Hello {i}")
+            # Written by the background thread, with no flush.
+            assert fake.written.wait(timeout=5)
+            assert fake.writes == [["Hello 0", "Hello 1", "Hello 2"]]
+
+    def test_flush_age(self):
+        fake = FakeBotteDynamodbClient()
+        with botte_dynamodb_client.BufferedBotteDynamodbClient(
+            max_buffer_size=100, max_buffer_age_secs=0.1, client=fake
+        ) as client:
+            start = time.perf_counter()
+            client.send_message("Hello 1")
+            client.send_message("Hello 2")
+            # Written by the background thread, with no flush.
+            assert fake.written.wait(timeout=5)
+            assert time.perf_counter() - start >= 0.1
+            assert fake.writes == [["Hello 1", "Hello 2"]]
+
+    def test_flush_on_exit(self):
+        fake = FakeBotteDynamodbClient()
+        with botte_dynamodb_client.BufferedBotteDynamodbClient(
+            max_buffer_size=100, max_buffer_age_secs=60, client=fake
+        ) as client:
+            client.send_message("Hello 1")
+        assert fake.writes == [["Hello 1"]]
+        with pytest.raises(botte_dynamodb_client.ClientClosedError):
+            client.send_message("Hello 2")
+
+    def test_on_error(self):
+        errors = []
+        fake = FakeBotteDynamodbClient(error=ValueError("XXX"))
+        with botte_dynamodb_client.BufferedBotteDynamodbClient(
+            client=fake, on_error=lambda exc, tasks: errors.append((exc, tasks))
+        ) as client:
+            client.send_message("Hello 1")
+        ((exc, tasks),) = errors
+        assert str(exc) == "XXX"
+        assert [x.text for x in tasks] == ["Hello 1"]
+
+    def test_on_error_unprocessed_items(self):
+        errors = []
+        fake = FakeBotteDynamodbClient()
+        with botte_dynamodb_client.BufferedBotteDynamodbClient(
+            client=fake, on_error=lambda exc, tasks: errors.append((exc, tasks))
+        ) as client:
+            tasks = [client.send_message(f"Hello {i}") for i in range(3)]
+            fake.error = botte_dynamodb_client.UnprocessedItemsError(tasks[1:])
+        # Only the tasks not written.
+        ((exc, not_written_tasks),) = errors
+        assert isinstance(exc, botte_dynamodb_client.UnprocessedItemsError)
+        assert not_written_tasks == tasks[1:]
+
+    def test_error_raised_by_flush(self):
+        fake = FakeBotteDynamodbClient(error=ValueError("XXX"))
+        client = botte_dynamodb_client.BufferedBotteDynamodbClient(client=fake)
+        client.send_message("Hello 1")
+        with pytest.raises(ValueError):
+            client.flush()
+        # Errors are raised only once.
+        client.close()
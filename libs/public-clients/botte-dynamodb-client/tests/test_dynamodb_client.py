@@ -1,8 +1,13 @@
+import time
+
 import aws_dynamodb_client
+import botte_dynamodb_tasks
 import pytest
+from botocore.stub import ANY, Stubber
 from ksuid import KsuidMs
 
 import botte_dynamodb_client
+from botte_dynamodb_client.dynamodb_client import TABLE_NAME
 
 
 class TestSendMessage:
@@ -124,3 +129,93 @@ class TestSendMessage:
                 sender_app="BOTTE_DYNAMODB_CLIENT_PYTESTS",
                 table_name="XXX",
             )
+
+
+@pytest.mark.novcr
+class TestSendMessages:
+    def setup_method(self):
+        self.texts = [
+            f"Hello world from (botte-monorepo) botte dynamodb client pytests! {i}"
+            for i in range(30)
+        ]
+        self.client = botte_dynamodb_client.BotteDynamodbClient()
+        self.stubber = Stubber(self.client._get_client())
+
+    def test_happy_flow(self):
+        self.stubber.add_response(
+            "batch_write_item", {"UnprocessedItems": {}}, {"RequestItems": ANY}
+        )
+        self.stubber.add_response(
+            "batch_write_item", {"UnprocessedItems": {}}, {"RequestItems": ANY}
+        )
+        with self.stubber:
+            tasks = self.client.send_messages(
+                self.texts,
+                sender_app="BOTTE_DYNAMODB_CLIENT_PYTESTS",
+                do_send_msg_fifo=True,
+            )
+        self.stubber.assert_no_pending_responses()
+        assert [x.text for x in tasks] == self.texts
+        assert [x.text for x in sorted(tasks, key=lambda x: x.sk)] == self.texts
+        # Not expired when Botte reads them.
+        assert all(x.expiration_ts > time.time() + 50 * 60 for x in tasks)
+
+    def test_unprocessed_items(self, monkeypatch):
+        monkeypatch.setattr(time, "sleep", lambda _: None)
+        chunks = botte_dynamodb_tasks.BotteMessageDynamodbTask.build_many(
+            self.texts[:3], sender_app="BOTTE_DYNAMODB_CLIENT_PYTESTS"
+        )
+        unprocessed = [
+            {"PutRequest": {"Item": task.to_dynamodb_item()}} for task in chunks[0][1:]
+        ]
+        self.stubber.add_response(
+            "batch_write_item",
+            {"UnprocessedItems": {TABLE_NAME: unprocessed}},
+            {"RequestItems": ANY},
+        )
+        self.stubber.add_response(
+            "batch_write_item",
+            {"UnprocessedItems": {}},
+            {"RequestItems": {TABLE_NAME: unprocessed}},
+        )
+        monkeypatch.setattr(
+            botte_dynamodb_tasks.BotteMessageDynamodbTask,
+            "build_many",
+            lambda *args, **kwargs: chunks,
+        )
+        with self.stubber:
+            tasks = self.client.send_messages(
+                self.texts[:3], sender_app="BOTTE_DYNAMODB_CLIENT_PYTESTS"
+            )
+        self.stubber.assert_no_pending_responses()
+        assert len(tasks) == 3
+
+    def test_unprocessed_items_too_many_retries(self, monkeypatch):
+        monkeypatch.setattr(time, "sleep", lambda _: None)
+        chunks = botte_dynamodb_tasks.BotteMessageDynamodbTask.build_many(
+            self.texts[:3], sender_app="BOTTE_DYNAMODB_CLIENT_PYTESTS"
+        )
+        unprocessed = [
+            {"PutRequest": {"Item": task.to_dynamodb_item()}} for task in chunks[0][1:]
+        ]
+        self.stubber.add_response(
+            "batch_write_item",
+            {"UnprocessedItems": {TABLE_NAME: unprocessed}},
+            {"RequestItems": ANY},
+        )
+        monkeypatch.setattr(
+            botte_dynamodb_tasks.BotteMessageDynamodbTask,
+            "build_many",
+            lambda *args, **kwargs: chunks,
+        )
+        with (
+            self.stubber,
+            pytest.raises(botte_dynamodb_client.UnprocessedItemsError) as exc_info,
+        ):
+            self.client.send_messages(
+                self.texts[:3],
+                sender_app="BOTTE_DYNAMODB_CLIENT_PYTESTS",
+                max_retries=0,
+            )
+        # Only the tasks not written are attached.
+        assert exc_info.value.tasks == chunks[0][1:]
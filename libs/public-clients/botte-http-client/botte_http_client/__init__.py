@@ -1 +1,3 @@
+from .async_http_client import *  # noqa: F403
+from .background_http_client import *  # noqa: F403
 from .http_client import *  # noqa: F403
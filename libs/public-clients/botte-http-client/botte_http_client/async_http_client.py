@@ -0,0 +1,224 @@
+"""
+** ASYNC BOTTE HTTP CLIENT **
+=============================
+
+Same as `BotteHttpClient`, but for asyncio consumers: it does not block the event
+ loop. It requires the extra `async`:
+```sh
+$ poetry add "botte-http-client[async] @ git+https://github.com/puntonim/botte-monorepo#subdirectory=libs/public-clients/botte-http-client"
+```
+
+It has the same methods, and it returns the same responses and raises the same
+ exceptions, as `BotteHttpClient`: fi. `HttpStatusError` for an error response, and
+ never `httpx.HTTPStatusError`.
+
+The client owns a pooled keep-alive HTTP client, and the number of concurrent
+ requests is capped by `max_concurrency`, so many messages can be sent concurrently:
+```py
+import asyncio
+import botte_http_client
+
+async def main():
+    async with botte_http_client.AsyncBotteHttpClient() as client:
+        response = await client.send_message("Hello world!", botte_be_api_auth_token="XXX")
+        assert response.data["text"] == "Hello world!"
+
+        responses = await client.send_many(
+            ["Hello 1", "Hello 2"], botte_be_api_auth_token="XXX"
+        )
+
+asyncio.run(main())
+```
+"""
+
+import asyncio
+
+try:
+    import httpx
+except ImportError:  # Optional extra: botte-http-client[async].
+    httpx = None
+
+from .http_client import (
+    BOTTE_BE_BASE_URL,
+    POOL_MAXSIZE,
+    AuthError,
+    Error404,
+    HttpStatusError,
+    NotError500,
+    SendHealthResponse,
+    SendMessageResponse,
+    SendMessagesResponse,
+    SendUnhealthResponse,
+    SendVersionResponse,
+)
+
+__all__ = [
+    "AsyncBotteHttpClient",
+]
+
+# Same as API Gateway max timeout.
+TIMEOUT_SECS = 30
+
+
+class AsyncBotteHttpClient:
+    def __init__(
+        self,
+        base_url: str = BOTTE_BE_BASE_URL,
+        max_concurrency: int = POOL_MAXSIZE,
+        timeout: float = TIMEOUT_SECS,
+    ):
+        """
+        Args:
+            base_url (str): base url of the Botte Backend Lambda, optional.
+            max_concurrency (int): max number of concurrent requests, which is also
+             the max number of connections in the pool.
+            timeout (float): timeout in secs for each request.
+
+        Mind that it must be used within a single event loop.
+        """
+        if httpx is None:
+            raise ImportError(
+                "AsyncBotteHttpClient requires the extra: botte-http-client[async]"
+            )
+        self.base_url = base_url
+        self.client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_concurrency,
+                max_keepalive_connections=max_concurrency,
+            ),
+            timeout=timeout,
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def aclose(self) -> None:
+        """
+        Close the keep-alive connections.
+        """
+        await self.client.aclose()
+
+    async def __aenter__(self) -> "AsyncBotteHttpClient":
+        return self
+
+    async def __aexit__(self, *args, **kwargs) -> None:
+        await self.aclose()
+
+    async def _request(self, method: str, url: str, **kwargs) -> "httpx.Response":
+        async with self._semaphore:
+            return await self.client.request(method, url, **kwargs)
+
+    async def get_health(self):
+        url = f"{self.base_url}/health"
+        response = await self._request("GET", url)
+
+        try:
+            response.raise_for_status()
+        except httpx.HTTPStatusError as exc:
+            if response.status_code == 404:
+                raise Error404(f"The url returned 404: {url}") from exc
+            raise HttpStatusError(response.status_code, url) from exc
+
+        return SendHealthResponse(response)
+
+    async def get_unhealth(self):
+        url = f"{self.base_url}/unhealth"
+        response = await self._request("GET", url)
+
+        try:
+            response.raise_for_status()
+        except httpx.HTTPStatusError as exc:
+            if response.status_code != 500:
+                raise NotError500(response.status_code) from exc
+
+        return SendUnhealthResponse(response)
+
+    async def get_version(self):
+        url = f"{self.base_url}/version"
+        response = await self._request("GET", url)
+
+        try:
+            response.raise_for_status()
+        except httpx.HTTPStatusError as exc:
+            if response.status_code == 404:
+                raise Error404(f"The url returned 404: {url}") from exc
+            raise HttpStatusError(response.status_code, url) from exc
+
+        return SendVersionResponse(response)
+
+    async def send_message(
+        self,
+        text: str,
+        botte_be_api_auth_token: str,
+        sender_app: str = "BOTTE_HTTP_CLIENT",
+    ):
+        """
+        See `BotteHttpClient.send_message()`.
+        """
+        url = f"{self.base_url}/message"
+        data = dict(
+            text=text,
+            sender_app=sender_app,  # Optional.
+        )
+        response = await self._post(url, data, botte_be_api_auth_token)
+        return SendMessageResponse(response)
+
+    async def send_messages(
+        self,
+        texts: list[str],
+        botte_be_api_auth_token: str,
+        sender_app: str = "BOTTE_HTTP_CLIENT",
+        do_send_in_order: bool = True,
+    ):
+        """
+        See `BotteHttpClient.send_messages()`.
+        """
+        url = f"{self.base_url}/messages"
+        data = dict(
+            messages=[{"text": text} for text in texts],
+            sender_app=sender_app,  # Optional.
+            do_send_in_order=do_send_in_order,
+        )
+        response = await self._post(url, data, botte_be_api_auth_token)
+        return SendMessagesResponse(response)
+
+    async def send_many(
+        self,
+        texts: list[str],
+        botte_be_api_auth_token: str,
+        sender_app: str = "BOTTE_HTTP_CLIENT",
+    ) -> list[SendMessageResponse | Exception]:
+        """
+        Send many messages concurrently, one request per message, with at most
+         `max_concurrency` requests at the same time.
+        Unlike `send_messages()`, the messages might be delivered in any order.
+
+        Returns the responses, in the same order as `texts`. A failed message does not
+         stop the others: its exception is returned instead of the response.
+        """
+        return await asyncio.gather(
+            *(
+                self.send_message(
+                    text,
+                    botte_be_api_auth_token=botte_be_api_auth_token,
+                    sender_app=sender_app,
+                )
+                for text in texts
+            ),
+            return_exceptions=True,
+        )
+
+    async def _post(
+        self, url: str, data: dict, botte_be_api_auth_token: str
+    ) -> "httpx.Response":
+        headers = {"authorization": botte_be_api_auth_token}
+        response = await self._request("POST", url, headers=headers, json=data)
+
+        try:
+            response.raise_for_status()
+        except httpx.HTTPStatusError as exc:
+            if response.status_code == 403:
+                raise AuthError("The Botte BE Auth token is invalid") from exc
+            elif response.status_code == 404:
+                raise Error404(f"The url returned 404: {url}") from exc
+            raise HttpStatusError(response.status_code, url) from exc
+
+        return response
@@ -0,0 +1,296 @@
+"""
+** BACKGROUND BOTTE HTTP CLIENT **
+==================================
+
+Like `BotteHttpClient`, but `send_message()` never blocks: messages are put on an
+ in-memory queue and sent by a background thread, over the pooled session of a
+ `BotteHttpClient`.
+So it adds no latency to the main loop of the consumer, fi. a script that sends
+ progress pings.
+
+The messages queued while a request is in flight are coalesced in a single request to
+ the batch endpoint `/messages` (see `BotteHttpClient.send_messages()`).
+
+The queue is bounded (`max_queue_size`): when it is full, the oldest message is
+ dropped to make room for the new one, so the memory is bounded even if Botte is
+ down or slow.
+
+The queue is flushed at interpreter exit (for at most `exit_timeout_secs`), or
+ call `flush()` (or use the client as a context manager).
+
+Send errors are reported to the `on_error` callback, if given, otherwise they are
+ raised by the next `flush()` (or at the context manager exit).
+
+```py
+import botte_http_client
+
+with botte_http_client.BackgroundBotteHttpClient(
+    botte_be_api_auth_token="XXX",
+    sender_app="MY_SCRIPT",
+    on_error=lambda exc, texts: print(f"{len(texts)} messages not sent: {exc}"),
+) as client:
+    for i in range(1000):
+        ...
+        client.send_message(f"Progress: {i}/1000")
+```
+"""
+
+import atexit
+import functools
+import threading
+import time
+import weakref
+from collections import deque
+from collections.abc import Callable
+
+from .http_client import (
+    BaseBotteHttpClientException,
+    BotteHttpClient,
+    Error404,
+)
+
+__all__ = [
+    "BackgroundBotteHttpClient",
+    "ClientClosedError",
+    "MessagesNotSentError",
+]
+
+# Max number of messages in the queue: then the oldest is dropped.
+MAX_QUEUE_SIZE = 1000
+# Max number of messages coalesced in a single request: the max accepted by the
+#  batch endpoint `/messages`.
+MAX_BATCH_SIZE = 20
+# Max secs to wait for the queue to be flushed at interpreter exit.
+EXIT_TIMEOUT_SECS = 10.0
+
+_OnErrorCallback = Callable[[Exception, list[str]], None]
+
+
+class BackgroundBotteHttpClient:
+    def __init__(
+        self,
+        botte_be_api_auth_token: str,
+        sender_app: str = "BOTTE_HTTP_CLIENT",
+        max_queue_size: int = MAX_QUEUE_SIZE,
+        max_batch_size: int = MAX_BATCH_SIZE,
+        exit_timeout_secs: float = EXIT_TIMEOUT_SECS,
+        on_error: _OnErrorCallback | None = None,
+        client: BotteHttpClient | None = None,
+    ):
+        """
+        Args:
+            botte_be_api_auth_token: see `BotteHttpClient.send_message()`.
+            sender_app: see `BotteHttpClient.send_message()`.
+            max_queue_size: max number of messages in the queue: then the oldest is
+             dropped.
+            max_batch_size: max number of messages coalesced in a single request; 1
+             to never use the batch endpoint.
+            exit_timeout_secs: max secs to wait for the queue to be flushed at
+             interpreter exit.
+            on_error: callback invoked, in the background thread, with the exception
+             and the texts that were not sent. If None, the exception is raised by
+             the next `flush()`.
+            client: the client used to send, default: a new `BotteHttpClient`.
+        """
+        self.botte_be_api_auth_token = botte_be_api_auth_token
+        self.sender_app = sender_app
+        self.max_batch_size = max_batch_size
+        self.exit_timeout_secs = exit_timeout_secs
+        self.on_error = on_error
+        self.client = client or BotteHttpClient()
+        # Number of messages dropped because the queue was full.
+        self.n_dropped = 0
+        # Number of send errors (including the ones already raised or passed to
+        #  `on_error`).
+        self.n_errors = 0
+
+        # A deque with `maxlen` drops the oldest item when full.
+        self._queue: deque[str] = deque(maxlen=max_queue_size)
+        self._n_in_flight = 0
+        # Set to False when the BE has no batch endpoint (404).
+        self._is_batch_endpoint_available = True
+        self._is_closed = False
+        # Only the first error since the last flush is kept (the others are counted
+        #  in `n_errors`), so the memory is bounded even if Botte is down.
+        self._first_error: Exception | None = None
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+        # With a weak reference, so the atexit registry does not keep the client
+        #  alive. Unregistered by `close()`.
+        self._atexit_hook = functools.partial(_close_at_exit, weakref.ref(self))
+        atexit.register(self._atexit_hook)
+
+    def __enter__(self) -> "BackgroundBotteHttpClient":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def send_message(self, text: str) -> None:
+        """
+        Queue a message, to be sent in the background. It returns immediately.
+        """
+        if self._is_closed:
+            raise ClientClosedError()
+
+        with self._cond:
+            if len(self._queue) == self._queue.maxlen:
+                self.n_dropped += 1
+            self._queue.append(text)
+            self._ensure_thread()
+            self._cond.notify_all()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """
+        Block until all the queued messages are sent, or until `timeout` secs.
+        If there is no `on_error` callback, raise the first send error since the last
+         flush (the others are only counted in `n_errors`).
+
+        Returns False if the timeout expired.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._queue or self._n_in_flight:
+                self._ensure_thread()
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            error, self._first_error = self._first_error, None
+        if error:
+            raise error
+        return True
+
+    def close(self) -> None:
+        """
+        Flush and stop the background thread.
+        """
+        atexit.unregister(self._atexit_hook)
+        try:
+            self.flush()
+        finally:
+            self._stop()
+
+    def _close_at_exit(self) -> None:
+        try:
+            self.flush(timeout=self.exit_timeout_secs)
+        except Exception:
+            # Nobody to raise to at interpreter exit.
+            pass
+        finally:
+            self._stop()
+
+    def _stop(self) -> None:
+        with self._cond:
+            self._is_closed = True
+            self._cond.notify_all()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=self.exit_timeout_secs)
+
+    def _ensure_thread(self) -> None:
+        # Lazily, and again if it died.
+        if self._is_closed:
+            return
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run, name="BackgroundBotteHttpClient", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue:
+                    if self._is_closed:
+                        return
+                    self._cond.wait()
+                # All the messages queued while the previous request was in flight
+                #  are coalesced in a single request.
+                batch_size = (
+                    self.max_batch_size if self._is_batch_endpoint_available else 1
+                )
+                texts = [
+                    self._queue.popleft()
+                    for _ in range(min(batch_size, len(self._queue)))
+                ]
+                self._n_in_flight = len(texts)
+
+            try:
+                self._send(texts)
+            except Exception as exc:
+                self._handle_error(exc, texts)
+            finally:
+                with self._cond:
+                    self._n_in_flight = 0
+                    self._cond.notify_all()
+
+    def _send(self, texts: list[str]) -> None:
+        if len(texts) == 1:
+            self.client.send_message(
+                texts[0],
+                botte_be_api_auth_token=self.botte_be_api_auth_token,
+                sender_app=self.sender_app,
+            )
+            return
+
+        try:
+            response = self.client.send_messages(
+                texts,
+                botte_be_api_auth_token=self.botte_be_api_auth_token,
+                sender_app=self.sender_app,
+            )
+        except Error404:
+            # An older Botte BE, with no batch endpoint: send one by one from now on.
+            self._is_batch_endpoint_available = False
+            for text in texts:
+                try:
+                    self._send([text])
+                except Exception as exc:
+                    self._handle_error(exc, [text])
+            return
+
+        failed_texts = [
+            text
+            for text, result in zip(texts, response.data["results"], strict=True)
+            if result.get("status_code") != 200
+        ]
+        if failed_texts:
+            raise MessagesNotSentError(failed_texts)
+
+    def _handle_error(self, exc: Exception, texts: list[str]) -> None:
+        if isinstance(exc, MessagesNotSentError):
+            texts = exc.texts
+        if self.on_error is None:
+            self._add_error(exc)
+            return
+        try:
+            self.on_error(exc, texts)
+        except Exception as callback_exc:
+            # Do not kill the background thread.
+            self._add_error(callback_exc)
+        else:
+            with self._cond:
+                self.n_errors += 1
+
+    def _add_error(self, exc: Exception) -> None:
+        with self._cond:
+            self.n_errors += 1
+            if self._first_error is None:
+                self._first_error = exc
+
+
+def _close_at_exit(client_ref: weakref.ref) -> None:
+    client = client_ref()
+    if client is not None:
+        client._close_at_exit()
+
+
+class ClientClosedError(BaseBotteHttpClientException):
+    def __init__(self):
+        super().__init__("The client is closed")
+
+
+class MessagesNotSentError(BaseBotteHttpClientException):
+    def __init__(self, texts: list[str]):
+        self.texts = texts
+        super().__init__(f"{len(texts)} messages not sent by Botte BE")
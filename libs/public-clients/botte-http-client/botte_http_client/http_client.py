@@ -17,53 +17,131 @@ client = botte_http_client.BotteHttpClient()
 response = client.send_message("Hello world!")
 assert response.data["text"] == "Hello world!"
 ```
+
+Error responses raise the exceptions of this package, with the original
+ `requests.HTTPError` as `__cause__`: `AuthError` (403), `Error404` and
+ `HttpStatusError` (any other 4xx or 5xx); all subclasses of
+ `BaseBotteHttpClientException`.
+
+The client owns a keep-alive HTTP session, so use a single client instance (also
+ across threads) for many messages: only the first request pays for the TCP and TLS
+ handshakes. Retries with backoff for 429 and 5xx responses and connection errors
+ are opt-in (read errors and timeouts are never retried, see `BotteHttpClient`):
+```py
+client = botte_http_client.BotteHttpClient(max_retries=3)
+```
 """
 
 from functools import cached_property
 from typing import Any
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 __all__ = [
     "BotteHttpClient",
     "SendMessageResponse",
+    "SendMessagesResponse",
     "SendHealthResponse",
     "SendUnhealthResponse",
     "SendVersionResponse",
     "BaseBotteHttpClientException",
     "AuthError",
     "Error404",
+    "HttpStatusError",
     "NotError500",
 ]
 
 # Note: these might change in case of Botte Backend destroy and re-deploy.
 BOTTE_BE_BASE_URL = "https://0uneqyoes2.execute-api.eu-south-1.amazonaws.com"
 
+# Max number of keep-alive connections in the pool. It should be at least the max
+#  number of threads sending concurrently with the same client, otherwise the extra
+#  connections are opened and then discarded.
+POOL_MAXSIZE = 10
+# Backoff between retries: {backoff factor} * (2 ** {num of previous retries}) secs.
+RETRY_BACKOFF_FACTOR = 0.5
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
 
 class BotteHttpClient:
-    def __init__(self, base_url: str = BOTTE_BE_BASE_URL):
+    def __init__(
+        self,
+        base_url: str = BOTTE_BE_BASE_URL,
+        pool_maxsize: int = POOL_MAXSIZE,
+        max_retries: int = 0,
+        retry_backoff_factor: float = RETRY_BACKOFF_FACTOR,
+    ):
         """
         Args:
             base_url (str): base url of the Botte Backend Lambda, optional.
+            pool_maxsize (int): max number of keep-alive connections in the pool.
+            max_retries (int): max number of retries for 429 and 5xx responses and
+             connection errors (the request was not sent), default: 0 (no retries).
+             Read errors and read timeouts (the request was sent, but there is no
+             response) are never retried, as the message might have been sent.
+             Mind that a message might still be sent twice if it is retried after a
+             5xx response generated after the message was actually sent.
+            retry_backoff_factor (float): see `RETRY_BACKOFF_FACTOR`. Mind that the
+             `Retry-After` header in 429 responses is honoured.
+
+        The session is safe to share across threads: it is not mutated after this
+         init, and the underlying connection pool is thread-safe.
         """
         self.base_url = base_url
 
+        retry = Retry(
+            total=max_retries,
+            connect=max_retries,
+            # No retries after the request was sent, as POST is not idempotent: so
+            #  no duplicate messages after a read error or timeout.
+            read=0,
+            other=0,
+            status=max_retries,
+            backoff_factor=retry_backoff_factor,
+            status_forcelist=RETRY_STATUS_CODES,
+            # Also POST (not idempotent, so not retried by default).
+            allowed_methods=None,
+            respect_retry_after_header=True,
+            # Return the last response, so it is handled by `raise_for_status()`.
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=pool_maxsize, max_retries=retry
+        )
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def close(self) -> None:
+        """
+        Close the keep-alive connections.
+        """
+        self.session.close()
+
+    def __enter__(self) -> "BotteHttpClient":
+        return self
+
+    def __exit__(self, *args, **kwargs) -> None:
+        self.close()
+
     def get_health(self):
         url = f"{self.base_url}/health"
-        response = requests.get(url)
+        response = self.session.get(url)
 
         try:
             response.raise_for_status()
         except requests.HTTPError as exc:
             if response.status_code == 404:
                 raise Error404(f"The url returned 404: {url}") from exc
-            raise
+            raise HttpStatusError(response.status_code, url) from exc
 
         return SendHealthResponse(response)
 
     def get_unhealth(self):
         url = f"{self.base_url}/unhealth"
-        response = requests.get(url)
+        response = self.session.get(url)
 
         try:
             response.raise_for_status()
@@ -75,14 +153,14 @@ class BotteHttpClient:
 
     def get_version(self):
         url = f"{self.base_url}/version"
-        response = requests.get(url)
+        response = self.session.get(url)
 
         try:
             response.raise_for_status()
         except requests.HTTPError as exc:
             if response.status_code == 404:
                 raise Error404(f"The url returned 404: {url}") from exc
-            raise
+            raise HttpStatusError(response.status_code, url) from exc
 
         return SendVersionResponse(response)
 
@@ -126,7 +204,7 @@ class BotteHttpClient:
             text=text,
             sender_app=sender_app,  # Optional.
         )
-        response = requests.post(url, headers=headers, json=data)
+        response = self.session.post(url, headers=headers, json=data)
 
         try:
             response.raise_for_status()
@@ -135,10 +213,60 @@ class BotteHttpClient:
                 raise AuthError("The Botte BE Auth token is invalid") from exc
             elif response.status_code == 404:
                 raise Error404(f"The url returned 404: {url}") from exc
-            raise
+            raise HttpStatusError(response.status_code, url) from exc
 
         return SendMessageResponse(response)
 
+    def send_messages(
+        self,
+        texts: list[str],
+        botte_be_api_auth_token: str,
+        sender_app: str = "BOTTE_HTTP_CLIENT",
+        do_send_in_order: bool = True,
+    ):
+        """
+        Send many messages with a single HTTP request.
+        Botte BE sends them via a single Telegram session and returns the result of
+         each message, so a failed message does not make the whole request fail.
+
+        Args:
+            texts (list[str]): the texts of the messages to send (max 20).
+            botte_be_api_auth_token (str): HTTP auth token for Botte HTTP interface.
+            sender_app (str): just an identifier, default: "BOTTE_HTTP_CLIENT".
+            do_send_in_order (bool): True to have Botte send the messages sequentially,
+             in the same order as `texts`; False to send them in parallel.
+
+        Curl example:
+            $ curl -X POST https://5t325uqwq7.execute-api.eu-south-1.amazonaws.com/messages \
+               -H 'Authorization: XXX' \
+               -d '{"messages": [{"text": "Hello 1"}, {"text": "Hello 2"}], "do_send_in_order": true}'
+            {
+              "results": [
+                {"status_code": 200, "message": {"message_id": 9, ...}},
+                {"status_code": 400, "error": "..."}
+              ]
+            }
+        """
+        url = f"{self.base_url}/messages"
+        headers = {"authorization": botte_be_api_auth_token}
+        data = dict(
+            messages=[{"text": text} for text in texts],
+            sender_app=sender_app,  # Optional.
+            do_send_in_order=do_send_in_order,
+        )
+        response = self.session.post(url, headers=headers, json=data)
+
+        try:
+            response.raise_for_status()
+        except requests.HTTPError as exc:
+            if response.status_code == 403:
+                raise AuthError("The Botte BE Auth token is invalid") from exc
+            elif response.status_code == 404:
+                raise Error404(f"The url returned 404: {url}") from exc
+            raise HttpStatusError(response.status_code, url) from exc
+
+        return SendMessagesResponse(response)
+
     # Note: I commented out this code, because if the consumer has access to
     #  Param Store, then it means that has access to AWS infra, so it should
     #  use Botte Lambda Client instead.
@@ -162,7 +290,8 @@ class BotteHttpClient:
 
 class BaseJsonResponse:
     def __init__(self, raw_response: requests.Response):
-        # `raw_response` is the raw HTTP response received by `requests` lib.
+        # `raw_response` is the raw HTTP response received by `requests` lib (or by
+        #  `httpx` lib, in `AsyncBotteHttpClient`).
         self.raw_response = raw_response
 
     @cached_property
@@ -198,6 +327,24 @@ class SendMessageResponse(BaseJsonResponse):
     data: dict[str, Any]
 
 
+class SendMessagesResponse(BaseJsonResponse):
+    """
+    The results are in the same order as the texts sent.
+
+    Example:
+        {
+          "results": [
+            {"status_code": 200, "message": {"message_id": 9, "text": "Hello 1", ...}},
+            {"status_code": 400, "error": "Bad Request: message text is empty"}
+          ]
+        }
+    """
+
+    # IMP: do NOT assign values to INSTANCE attrs here at class-level, but only type
+    #  annotations. If you assign values they become CLASS attrs.
+    data: dict[str, list[dict[str, Any]]]
+
+
 class SendHealthResponse(BaseJsonResponse):
     # IMP: do NOT assign values to INSTANCE attrs here at class-level, but only type
     #  annotations. If you assign values they become CLASS attrs.
@@ -228,6 +375,16 @@ class Error404(BaseBotteHttpClientException):
         super().__init__(f"404 error for: {url}")
 
 
+class HttpStatusError(BaseBotteHttpClientException):
+    def __init__(self, status_code: int, url: str):
+        # An error response (4xx or 5xx) with no specific exception. The original
+        #  exception (`requests.HTTPError`, or `httpx.HTTPStatusError` in
+        #  `AsyncBotteHttpClient`) is the `__cause__`.
+        self.status_code = status_code
+        self.url = url
+        super().__init__(f"{status_code} error for: {url}")
+
+
 class NotError500(BaseBotteHttpClientException):
     def __init__(self, status_code: int):
         self.status_code = status_code
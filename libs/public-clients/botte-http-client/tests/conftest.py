@@ -1,6 +1,9 @@
 import json
 import os
+import threading
+import time
 from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 import pytest
 from _pytest.fixtures import SubRequest
@@ -251,3 +254,141 @@ def monkeysession(request):
 #         monkeypatch.setenv("AWS_SECURITY_TOKEN", "pytesting")
 #         monkeypatch.setenv("AWS_SESSION_TOKEN", "pytesting")
 #         monkeypatch.setenv("AWS_DEFAULT_REGION", "eu-south-1")
+
+
+class FakeBotteServer:
+    """
+    A local stand-in for Botte BE HTTP interface, to be used via the fixture
+     `fake_botte_server`.
+
+    It counts the TCP connections it accepted, so tests can check that connections
+     are re-used, and it records all the requests it received.
+    """
+
+    def __init__(self, delay: float = 0):
+        # Seconds to wait before responding to each request.
+        self.delay = delay
+        # Respond with these status codes to the next requests, then 200. None to
+        #  drop the connection with no response, like a read error.
+        self.status_codes: list[int | None] = []
+        self.n_connections = 0
+        self.requests: list[dict] = []
+        # Max num of requests being handled at the same time.
+        self.max_concurrent_requests = 0
+        self._n_concurrent_requests = 0
+        self._lock = threading.Lock()
+        self._message_id = 0
+
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # HTTP/1.1 to support keep-alive connections.
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                # One handler instance per TCP connection.
+                super().setup()
+                with fake._lock:
+                    fake.n_connections += 1
+
+            def do_POST(self):  # noqa: N802
+                status, body = fake._handle(self)
+                if status is None:
+                    self.close_connection = True
+                    return
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST  # noqa: N815
+
+            def log_message(self, *args, **kwargs):
+                pass
+
+        self._server = ThreadingHTTPServer(("localhost", 0), Handler)
+        self.port = self._server.server_address[1]
+        self.base_url = f"http://localhost:{self.port}"
+
+    def _handle(
+        self, handler: BaseHTTPRequestHandler
+    ) -> tuple[int | None, dict | str | None]:
+        length = int(handler.headers.get("Content-Length") or 0)
+        body = json.loads(handler.rfile.read(length)) if length else None
+        with self._lock:
+            self.requests.append(
+                dict(
+                    method=handler.command,
+                    path=handler.path,
+                    headers=dict(handler.headers),
+                    body=body,
+                )
+            )
+            status = self.status_codes.pop(0) if self.status_codes else 200
+            self._n_concurrent_requests += 1
+            self.max_concurrent_requests = max(
+                self.max_concurrent_requests, self._n_concurrent_requests
+            )
+        try:
+            if self.delay:
+                time.sleep(self.delay)
+        finally:
+            with self._lock:
+                self._n_concurrent_requests -= 1
+
+        if status is None:
+            return None, None
+        if status == 403:
+            return 403, {"message": "Forbidden"}
+        if status == 404:
+            return 404, {"message": "Not Found"}
+        if status != 200:
+            return status, {"message": "Internal Server Error"}
+        if handler.path == "/health":
+            return 200, "2025-10-31T17:13:26.330895+00:00"
+        if handler.path == "/version":
+            return 200, {"appName": "Botte BE", "app": "1.0.0"}
+        if handler.path == "/message":
+            return 200, self._make_message(body["text"])
+        if handler.path == "/messages":
+            messages = body["messages"] if isinstance(body, dict) else body
+            return 200, {
+                "results": [
+                    {"status_code": 200, "message": self._make_message(x["text"])}
+                    for x in messages
+                ]
+            }
+        return 404, {"message": "Not Found"}
+
+    def _make_message(self, text: str) -> dict:
+        with self._lock:
+            self._message_id += 1
+            message_id = self._message_id
+        return {
+            "message_id": message_id,
+            "from": {"id": 1, "is_bot": True, "first_name": "Botte"},
+            "chat": {"id": 2, "type": "private"},
+            "date": int(time.time()),
+            "text": text,
+        }
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def fake_botte_server() -> Iterator[FakeBotteServer]:
+    """
+    A local stand-in for Botte BE HTTP interface. Mark the test with `novcr`, as
+     there are no HTTP interactions to record.
+    """
+    server = FakeBotteServer()
+    server.start()
+    yield server
+    server.stop()
@@ -0,0 +1,158 @@
+import gc
+import threading
+import time
+import weakref
+
+import pytest
+
+from botte_http_client import (
+    BackgroundBotteHttpClient,
+    BotteHttpClient,
+    ClientClosedError,
+    HttpStatusError,
+    MessagesNotSentError,
+)
+
+
+def _get_texts(fake_botte_server) -> list[list[str]]:
+    # The texts sent in each request.
+    texts = []
+    for request in fake_botte_server.requests:
+        if request["path"] == "/messages":
+            texts.append([x["text"] for x in request["body"]["messages"]])
+        else:
+            texts.append([request["body"]["text"]])
+    return texts
+
+
+@pytest.mark.novcr
+class TestBackgroundBotteHttpClient:
+    def _make_client(self, fake_botte_server, **kwargs) -> BackgroundBotteHttpClient:
+        return BackgroundBotteHttpClient(
+            botte_be_api_auth_token="XXX",
+            client=BotteHttpClient(base_url=fake_botte_server.base_url),
+            **kwargs,
+        )
+
+    def test_send_message_returns_immediately(self, fake_botte_server):
+        fake_botte_server.delay = 0.5
+        client = self._make_client(fake_botte_server)
+        start = time.perf_counter()
+        client.send_message("Hello 1")
+        assert time.perf_counter() - start < 0.1
+        client.close()
+        assert _get_texts(fake_botte_server) == [["Hello 1"]]
+
+    def test_coalescing(self, fake_botte_server):
+        fake_botte_server.delay = 0.2
+        with self._make_client(fake_botte_server) as client:
+            client.send_message("Hello 0")
+            time.sleep(0.1)  # "Hello 0" is in flight.
+            for i in range(1, 6):
+                client.send_message(f"Hello {i}")
+        # The messages queued while the first request was in flight are sent with a
+        #  single request to the batch endpoint.
+        assert _get_texts(fake_botte_server) == [
+            ["Hello 0"],
+            ["Hello 1", "Hello 2", "Hello 3", "Hello 4", "Hello 5"],
+        ]
+        assert fake_botte_server.n_connections == 1
+
+    def test_drop_oldest(self, fake_botte_server):
+        fake_botte_server.delay = 0.2
+        with self._make_client(fake_botte_server, max_queue_size=3) as client:
+            client.send_message("Hello 0")
+            time.sleep(0.1)  # "Hello 0" is in flight.
+            for i in range(1, 6):
+                client.send_message(f"Hello {i}")
+            assert client.n_dropped == 2
+        assert _get_texts(fake_botte_server) == [
+            ["Hello 0"],
+            ["Hello 3", "Hello 4", "Hello 5"],
+        ]
+
+    def test_no_batch_endpoint(self, fake_botte_server):
+        fake_botte_server.delay = 0.2
+        fake_botte_server.status_codes = [200, 404]
+        with self._make_client(fake_botte_server) as client:
+            client.send_message("Hello 0")
+            time.sleep(0.1)  # "Hello 0" is in flight.
+            for i in range(1, 3):
+                client.send_message(f"Hello {i}")
+        assert _get_texts(fake_botte_server) == [
+            ["Hello 0"],
+            ["Hello 1", "Hello 2"],  # 404.
+            ["Hello 1"],
+            ["Hello 2"],
+        ]
+
+    def test_on_error(self, fake_botte_server):
+        fake_botte_server.status_codes = [403]
+        errors = []
+        with self._make_client(
+            fake_botte_server,
+            on_error=lambda exc, texts: errors.append((exc, texts)),
+        ) as client:
+            client.send_message("Hello 1")
+        assert len(errors) == 1
+        assert errors[0][1] == ["Hello 1"]
+
+    def test_error_raised_by_flush(self, fake_botte_server):
+        fake_botte_server.status_codes = [503]
+        client = self._make_client(fake_botte_server)
+        client.send_message("Hello 1")
+        with pytest.raises(Exception):  # noqa: B017
+            client.flush()
+        # The error is raised only once.
+        client.close()
+
+    def test_errors_bounded(self, fake_botte_server):
+        fake_botte_server.status_codes = [503, 500, 502]
+        client = self._make_client(fake_botte_server, max_batch_size=1)
+        for i in range(3):
+            client.send_message(f"Hello {i}")
+        # Only the first error is kept and raised, the others are counted.
+        with pytest.raises(HttpStatusError) as exc_info:
+            client.flush()
+        assert exc_info.value.status_code == 503
+        assert client.n_errors == 3
+        client.close()
+
+    def test_not_kept_alive_by_atexit(self, fake_botte_server):
+        client = self._make_client(fake_botte_server)
+        client_ref = weakref.ref(client)
+        del client
+        gc.collect()
+        assert client_ref() is None
+
+    def test_failed_messages_in_batch(self):
+        class FakeBotteHttpClient(BotteHttpClient):
+            def send_messages(self, texts, **kwargs):
+                class Response:
+                    data = {
+                        "results": [
+                            {"status_code": 200 if i % 2 else 400}
+                            for i in range(len(texts))
+                        ]
+                    }
+
+                return Response()
+
+        client = BackgroundBotteHttpClient(
+            botte_be_api_auth_token="XXX", client=FakeBotteHttpClient()
+        )
+        with pytest.raises(MessagesNotSentError) as exc_info:
+            client._send(["Hello 0", "Hello 1", "Hello 2"])
+        assert exc_info.value.texts == ["Hello 0", "Hello 2"]
+        client.close()
+
+    def test_flush_at_exit(self, fake_botte_server):
+        fake_botte_server.delay = 0.2
+        client = self._make_client(fake_botte_server)
+        client.send_message("Hello 1")
+        # What atexit does.
+        client._close_at_exit()
+        assert _get_texts(fake_botte_server) == [["Hello 1"]]
+        assert not [x for x in threading.enumerate() if x is client._thread]
+        with pytest.raises(ClientClosedError):
+            client.send_message("Hello 2")
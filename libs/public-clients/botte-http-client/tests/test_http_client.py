@@ -1,9 +1,17 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
+import requests
 
 from botte_http_client import (
+    AsyncBotteHttpClient,
     AuthError,
     BotteHttpClient,
     Error404,
+    HttpStatusError,
+    SendMessageResponse,
 )
 
 
@@ -63,3 +71,189 @@ class TestSendMessage:
         with pytest.raises(Error404):
             # Note: use the right token to record the mock.
             client.send_message(self.text, botte_be_api_auth_token="XXX")
+
+
+@pytest.mark.novcr
+class TestSendMessages:
+    def test_happy_flow(self, fake_botte_server):
+        client = BotteHttpClient(base_url=fake_botte_server.base_url)
+        response = client.send_messages(
+            ["Hello 1", "Hello 2"], botte_be_api_auth_token="XXX"
+        )
+        assert [x["message"]["text"] for x in response.data["results"]] == [
+            "Hello 1",
+            "Hello 2",
+        ]
+        assert len(fake_botte_server.requests) == 1
+        request = fake_botte_server.requests[0]
+        assert request["path"] == "/messages"
+        assert request["body"]["messages"] == [{"text": "Hello 1"}, {"text": "Hello 2"}]
+
+    def test_auth_error(self, fake_botte_server):
+        fake_botte_server.status_codes = [403]
+        client = BotteHttpClient(base_url=fake_botte_server.base_url)
+        with pytest.raises(AuthError):
+            client.send_messages(["Hello"], botte_be_api_auth_token="XXX")
+
+
+@pytest.mark.novcr
+class TestSession:
+    def test_connection_reused(self, fake_botte_server):
+        with BotteHttpClient(base_url=fake_botte_server.base_url) as client:
+            for i in range(5):
+                response = client.send_message(
+                    f"Hello {i}", botte_be_api_auth_token="XXX"
+                )
+                assert response.data["text"] == f"Hello {i}"
+            client.get_health()
+        assert len(fake_botte_server.requests) == 6
+        assert fake_botte_server.n_connections == 1
+
+    def test_shared_across_threads(self, fake_botte_server):
+        client = BotteHttpClient(base_url=fake_botte_server.base_url)
+        texts = [f"Hello {i}" for i in range(20)]
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            responses = list(
+                executor.map(
+                    lambda text: client.send_message(
+                        text, botte_be_api_auth_token="XXX"
+                    ),
+                    texts,
+                )
+            )
+        assert [x.data["text"] for x in responses] == texts
+        # At most one connection per thread.
+        assert fake_botte_server.n_connections <= 5
+
+    def test_retry(self, fake_botte_server):
+        fake_botte_server.status_codes = [503, 429]
+        client = BotteHttpClient(
+            base_url=fake_botte_server.base_url,
+            max_retries=2,
+            retry_backoff_factor=0,
+        )
+        response = client.send_message("Hello", botte_be_api_auth_token="XXX")
+        assert response.data["text"] == "Hello"
+        assert len(fake_botte_server.requests) == 3
+
+    def test_retry_exhausted(self, fake_botte_server):
+        fake_botte_server.status_codes = [503, 503]
+        client = BotteHttpClient(
+            base_url=fake_botte_server.base_url,
+            max_retries=1,
+            retry_backoff_factor=0,
+        )
+        with pytest.raises(HttpStatusError) as exc_info:
+            client.send_message("Hello", botte_be_api_auth_token="XXX")
+        assert exc_info.value.status_code == 503
+        assert len(fake_botte_server.requests) == 2
+
+    def test_no_retry_after_read_error(self, fake_botte_server):
+        # The connection is dropped after the request is received: the message might
+        #  have been sent, so it is not retried.
+        fake_botte_server.status_codes = [None]
+        client = BotteHttpClient(
+            base_url=fake_botte_server.base_url,
+            max_retries=2,
+            retry_backoff_factor=0,
+        )
+        with pytest.raises(requests.ConnectionError):
+            client.send_message("Hello", botte_be_api_auth_token="XXX")
+        assert len(fake_botte_server.requests) == 1
+
+    def test_no_retry_by_default(self, fake_botte_server):
+        fake_botte_server.status_codes = [503]
+        client = BotteHttpClient(base_url=fake_botte_server.base_url)
+        with pytest.raises(HttpStatusError):
+            client.send_message("Hello", botte_be_api_auth_token="XXX")
+        assert len(fake_botte_server.requests) == 1
+
+    def test_error_500(self, fake_botte_server):
+        fake_botte_server.status_codes = [500]
+        client = BotteHttpClient(base_url=fake_botte_server.base_url)
+        with pytest.raises(HttpStatusError) as exc_info:
+            client.send_message("Hello", botte_be_api_auth_token="XXX")
+        assert exc_info.value.status_code == 500
+        assert isinstance(exc_info.value.__cause__, requests.HTTPError)
+
+
+@pytest.mark.novcr
+class TestAsyncClient:
+    def test_send_message(self, fake_botte_server):
+        async def main():
+            async with AsyncBotteHttpClient(
+                base_url=fake_botte_server.base_url
+            ) as client:
+                return await client.send_message("Hello", botte_be_api_auth_token="XXX")
+
+        response = asyncio.run(main())
+        assert isinstance(response, SendMessageResponse)
+        assert response.data["text"] == "Hello"
+        assert fake_botte_server.requests[0]["headers"]["authorization"] == "XXX"
+
+    def test_introspection(self, fake_botte_server):
+        async def main():
+            async with AsyncBotteHttpClient(
+                base_url=fake_botte_server.base_url
+            ) as client:
+                return await client.get_health(), await client.get_version()
+
+        health, version = asyncio.run(main())
+        assert health.data == "2025-10-31T17:13:26.330895+00:00"
+        assert version.data["appName"] == "Botte BE"
+        # The connection is re-used.
+        assert fake_botte_server.n_connections == 1
+
+    def test_errors(self, fake_botte_server):
+        fake_botte_server.status_codes = [403, 404]
+
+        async def main():
+            async with AsyncBotteHttpClient(
+                base_url=fake_botte_server.base_url
+            ) as client:
+                with pytest.raises(AuthError):
+                    await client.send_message("Hello", botte_be_api_auth_token="XXX")
+                with pytest.raises(Error404):
+                    await client.get_version()
+
+        asyncio.run(main())
+
+    def test_error_500(self, fake_botte_server):
+        fake_botte_server.status_codes = [500, 500]
+
+        async def main():
+            async with AsyncBotteHttpClient(
+                base_url=fake_botte_server.base_url
+            ) as client:
+                # The same exception as `BotteHttpClient`, not `httpx.HTTPStatusError`.
+                with pytest.raises(HttpStatusError) as exc_info:
+                    await client.send_message("Hello", botte_be_api_auth_token="XXX")
+                assert exc_info.value.status_code == 500
+                with pytest.raises(HttpStatusError):
+                    await client.get_health()
+
+        asyncio.run(main())
+
+    def test_send_many(self, fake_botte_server):
+        fake_botte_server.delay = 0.2
+        fake_botte_server.status_codes = [200, 403]
+        texts = [f"Hello {i}" for i in range(20)]
+
+        async def main():
+            async with AsyncBotteHttpClient(
+                base_url=fake_botte_server.base_url, max_concurrency=5
+            ) as client:
+                return await client.send_many(texts, botte_be_api_auth_token="XXX")
+
+        start = time.perf_counter()
+        responses = asyncio.run(main())
+        elapsed = time.perf_counter() - start
+        assert len(responses) == 20
+        assert sum(isinstance(x, AuthError) for x in responses) == 1
+        # Responses are in the same order as the texts.
+        for text, response in zip(texts, responses, strict=True):
+            if isinstance(response, SendMessageResponse):
+                assert response.data["text"] == text
+        # Concurrently, but capped: 20 requests, 5 at a time.
+        assert fake_botte_server.max_concurrent_requests == 5
+        assert elapsed < 0.2 * 20 / 2
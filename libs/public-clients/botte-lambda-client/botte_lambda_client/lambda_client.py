@@ -39,17 +39,39 @@ client = botte_lambda_client.BotteLambdaClient()
 response, status_code = client.send_message("Hello world", sender_app="BOTTE_LAMBDA_CLIENT", do_invoke_sync=True)
 assert response["text"] == "Hello world"
 assert status_code == 200
+
+# Many messages, with a single invocation.
+response, status_code = client.send_messages(["Hello 1", "Hello 2"])
+assert [x["status_code"] for x in response["results"]] == [200, 200]
+
+# Many messages, with concurrent invocations.
+results = client.send_many(["Hello 1", "Hello 2"], sender_app="BOTTE_LAMBDA_CLIENT")
+for result in results:
+    if isinstance(result, Exception):
+        ...  # This message was not sent (fi. throttled invocation): retry it.
+    else:
+        response, status_code = result
 ```
+
+The underlying AWS Lambda client (so the Boto3 client, with its credentials and HTTP
+ connection pool) is created once per `BotteLambdaClient` instance, at the first
+ usage, and re-used by all the following calls. So, to send many messages, re-use
+ the same `BotteLambdaClient` instance. In a Lambda consumer, create it outside the
+ handler, so it is re-used across warm invocations; and use `do_warmup=True` to
+ create it during the static init.
 """
 
 import contextlib
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 import aws_lambda_client
 
 __all__ = [
     "BotteLambdaClient",
     "BotteLambdaNotFound",
+    "BotteLambdaFunctionError",
     "BaseBotteLambdaClientException",
 ]
 
@@ -58,8 +80,40 @@ LAMBDA_NAME = "477353422995:function:botte-be-prod-message"
 # LAMBDA_NAME = "arn:aws:lambda:eu-south-1:477353422995:function:botte-be-prod-message"
 # LAMBDA_NAME = "botte-be-prod-message"
 
+# Max number of concurrent invocations in `send_many()`. Mind that it should not be
+#  greater than the size of the HTTP connection pool in the Boto3 client (default: 10),
+#  otherwise the extra connections are opened and then discarded.
+MAX_CONCURRENCY = 10
+
 
 class BotteLambdaClient:
+    def __init__(self, do_warmup: bool = False):
+        """
+        Args:
+            do_warmup: True to create the underlying AWS Lambda client now, instead of
+             at the first `send_message()`. See `warmup()`.
+        """
+        self._client: aws_lambda_client.AwsLambdaClient | None = None
+        self._lock = threading.Lock()
+        if do_warmup:
+            self.warmup()
+
+    def warmup(self) -> None:
+        """
+        Create the underlying AWS Lambda client (Boto3 client, credentials lookup and
+         endpoint resolution), so the first `send_message()` does not pay for it.
+        Useful in a Lambda consumer static init.
+        """
+        self._get_client()
+
+    def _get_client(self) -> aws_lambda_client.AwsLambdaClient:
+        if self._client is None:
+            # Lock, so concurrent threads do not create multiple clients.
+            with self._lock:
+                if self._client is None:
+                    self._client = aws_lambda_client.AwsLambdaClient()
+        return self._client
+
     def send_message(
         self,
         text: str,
@@ -71,10 +125,51 @@ class BotteLambdaClient:
             text (str): the text of the message to send.
             sender_app (str): just an identifier, default: "BOTTE_LAMBDA_CLIENT".
             do_invoke_sync: False to invoke the Lambda asynchronously.
+
+        Raise BotteLambdaFunctionError if Botte Lambda failed with an unhandled error
+         (fi. a timeout): mind that the message might have been sent anyway.
         """
 
-        client = aws_lambda_client.AwsLambdaClient()
         payload = {"text": text, "sender_app": sender_app}
+        return self._invoke(payload, do_invoke_sync=do_invoke_sync)
+
+    def send_messages(
+        self,
+        texts: list[str],
+        sender_app: str = "BOTTE_LAMBDA_CLIENT",
+        do_send_in_order: bool = True,
+        do_invoke_sync: bool = True,
+    ):
+        """
+        Send many messages with a single invocation of Botte Lambda.
+        Unlike `send_many()`, it costs a single invocation, and Botte BE sends the
+         messages via a single Telegram session.
+
+        Args:
+            texts: the texts of the messages to send (max 20).
+            sender_app: see `send_message()`.
+            do_send_in_order: True to have Botte send the messages sequentially, in the
+             same order as `texts`; False to send them in parallel.
+            do_invoke_sync: see `send_message()`.
+
+        Returns (body, status_code), where body has the result of each message, in
+         the same order as `texts`, like:
+            {
+                "results": [
+                    {"status_code": 200, "message": {...}},  # The Telegram message.
+                    {"status_code": 400, "error": "..."},
+                ]
+            }
+        """
+        payload = {
+            "messages": [{"text": text} for text in texts],
+            "sender_app": sender_app,
+            "do_send_in_order": do_send_in_order,
+        }
+        return self._invoke(payload, do_invoke_sync=do_invoke_sync)
+
+    def _invoke(self, payload: dict, do_invoke_sync: bool):
+        client = self._get_client()
         try:
             response = client.invoke(
                 LAMBDA_NAME,
@@ -90,6 +185,15 @@ class BotteLambdaClient:
         payload = response.get("Payload")
         payload = payload.read()
         payload = payload.decode()
+
+        # An unhandled error in Botte Lambda (fi. a crash or a timeout) still has
+        #  StatusCode 200, and the error in the payload, like:
+        #  {"errorMessage": "...", "errorType": "..."}
+        if response.get("FunctionError"):
+            error_message = payload
+            with contextlib.suppress(Exception):
+                error_message = json.loads(payload).get("errorMessage", payload)
+            raise BotteLambdaFunctionError(response["FunctionError"], error_message)
         # body is none for async invocations.
         body = None
         if payload:
@@ -103,6 +207,49 @@ class BotteLambdaClient:
         # body is none for async invocations.
         return body, status_code
 
+    def send_many(
+        self,
+        texts: list[str],
+        sender_app: str = "BOTTE_LAMBDA_CLIENT",
+        do_invoke_sync: bool = True,
+        max_concurrency: int = MAX_CONCURRENCY,
+    ) -> list[tuple[dict | str | None, int | None] | Exception]:
+        """
+        Send many messages, invoking Botte Lambda concurrently with a bounded pool of
+         threads, all sharing the same AWS Lambda client.
+        So it takes about the time of the slowest invocation, instead of the sum.
+        Mind that the messages might be delivered in any order.
+
+        Args:
+            texts: the texts of the messages to send.
+            sender_app: see `send_message()`.
+            do_invoke_sync: see `send_message()`.
+            max_concurrency: max number of concurrent invocations.
+
+        Returns a result per text, in the same order as `texts`: (body, status_code),
+         like `send_message()`, or the exception raised by the invocation (fi. a
+         throttling `ClientError`). So one failed invocation does not hide the result
+         of the others, and only the failed texts need to be sent again.
+        """
+        if not texts:
+            return []
+        # Create the client now, not concurrently in the threads.
+        self._get_client()
+        with ThreadPoolExecutor(
+            max_workers=min(max_concurrency, len(texts))
+        ) as executor:
+            futures = [
+                executor.submit(
+                    self.send_message,
+                    text,
+                    sender_app=sender_app,
+                    do_invoke_sync=do_invoke_sync,
+                )
+                for text in texts
+            ]
+        # The executor is shut down, so all the invocations are done.
+        return [future.exception() or future.result() for future in futures]
+
 
 class BaseBotteLambdaClientException(Exception): ...
 
@@ -111,3 +258,13 @@ class BotteLambdaNotFound(BaseBotteLambdaClientException):
     def __init__(self, lambda_name):
         self.lambda_name = lambda_name
         super().__init__(f"Botte BE Lambda not found with name: {lambda_name}")
+
+
+class BotteLambdaFunctionError(BaseBotteLambdaClientException):
+    def __init__(self, function_error: str, error_message: str):
+        # Mind that the message might have been sent before the error.
+        self.function_error = function_error
+        self.error_message = error_message
+        super().__init__(
+            f"Botte BE Lambda failed with {function_error} error: {error_message}"
+        )
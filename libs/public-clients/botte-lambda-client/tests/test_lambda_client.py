@@ -1,5 +1,10 @@
+import io
+import json
+import time
 from unittest import mock
 
+import boto3
+import botocore.exceptions
 import pytest
 
 import botte_lambda_client
@@ -29,3 +34,167 @@ class TestBotteLambdaClient:
             client = botte_lambda_client.BotteLambdaClient()
             with pytest.raises(botte_lambda_client.BotteLambdaNotFound):
                 client.send_message(text)
+
+
+class FakeAwsLambdaClient:
+    """
+    Same cost of creation as the real `AwsLambdaClient` (a Boto3 client), but
+     `invoke()` returns a response like Botte BE Lambda with no network call.
+    """
+
+    n_instances = 0
+    delay = 0.0
+
+    def __init__(self):
+        FakeAwsLambdaClient.n_instances += 1
+        self.payloads = []
+        # Texts for which the invocation raises, like a throttled invocation.
+        self.error_texts: set[str] = set()
+        # Texts for which Botte Lambda fails with an unhandled error.
+        self.function_error_texts: set[str] = set()
+        self.client = boto3.client("lambda", region_name="eu-south-1")
+
+    def invoke(self, lambda_name: str, payload: dict, do_invoke_sync: bool = True):
+        time.sleep(self.delay)
+        if payload.get("text") in self.error_texts:
+            raise botocore.exceptions.ClientError(
+                {"Error": {"Code": "TooManyRequestsException"}}, "Invoke"
+            )
+        self.payloads.append(payload)
+        if payload.get("text") in self.function_error_texts:
+            return {
+                "StatusCode": 200,
+                "FunctionError": "Unhandled",
+                "Payload": io.BytesIO(
+                    json.dumps(
+                        {"errorMessage": "Task timed out", "errorType": "Timeout"}
+                    ).encode()
+                ),
+            }
+        if "messages" in payload:
+            body = json.dumps(
+                {
+                    "results": [
+                        {"status_code": 200, "message": {"text": x["text"]}}
+                        for x in payload["messages"]
+                    ]
+                }
+            )
+        else:
+            body = json.dumps({"text": payload["text"]})
+        return {
+            "StatusCode": 200,
+            "Payload": io.BytesIO(
+                json.dumps({"statusCode": 200, "body": body}).encode()
+            ),
+        }
+
+
+@pytest.mark.novcr
+class TestClientReuse:
+    def setup_method(self):
+        FakeAwsLambdaClient.n_instances = 0
+        FakeAwsLambdaClient.delay = 0.0
+
+    def test_client_reused(self):
+        with mock.patch("aws_lambda_client.AwsLambdaClient", FakeAwsLambdaClient):
+            client = botte_lambda_client.BotteLambdaClient()
+            for i in range(3):
+                response, status_code = client.send_message(f"Hello {i}")
+                assert response["text"] == f"Hello {i}"
+                assert status_code == 200
+        assert FakeAwsLambdaClient.n_instances == 1
+
+    def test_warmup(self):
+        with mock.patch("aws_lambda_client.AwsLambdaClient", FakeAwsLambdaClient):
+            client = botte_lambda_client.BotteLambdaClient(do_warmup=True)
+            assert FakeAwsLambdaClient.n_instances == 1
+            client.send_message("Hello")
+        assert FakeAwsLambdaClient.n_instances == 1
+
+    def test_send_many(self):
+        FakeAwsLambdaClient.delay = 0.2
+        texts = [f"Hello {i}" for i in range(20)]
+        with mock.patch("aws_lambda_client.AwsLambdaClient", FakeAwsLambdaClient):
+            client = botte_lambda_client.BotteLambdaClient()
+            start = time.perf_counter()
+            results = client.send_many(texts, max_concurrency=20)
+            elapsed = time.perf_counter() - start
+        assert [response["text"] for response, _ in results] == texts
+        assert [status_code for _, status_code in results] == [200] * 20
+        # Concurrently: about the time of a single invocation.
+        assert elapsed < 0.2 * 3
+        assert FakeAwsLambdaClient.n_instances == 1
+
+    def test_send_messages(self):
+        texts = [f"Hello {i}" for i in range(3)]
+        with mock.patch("aws_lambda_client.AwsLambdaClient", FakeAwsLambdaClient):
+            client = botte_lambda_client.BotteLambdaClient()
+            response, status_code = client.send_messages(
+                texts, sender_app="BOTTE_LAMBDA_CLIENT_PYTESTS"
+            )
+        assert status_code == 200
+        assert [x["message"]["text"] for x in response["results"]] == texts
+        # A single invocation.
+        assert client._get_client().payloads == [
+            {
+                "messages": [{"text": text} for text in texts],
+                "sender_app": "BOTTE_LAMBDA_CLIENT_PYTESTS",
+                "do_send_in_order": True,
+            }
+        ]
+
+    def test_send_many_partial_failure(self):
+        texts = [f"Hello {i}" for i in range(5)]
+        with mock.patch("aws_lambda_client.AwsLambdaClient", FakeAwsLambdaClient):
+            client = botte_lambda_client.BotteLambdaClient()
+            client._get_client().error_texts = {"Hello 2"}
+            results = client.send_many(texts)
+        assert isinstance(results[2], botocore.exceptions.ClientError)
+        # The other invocations are not lost.
+        for i in (0, 1, 3, 4):
+            response, status_code = results[i]
+            assert response["text"] == texts[i]
+            assert status_code == 200
+
+    def test_function_error(self):
+        with mock.patch("aws_lambda_client.AwsLambdaClient", FakeAwsLambdaClient):
+            client = botte_lambda_client.BotteLambdaClient()
+            client._get_client().function_error_texts = {"Hello"}
+            with pytest.raises(
+                botte_lambda_client.BotteLambdaFunctionError
+            ) as exc_info:
+                client.send_message("Hello")
+        assert exc_info.value.function_error == "Unhandled"
+        assert exc_info.value.error_message == "Task timed out"
+
+    def test_send_many_empty(self):
+        assert botte_lambda_client.BotteLambdaClient().send_many([]) == []
+
+    @pytest.mark.slow
+    def test_benchmark(self):
+        """
+        Benchmark: 100 sequential sends with a new AWS Lambda client per send (which
+         was the previous implementation) and with a re-used client.
+        Mind that the invocation itself is faked, so it measures only the overhead of
+         the client (and not the TLS handshake, also saved by a re-used client).
+        Run it with:
+        $ pytest -s -m slow tests/test_lambda_client.py
+        """
+        with mock.patch("aws_lambda_client.AwsLambdaClient", FakeAwsLambdaClient):
+            start = time.perf_counter()
+            for i in range(100):
+                botte_lambda_client.BotteLambdaClient().send_message(f"Hello {i}")
+            elapsed_new_client = time.perf_counter() - start
+
+            client = botte_lambda_client.BotteLambdaClient()
+            start = time.perf_counter()
+            for i in range(100):
+                client.send_message(f"Hello {i}")
+            elapsed_reused_client = time.perf_counter() - start
+
+        print(
+            f"\nNew client per send: {elapsed_new_client * 10:.2f} ms per send"
+            f"\nRe-used client: {elapsed_reused_client * 10:.2f} ms per send"
+        )
+        assert elapsed_reused_client < elapsed_new_client
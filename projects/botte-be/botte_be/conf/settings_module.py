@@ -60,8 +60,68 @@ class _Settings(_BaseSettings):
     # Telegram token: read from env vars in prod, when running in AWS Lambda.
     TELEGRAM_TOKEN = settings_utils.get_string_from_env("TELEGRAM_TOKEN", "XXX")
 
+    # Telegram rate limits, enforced by the Telegram sender.
+    # See: https://core.telegram.org/bots/faq#my-bot-is-hitting-limits-how-do-i-avoid-this
+    TELEGRAM_GLOBAL_RATE_LIMIT = 30  # Max msgs per sec, for all chats.
+    TELEGRAM_CHAT_RATE_LIMIT = 1  # Max msgs per sec, in a single chat.
+    TELEGRAM_CHAT_RATE_LIMIT_BURST = 20  # Max burst of msgs in a single chat.
+    # Max secs to wait when Telegram responds 429 with `retry_after`; if Telegram asks
+    #  to wait longer, then the send fails.
+    TELEGRAM_MAX_RETRY_AFTER = 10
+    # Max num of retries for a single message after 429 responses.
+    TELEGRAM_MAX_429_RETRIES = 3
+
+    # Max length of a Telegram message: longer texts are split in many messages.
+    TELEGRAM_MAX_MESSAGE_LENGTH = 4096
+    # Texts longer than this are uploaded as a single text document, instead of
+    #  being split in many messages (which take a request each, and the rate limits).
+    TELEGRAM_DOCUMENT_MIN_LENGTH = 5 * TELEGRAM_MAX_MESSAGE_LENGTH
+
+    # Max num of messages in a single request with many messages. Mind that all the
+    #  messages go to the same chat, so it should be within the chat burst, otherwise
+    #  the rate limiter slows down the request (towards the API Gateway timeout).
+    MAX_MESSAGES_PER_REQUEST = TELEGRAM_CHAT_RATE_LIMIT_BURST
+
+    # The DynamoDB task queue (Botte DynamoDB interface), used by the HTTP endpoint
+    #  to enqueue messages when the caller opts in to the async mode.
+    DYNAMODB_TASK_TABLE_NAME = settings_utils.get_string_from_env(
+        "DYNAMODB_TASK_TABLE_NAME", "botte-be-task-prod"
+    )
+
+    # De-duplication of the tasks re-delivered by the DynamoDB stream (see
+    #  domain/task_deduplicator.py).
+    DO_DEDUP_TASKS = True
+    # Max num of task SKs in the in-container LRU.
+    TASK_DEDUP_LRU_SIZE = 10_000
+    # TTL of the "sent" marker items: longer than the DynamoDB stream retention (24h).
+    TASK_SENT_MARKER_TTL_SECONDS = 2 * 24 * 60 * 60
+
+    # Staleness policy for the tasks read from the DynamoDB stream (see
+    #  domain/stale_task_policy.py), so a backlog drains in a few Telegram calls.
+    # Drop the tasks past their ExpirationTs.
+    DO_DROP_EXPIRED_TASKS = True
+    # Merge the tasks older than this in a "N delayed messages" digest per PK; None
+    #  to disable.
+    STALE_TASK_AGE_SECONDS: int | None = 5 * 60
+
+    # Deadline-aware sends (see domain/send_deadline.py): a send is skipped when the
+    #  time left before the Lambda timeout is less than the p99 send latency.
+    # Num of recent sends in the rolling latency stats.
+    SEND_LATENCY_WINDOW_SIZE = 100
+    # Send latency assumed when there are no sends yet (cold start).
+    DEFAULT_SEND_LATENCY_SECONDS = 2.0
+    # Secs kept, after the last send, to build the response before the timeout.
+    SEND_DEADLINE_SAFETY_MARGIN_SECONDS = 1.0
+
 
 class _TestSettings:
+    # Disabled in tests, as the recorded HTTP interactions have no DynamoDB requests.
+    #  Enabled in the tests of the de-duplication.
+    DO_DEDUP_TASKS = False
+    # Disabled in tests, as the recorded DynamoDB events have old tasks.
+    DO_DROP_EXPIRED_TASKS = False
+    STALE_TASK_AGE_SECONDS = None
+
     # Telegram token: read from Param Store in test (when recording tests).
     # Mind that this is better than using a local file with the secret in plain-text.
     # Mind that it needs to be a @property for lazily evaluation, so vcr.py can catch
@@ -0,0 +1,33 @@
+"""
+Shared low-level Boto3 DynamoDB client, used to write to the DynamoDB task queue
+ (Botte DynamoDB interface).
+
+The client is created once and re-used across subsequent Lambda invocations (warm
+ starts), like the shared Telegram sender. Low-level, as the tasks are already in
+ the DynamoDB JSON format (`BotteMessageDynamodbTask.to_dynamodb_item()`).
+
+```py
+from botte_be.domain import dynamodb_client
+
+dynamodb_client.get_client().put_item(TableName=..., Item=task.to_dynamodb_item())
+```
+"""
+
+import boto3
+
+__all__ = [
+    "get_client",
+]
+
+# Global var so it is re-used across subsequent Lambda invocations (warm starts).
+_client = None
+
+
+def get_client():
+    """
+    Get the shared client, create it at the first invocation.
+    """
+    global _client
+    if _client is None:
+        _client = boto3.client("dynamodb")
+    return _client
@@ -0,0 +1,136 @@
+"""
+Enqueue messages as tasks to the DynamoDB task queue (Botte DynamoDB interface),
+ instead of sending them via Telegram right away.
+
+The tasks are then sent by the DynamoDB stream consumer (see
+ dynamodb_message_view.py), so HTTP callers that opt in do not wait for Telegram,
+ and they get the same burst handling as the DynamoDB interface.
+
+The Boto3 client is the shared one in dynamodb_client.py.
+
+```py
+from botte_be.domain import dynamodb_task_enqueuer
+
+try:
+    task = dynamodb_task_enqueuer.enqueue_message("Hello world!", sender_app="CURL")
+    print(task.sk)
+except dynamodb_task_enqueuer.EnqueueError as exc:
+    print(f"Failed, but written: {[x.sk for x in exc.written_tasks]}")
+```
+"""
+
+import uuid
+
+import botocore.exceptions
+import botte_dynamodb_tasks
+
+from ..conf import settings
+from .dynamodb_client import get_client
+
+__all__ = [
+    "enqueue_message",
+    "enqueue_messages",
+    "BaseDynamodbTaskEnqueuerException",
+    "EnqueueError",
+]
+
+# Retries for the unprocessed items in a BatchWriteItem response (fi. because of
+#  throttling), with exponential backoff and full jitter (see
+#  `botte_dynamodb_tasks.iter_batch_write_tasks()`). Lower than in
+#  botte-dynamodb-client, as the caller is waiting for the HTTP response.
+BATCH_WRITE_MAX_RETRIES = 3
+BATCH_WRITE_BACKOFF_BASE_SECS = 0.05
+BATCH_WRITE_BACKOFF_MAX_SECS = 1.0
+
+
+def enqueue_message(
+    text: str, sender_app: str
+) -> botte_dynamodb_tasks.BotteMessageDynamodbTask:
+    """
+    Write a single message as a task to the DynamoDB task queue.
+
+    Returns the task written.
+    Raise `EnqueueError` if the task is not written.
+    """
+    task = botte_dynamodb_tasks.BotteMessageDynamodbTask(
+        text=text, sender_app=sender_app
+    )
+    try:
+        get_client().put_item(
+            TableName=settings.DYNAMODB_TASK_TABLE_NAME,
+            Item=task.to_dynamodb_item(),
+        )
+    except (botocore.exceptions.BotoCoreError, botocore.exceptions.ClientError) as exc:
+        raise EnqueueError(written_tasks=[]) from exc
+    return task
+
+
+def enqueue_messages(
+    texts: list[str],
+    sender_app: str,
+    do_process_task_fifo: bool = False,
+    fifo_group_id: str | None = None,
+    max_retries: int = BATCH_WRITE_MAX_RETRIES,
+) -> list[botte_dynamodb_tasks.BotteMessageDynamodbTask]:
+    """
+    Write many messages as tasks to the DynamoDB task queue, with a BatchWriteItem
+     request per chunk of 25 tasks.
+
+    Args:
+        texts: the texts of the messages.
+        sender_app: identifier of the sender app.
+        do_process_task_fifo: True to have the messages sent sequentially, in the same
+         order as `texts`; False to have them sent concurrently.
+        fifo_group_id: the FIFO group of the messages, with `do_process_task_fifo`.
+         Default: a new group for this call, so the messages are sent in order, but
+         concurrently with the messages of other calls (and not all queued behind
+         the global FIFO group).
+        max_retries: max number of retries for the unprocessed items in a
+         BatchWriteItem response.
+
+    Returns the tasks written, in the same order as `texts`.
+    Raise `EnqueueError`, with the tasks already written, if some tasks are not
+     written: fi. with the cause `UnprocessedItemsError` after `max_retries`.
+    """
+    if do_process_task_fifo and not fifo_group_id:
+        fifo_group_id = uuid.uuid4().hex
+    chunks = botte_dynamodb_tasks.BotteMessageDynamodbTask.build_many(
+        texts,
+        sender_app=sender_app,
+        do_process_task_fifo=do_process_task_fifo,
+        fifo_group_id=fifo_group_id,
+    )
+    tasks = [task for chunk in chunks for task in chunk]
+    written_tasks: list[botte_dynamodb_tasks.BotteMessageDynamodbTask] = []
+    try:
+        for chunk in botte_dynamodb_tasks.iter_batch_write_tasks(
+            get_client(),
+            settings.DYNAMODB_TASK_TABLE_NAME,
+            tasks,
+            max_retries=max_retries,
+            backoff_base_secs=BATCH_WRITE_BACKOFF_BASE_SECS,
+            backoff_max_secs=BATCH_WRITE_BACKOFF_MAX_SECS,
+        ):
+            written_tasks += chunk
+    except (
+        botocore.exceptions.BotoCoreError,
+        botocore.exceptions.ClientError,
+        botte_dynamodb_tasks.UnprocessedItemsError,
+    ) as exc:
+        raise EnqueueError(written_tasks=written_tasks) from exc
+    return tasks
+
+
+class BaseDynamodbTaskEnqueuerException(Exception):
+    pass
+
+
+class EnqueueError(BaseDynamodbTaskEnqueuerException):
+    def __init__(
+        self, written_tasks: list[botte_dynamodb_tasks.BotteMessageDynamodbTask]
+    ):
+        # The tasks written before the error: they will be sent anyway.
+        self.written_tasks = written_tasks
+        super().__init__(
+            f"Failed to enqueue the tasks, {len(written_tasks)} already written"
+        )
@@ -0,0 +1,197 @@
+"""
+Send the tasks read from the DynamoDB task queue (Botte DynamoDB interface).
+
+Tasks are grouped by PK (partition key) and the groups are sent concurrently, with a
+ bounded pool of threads. Tasks with the same PK are sent sequentially, in KSUID
+ order, which is what `do_process_task_fifo` and `fifo_group_id` require (see
+ `botte_dynamodb_tasks.BotteMessageDynamodbTask.pk`). So a batch with N distinct PKs
+ takes about the time of the slowest group, instead of the sum of all sends.
+
+A failed send does not stop the other groups. Within a group, instead, the tasks
+ after a failed one are not sent, to preserve the FIFO order, and are reported as
+ failed too.
+
+With a `deadline` (see send_deadline.py), a task is not sent when there is not
+ enough time left before the Lambda timeout: it is reported as failed, together with
+ the next tasks in its group, so it is retried by the DynamoDB stream.
+
+The tasks can also be sent as a stream, with `send_task_stream()`: the first PK group
+ starts sending as soon as its first task is read, while the next records are still
+ being parsed. So the time to the first delivery does not depend on the batch size.
+
+```py
+from botte_be.domain import dynamodb_task_sender
+
+tasks_by_id = {
+    parsed.sequence_number: parsed.task
+    for parsed in BotteMessageDynamodbTask.parse_event(event)
+    if not parsed.error
+}
+deadline = send_deadline.SendDeadline.from_context(context, sender.latency_stats)
+failed_ids = dynamodb_task_sender.send_tasks(tasks_by_id, deadline=deadline)
+
+# Or, streaming.
+failed_ids = dynamodb_task_sender.send_task_stream(
+    (parsed.sequence_number, parsed.task)
+    for parsed in BotteMessageDynamodbTask.iter_parse_event(event)
+    if not parsed.error
+)
+```
+"""
+
+import threading
+from collections import defaultdict, deque
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+
+import botte_dynamodb_tasks
+import log_utils as logger
+
+from . import telegram_sender
+from .send_deadline import SendDeadline
+
+__all__ = [
+    "send_tasks",
+    "send_task_stream",
+    "group_tasks_by_pk",
+]
+
+# Max number of PK groups sent concurrently. Mind that it should not be greater than
+#  the size of the HTTP connection pool in the Telegram sender.
+MAX_WORKERS = telegram_sender.POOL_MAXSIZE
+
+# A task with its id, fi. the SequenceNumber of the DynamoDB stream record.
+_IdAndTask = tuple[str, botte_dynamodb_tasks.BotteMessageDynamodbTask]
+
+
+def group_tasks_by_pk(
+    tasks_by_id: dict[str, botte_dynamodb_tasks.BotteMessageDynamodbTask],
+) -> list[list[_IdAndTask]]:
+    """
+    Group tasks by PK, each group sorted by KSUID.
+
+    Args:
+        tasks_by_id: tasks by id, fi. the SequenceNumber of the DynamoDB stream record.
+    """
+    groups = defaultdict(list)
+    for task_id, task in tasks_by_id.items():
+        groups[task.pk].append((task_id, task))
+    for group in groups.values():
+        group.sort(key=lambda x: x[1].ksuid)
+    return list(groups.values())
+
+
+def send_tasks(
+    tasks_by_id: dict[str, botte_dynamodb_tasks.BotteMessageDynamodbTask],
+    max_workers: int = MAX_WORKERS,
+    deadline: SendDeadline | None = None,
+) -> list[str]:
+    """
+    Send tasks: concurrently between different PKs, sequentially within the same PK.
+
+    Args:
+        tasks_by_id: tasks by id, fi. the SequenceNumber of the DynamoDB stream record.
+        max_workers: max number of PK groups sent concurrently.
+        deadline: if given, the tasks are not sent when there is not enough time
+         left (and they are returned as not sent).
+
+    Returns the ids of the tasks that were not sent.
+    """
+    # Sorted by KSUID, so the tasks with the same PK are sent in KSUID order.
+    return send_task_stream(
+        sorted(tasks_by_id.items(), key=lambda x: x[1].ksuid),
+        max_workers=max_workers,
+        deadline=deadline,
+    )
+
+
+def send_task_stream(
+    id_and_tasks: Iterable[_IdAndTask],
+    max_workers: int = MAX_WORKERS,
+    deadline: SendDeadline | None = None,
+) -> list[str]:
+    """
+    Send tasks as they arrive: each task is queued to its PK group, and the group is
+     sent by a worker thread as soon as it has a task, while the next tasks are still
+     being read (fi. parsed from the DynamoDB stream event).
+    Like `send_tasks()`: concurrently between different PKs, sequentially within the
+     same PK, in the order in which the tasks arrive. Which, for a DynamoDB stream
+     batch, is the FIFO order, as the records with the same PK are in sequence order.
+
+    Args:
+        id_and_tasks: tasks with their ids, like: [("4444500001357803510521810", task)].
+        max_workers: max number of PK groups sent concurrently.
+        deadline: if given, the tasks are not sent when there is not enough time
+         left (and they are returned as not sent).
+
+    Returns the ids of the tasks that were not sent.
+    """
+    sender = telegram_sender.get_sender()
+    # Queued tasks, by PK.
+    queues: dict[str, deque[_IdAndTask]] = defaultdict(deque)
+    # The PKs with a worker sending their queue.
+    active_pks = set()
+    # The PKs with a task not sent: the next tasks are not sent either, or the FIFO
+    #  order would break.
+    failed_pks = set()
+    not_sent_ids = []
+    lock = threading.Lock()
+
+    def send_queue(pk: str) -> None:
+        while True:
+            with lock:
+                if not queues[pk]:
+                    active_pks.discard(pk)
+                    return
+                task_id, task = queues[pk].popleft()
+                if pk in failed_pks:
+                    not_sent_ids.append(task_id)
+                    continue
+            if not _send_task(sender, task_id, task, deadline):
+                with lock:
+                    failed_pks.add(pk)
+                    not_sent_ids.append(task_id)
+
+    futures = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for task_id, task in id_and_tasks:
+            pk = task.pk
+            with lock:
+                if pk in failed_pks:
+                    not_sent_ids.append(task_id)
+                    continue
+                queues[pk].append((task_id, task))
+                if pk in active_pks:
+                    # Its worker will send it.
+                    continue
+                active_pks.add(pk)
+            futures.append(executor.submit(send_queue, pk))
+    # Re-raise unexpected errors in the workers, if any.
+    for future in futures:
+        future.result()
+    return not_sent_ids
+
+
+def _send_task(
+    sender: telegram_sender.TelegramSender,
+    task_id: str,
+    task: botte_dynamodb_tasks.BotteMessageDynamodbTask,
+    deadline: SendDeadline | None = None,
+) -> bool:
+    """
+    Send a task. Return False if it was not sent.
+    """
+    if deadline is not None and not deadline.has_time_for_send():
+        logger.warning(
+            f"Not enough time left ({deadline.remaining_seconds:.3f} secs), task"
+            f" {task_id} and the next ones with PK {task.pk} not sent"
+        )
+        return False
+    try:
+        sender.send_message(task.text, deadline=deadline)
+    except Exception:
+        logger.exception(
+            f"Failed to send task {task_id}, the next ones with PK {task.pk} not sent"
+        )
+        return False
+    return True
@@ -0,0 +1,125 @@
+"""
+Send a batch of Telegram messages, received in a single request, via the shared
+ Telegram sender.
+
+Messages are sent either in order (sequentially) or in parallel (with a bounded pool
+ of threads). Either way, a failed message does not stop the others, and the result
+ of each message is returned, in the same order as the texts.
+
+With a `deadline` (see send_deadline.py), a message is not sent when there is not
+ enough time left before the Lambda timeout, and its result is a 504 error. So a
+ slow batch ends with a partial result, instead of a timeout.
+
+```py
+from botte_be.domain import message_batch_sender
+
+results = message_batch_sender.send_messages(["Hello 1", "Hello 2"])
+# [{"status_code": 200, "message": {...}}, {"status_code": 400, "error": "..."}]
+```
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import log_utils as logger
+from telebot import apihelper
+
+from . import telegram_sender
+from .send_deadline import DeadlineExceeded, SendDeadline
+from .telegram_rate_limiter import RetryAfterTooLong
+
+__all__ = [
+    "send_messages",
+    "validate_messages",
+]
+
+# Max number of messages sent concurrently. Mind that it should not be greater than
+#  the size of the HTTP connection pool in the Telegram sender.
+MAX_WORKERS = telegram_sender.POOL_MAXSIZE
+
+# Status code in the result of the messages not sent because of the deadline.
+DEADLINE_STATUS_CODE = 504
+
+
+def validate_messages(messages: list, max_messages: int) -> list[str] | None:
+    """
+    Validate a list of messages, like: [{"text": "Hello 1"}, {"text": "Hello 2"}].
+    Return the texts, or None if the messages are not valid.
+    """
+    if not isinstance(messages, list) or not 0 < len(messages) <= max_messages:
+        return None
+    texts = []
+    for message in messages:
+        if not isinstance(message, dict):
+            return None
+        text = message.get("text")
+        if not text or not isinstance(text, str):
+            return None
+        texts.append(text)
+    return texts
+
+
+def send_messages(
+    texts: list[str],
+    do_send_in_order: bool = True,
+    max_workers: int = MAX_WORKERS,
+    deadline: SendDeadline | None = None,
+) -> list[dict]:
+    """
+    Send many Telegram messages.
+
+    Args:
+        texts: the texts of the messages.
+        do_send_in_order: True to send the messages sequentially, in the same order as
+         `texts`; False to send them in parallel (so they might be delivered in any
+         order).
+        max_workers: max number of messages sent concurrently, when not
+         `do_send_in_order`.
+        deadline: if given, the messages are not sent when there is not enough time
+         left.
+
+    Returns the results, in the same order as `texts`, like:
+        [
+            {"status_code": 200, "message": {...}},  # The Telegram message.
+            {"status_code": 400, "error": "..."},
+            {"status_code": 504, "error": "..."},  # Not sent because of the deadline.
+        ]
+    """
+    sender = telegram_sender.get_sender()
+    if do_send_in_order or len(texts) == 1:
+        return [_send_message(sender, text, deadline) for text in texts]
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(texts))) as executor:
+        return list(
+            executor.map(lambda text: _send_message(sender, text, deadline), texts)
+        )
+
+
+def _send_message(
+    sender: telegram_sender.TelegramSender,
+    text: str,
+    deadline: SendDeadline | None = None,
+) -> dict:
+    if deadline is not None and not deadline.has_time_for_send():
+        logger.warning(
+            f"Not enough time left ({deadline.remaining_seconds:.3f} secs),"
+            " message not sent"
+        )
+        return {
+            "status_code": DEADLINE_STATUS_CODE,
+            "error": "Not sent: not enough time left before the timeout",
+        }
+    try:
+        message = sender.send_message(text, deadline=deadline)
+    except apihelper.ApiTelegramException as exc:
+        logger.exception("Failed to send a message")
+        return {"status_code": exc.error_code, "error": exc.description}
+    except DeadlineExceeded as exc:
+        logger.exception("Failed to send a message")
+        return {"status_code": DEADLINE_STATUS_CODE, "error": f"Not sent: {exc}"}
+    except RetryAfterTooLong as exc:
+        logger.exception("Failed to send a message")
+        return {"status_code": 429, "error": str(exc)}
+    except Exception as exc:
+        logger.exception("Failed to send a message")
+        return {"status_code": 500, "error": str(exc)}
+    return {"status_code": 200, "message": message.json}
@@ -0,0 +1,72 @@
+"""
+Split texts longer than the Telegram limit for a message (4096 chars), so they can
+ be sent as many messages instead of failing with a 400 error.
+
+Texts are split on line boundaries, so fi. a stack trace or a report is still
+ readable. A single line longer than the limit is split at the limit.
+
+Mind that Telegram counts the length in UTF-16 code units, so fi. an emoji counts
+ as 2 chars.
+
+```py
+from botte_be.domain import message_chunker
+
+chunks = message_chunker.split_text(long_text, max_length=4096)
+```
+"""
+
+__all__ = [
+    "get_length",
+    "split_text",
+]
+
+
+def get_length(text: str) -> int:
+    """
+    The length of the text as counted by Telegram: in UTF-16 code units.
+    """
+    return len(text.encode("utf-16-le")) // 2
+
+
+def split_text(text: str, max_length: int) -> list[str]:
+    """
+    Split a text in chunks of at most `max_length` (as counted by Telegram), on line
+     boundaries.
+
+    Returns the chunks, in order; just `[text]` if it is not too long.
+    """
+    if get_length(text) <= max_length:
+        return [text]
+
+    chunks = []
+    lines: list[str] = []
+    length = 0
+    for line in text.splitlines(keepends=True):
+        parts = [line]
+        if get_length(line) > max_length:
+            parts = _split_line(line, max_length)
+        for part in parts:
+            part_length = get_length(part)
+            if length + part_length > max_length:
+                chunks.append("".join(lines))
+                lines = []
+                length = 0
+            lines.append(part)
+            length += part_length
+    chunks.append("".join(lines))
+
+    # Telegram rejects empty (or blank) messages.
+    return [chunk.rstrip("\n") for chunk in chunks if chunk.strip()]
+
+
+def _split_line(line: str, max_length: int) -> list[str]:
+    parts = []
+    while line:
+        end = max_length
+        # Shorter, if there are chars that count as 2 UTF-16 code units. Each char
+        #  counts at most 2, so removing half of the excess never removes too much.
+        while (excess := get_length(line[:end]) - max_length) > 0:
+            end -= max(excess // 2, 1)
+        parts.append(line[:end])
+        line = line[end:]
+    return parts
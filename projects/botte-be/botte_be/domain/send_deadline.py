@@ -0,0 +1,145 @@
+"""
+Deadline-aware sends: stop sending before the Lambda times out.
+
+A batch of messages sent while Telegram is slow (or while the rate limiter is
+ throttling) might hit the Lambda timeout in the middle, and then there is no record
+ of which messages were sent. So, before each send, the time left before the
+ timeout is checked against the p99 of the latency of the recent sends: when it is
+ not enough, the send is skipped, and the message is reported as not sent.
+
+The latency of the sends is measured by the Telegram sender (see
+ `TelegramSender.latency_stats`), including the waits for the rate limits, and kept
+ across warm invocations.
+
+The deadline is also enforced within a send: the Telegram sender bounds the timeout
+ of each HTTP request to the time left, and it raises `DeadlineExceeded` instead of
+ waiting for a 429 `retry_after` longer than the time left.
+
+```py
+from botte_be.domain import send_deadline, telegram_sender
+
+sender = telegram_sender.get_sender()
+deadline = send_deadline.SendDeadline.from_context(context, sender.latency_stats)
+if deadline is None or deadline.has_time_for_send():
+    sender.send_message("Hello world!")
+```
+"""
+
+import math
+import threading
+import time
+from collections import deque
+
+from ..conf import settings
+
+__all__ = [
+    "SendLatencyStats",
+    "SendDeadline",
+    "DeadlineExceeded",
+]
+
+
+class SendLatencyStats:
+    def __init__(self, window_size: int | None = None):
+        """
+        Thread-safe rolling stats of the latency of the recent sends.
+
+        Args:
+            window_size: number of recent sends in the stats, default:
+             settings.SEND_LATENCY_WINDOW_SIZE.
+        """
+        if window_size is None:
+            window_size = settings.SEND_LATENCY_WINDOW_SIZE
+        self._latencies: deque[float] = deque(maxlen=window_size)
+        self._lock = threading.Lock()
+
+    def record(self, latency: float) -> None:
+        with self._lock:
+            self._latencies.append(latency)
+
+    @property
+    def p99(self) -> float:
+        """
+        The p99 latency, in secs, of the recent sends, or
+         settings.DEFAULT_SEND_LATENCY_SECONDS if there are no sends yet.
+        """
+        with self._lock:
+            latencies = sorted(self._latencies)
+        if not latencies:
+            return settings.DEFAULT_SEND_LATENCY_SECONDS
+        return latencies[math.ceil(0.99 * len(latencies)) - 1]
+
+
+class DeadlineExceeded(Exception):
+    def __init__(self, remaining_seconds: float, needed_seconds: float = 0):
+        self.remaining_seconds = remaining_seconds
+        self.needed_seconds = needed_seconds
+        super().__init__(
+            f"Not enough time left before the deadline: {remaining_seconds:.3f} secs"
+            f" left, {needed_seconds:.3f} secs needed"
+        )
+
+
+class SendDeadline:
+    def __init__(
+        self,
+        remaining_seconds: float,
+        latency_stats: SendLatencyStats,
+        safety_margin_seconds: float | None = None,
+    ):
+        """
+        The deadline for the sends in a Lambda invocation.
+
+        Args:
+            remaining_seconds: secs left before the Lambda timeout.
+            latency_stats: the latency of the recent sends.
+            safety_margin_seconds: secs kept for the work after the sends (fi. the
+             response), default: settings.SEND_DEADLINE_SAFETY_MARGIN_SECONDS.
+        """
+        if safety_margin_seconds is None:
+            safety_margin_seconds = settings.SEND_DEADLINE_SAFETY_MARGIN_SECONDS
+        self.latency_stats = latency_stats
+        # Monotonic ts of the last moment a send can end.
+        self._deadline_ts = time.monotonic() + remaining_seconds - safety_margin_seconds
+
+    @classmethod
+    def from_context(
+        cls, context, latency_stats: SendLatencyStats
+    ) -> "SendDeadline | None":
+        """
+        Build the deadline from the Lambda context.
+
+        Returns None if the context has no remaining time, fi. a fake context in tests.
+        """
+        try:
+            remaining_ms = context.get_remaining_time_in_millis()
+        except AttributeError:
+            return None
+        if not remaining_ms or remaining_ms <= 0:
+            return None
+        return cls(remaining_ms / 1000, latency_stats)
+
+    @property
+    def remaining_seconds(self) -> float:
+        """
+        Secs left to send, net of the safety margin.
+        """
+        return self._deadline_ts - time.monotonic()
+
+    def has_time_for_send(self) -> bool:
+        """
+        True if a send started now would end, at p99, before the deadline.
+        """
+        return self.remaining_seconds >= self.latency_stats.p99
+
+    def check(self, needed_seconds: float = 0) -> float:
+        """
+        Raise DeadlineExceeded if there are not `needed_seconds` left (or no time at
+         all).
+
+        Returns the secs left.
+        """
+        remaining_seconds = self.remaining_seconds
+        if remaining_seconds <= 0 or remaining_seconds < needed_seconds:
+            raise DeadlineExceeded(remaining_seconds, needed_seconds)
+        return remaining_seconds
@@ -0,0 +1,162 @@
+"""
+Staleness policy for the tasks read from the DynamoDB task queue.
+
+After an outage (fi. Telegram down, or the Lambda throttled), the DynamoDB stream
+ has a backlog of tasks, and sending each of them as if it was fresh would take
+ thousands of Telegram calls (and rate limit waits) for messages that are not news
+ anymore. So:
+ - expired tasks (past their ExpirationTs) are dropped, and counted;
+ - stale tasks (older than settings.STALE_TASK_AGE_SECONDS, by their KSUID ts)
+    are merged into a single "N delayed messages" digest per PK, so the backlog
+    drains in a handful of Telegram calls.
+Mind that tasks not FIFO have a unique PK each, and no ordering constraints, so all
+ the stale ones in the batch are merged in a single digest.
+
+```py
+from botte_be.domain import stale_task_policy
+
+policy = stale_task_policy.StaleTaskPolicy()
+failed_ids = dynamodb_task_sender.send_task_stream(
+    policy.filter_tasks(tasks_by_id.items())
+)
+# The ids of the original tasks, also the ones merged in a failed digest.
+failed_ids = policy.expand_ids(failed_ids)
+print(f"Expired: {len(policy.expired_ids)}, merged: {policy.n_merged}")
+```
+"""
+
+from collections.abc import Iterable, Iterator
+from datetime import UTC
+
+import botte_dynamodb_tasks
+import datetime_utils
+
+from ..conf import settings
+
+__all__ = [
+    "StaleTaskPolicy",
+    "DIGEST_SENDER_APP",
+]
+
+# The SenderApp of the digest tasks.
+DIGEST_SENDER_APP = "BOTTE_BE_DIGEST"
+
+_Task = botte_dynamodb_tasks.BotteMessageDynamodbTask
+# A task with its id, fi. the SequenceNumber of the DynamoDB stream record.
+_IdAndTask = tuple[str, _Task]
+
+
+class StaleTaskPolicy:
+    def __init__(self):
+        """
+        The staleness policy for a batch of tasks: use a new instance per batch, as it
+         collects the ids of the expired and merged tasks.
+
+        Attributes:
+            expired_ids: the ids of the expired tasks, dropped.
+            merged_ids_by_digest_id: the ids of the tasks merged in each digest, by
+             the id of the digest (which is the id of the oldest task merged).
+        """
+        self.expired_ids: list[str] = []
+        self.merged_ids_by_digest_id: dict[str, list[str]] = {}
+
+    @property
+    def n_merged(self) -> int:
+        """
+        Metric: number of tasks merged in digests.
+        """
+        return sum(len(ids) for ids in self.merged_ids_by_digest_id.values())
+
+    def expand_ids(self, ids: list[str]) -> list[str]:
+        """
+        Replace the ids of the digests with the ids of the tasks merged in them.
+        """
+        expanded_ids = []
+        for task_id in ids:
+            expanded_ids += self.merged_ids_by_digest_id.get(task_id, [task_id])
+        return expanded_ids
+
+    def filter_tasks(self, id_and_tasks: Iterable[_IdAndTask]) -> Iterator[_IdAndTask]:
+        """
+        Drop the expired tasks (if settings.DO_DROP_EXPIRED_TASKS), and merge the
+         stale ones (older than settings.STALE_TASK_AGE_SECONDS, if not None) in
+         digests, one per PK.
+
+        It is lazy, so it can be chained in a stream: fresh tasks are yielded right
+         away. Stale tasks are held until the first fresh task with the same PK
+         (then the digest is yielded before it, to keep the FIFO order) or until the
+         end of the stream.
+
+        Args:
+            id_and_tasks: tasks with their ids, like: [("4444500001357803510521810",
+             task)].
+        """
+        stale_age_seconds = settings.STALE_TASK_AGE_SECONDS
+        do_drop_expired = settings.DO_DROP_EXPIRED_TASKS
+        now_ts = datetime_utils.now_utc().timestamp()
+
+        # Stale tasks by digest key, like: {(True, "BOTTE_MESSAGE"): [(id, task)]}.
+        #  The key includes the FIFO flag, as a FIFO task with no group has PK
+        #  "BOTTE_MESSAGE", and it must not be merged with the tasks not FIFO.
+        stale_groups: dict[tuple[bool, str | None], list[_IdAndTask]] = {}
+        for task_id, task in id_and_tasks:
+            if do_drop_expired and task.expiration_ts < now_ts:
+                self.expired_ids.append(task_id)
+            elif (
+                stale_age_seconds is not None
+                and now_ts - task.ksuid.datetime.timestamp() > stale_age_seconds
+            ):
+                stale_groups.setdefault(_get_digest_key(task), []).append(
+                    (task_id, task)
+                )
+            else:
+                # The stale tasks with the same PK go first (only FIFO tasks have
+                #  ordering constraints).
+                if task.do_process_task_fifo and (
+                    group := stale_groups.pop(_get_digest_key(task), None)
+                ):
+                    yield self._merge(group)
+                yield task_id, task
+
+        for group in stale_groups.values():
+            yield self._merge(group)
+
+    def _merge(self, group: list[_IdAndTask]) -> _IdAndTask:
+        if len(group) == 1:
+            # Nothing to merge.
+            return group[0]
+        group.sort(key=lambda x: x[1].ksuid)
+        digest_id = group[0][0]
+        self.merged_ids_by_digest_id[digest_id] = [task_id for task_id, _ in group]
+        return digest_id, _make_digest([task for _, task in group])
+
+
+def _get_digest_key(task: _Task) -> tuple[bool, str | None]:
+    """
+    The key of the digest for a stale task: its PK if FIFO, otherwise None, as tasks
+     not FIFO all go in the same digest.
+    """
+    if task.do_process_task_fifo:
+        return True, task.pk
+    return False, None
+
+
+def _make_digest(tasks: list[_Task]) -> _Task:
+    """
+    Merge tasks, sorted by KSUID, in a single digest task.
+    The digest has the PK and the KSUID of the oldest task, so it keeps its place in
+     the FIFO order.
+    """
+    lines = [f"{len(tasks)} delayed messages:"]
+    for task in tasks:
+        created_at = task.ksuid.datetime.astimezone(UTC)
+        lines.append(f"[{created_at:%Y-%m-%d %H:%M:%S} UTC] {task.text}")
+    oldest = tasks[0]
+    return _Task(
+        text="\n".join(lines),
+        sender_app=DIGEST_SENDER_APP,
+        do_process_task_fifo=oldest.do_process_task_fifo,
+        fifo_group_id=oldest.fifo_group_id,
+        ksuid=oldest.ksuid,
+        expiration_ts=max(task.expiration_ts for task in tasks),
+    )
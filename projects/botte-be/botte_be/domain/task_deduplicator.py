@@ -0,0 +1,259 @@
+"""
+De-duplicate the tasks read from the DynamoDB task queue, so a task re-delivered by
+ the DynamoDB stream (fi. after a shard split, a timeout or a retry) is not sent
+ twice.
+
+Tasks are keyed by their SK (the KSUID), in 2 layers:
+ - an in-container LRU of the SKs already claimed, for warm invocations: no
+    DynamoDB round trip at all when all the tasks in the batch are in the LRU;
+ - a "sent" marker item written in the task table, with a condition on its
+    non-existence, so the same task is claimed only once across all containers.
+    All the markers of a batch are written with a single TransactWriteItems request,
+    so the check costs one DynamoDB round trip per batch, not one per task.
+
+Tasks are claimed before being sent, and released (the marker is deleted) when the
+ send fails or raises, so they can be retried.
+Mind that a crash (or a Lambda timeout) in the middle of the sends leaves the markers
+ of the tasks not sent in place: when retried, those tasks are skipped as duplicates,
+ so they are lost (until the markers expire, after
+ settings.TASK_SENT_MARKER_TTL_SECONDS). This is the price of not sending the tasks
+ twice; the send deadline (see send_deadline.py) makes timeouts unlikely.
+
+Mind that the marker items are not processed by the DynamoDB stream consumer, as the
+ stream filter in serverless.yml only passes items with TaskId=BOTTE_MESSAGE.
+
+Errors are not fatal: if the markers cannot be written, the tasks are sent anyway
+ (at-least-once delivery, like without this layer).
+
+```py
+from botte_be.domain import task_deduplicator
+
+new_tasks_by_id, duplicate_ids = task_deduplicator.claim_tasks(tasks_by_id)
+failed_ids = list(new_tasks_by_id)
+try:
+    failed_ids = dynamodb_task_sender.send_tasks(new_tasks_by_id)
+finally:
+    task_deduplicator.release_sks([new_tasks_by_id[x].sk for x in failed_ids])
+```
+
+In a stream of tasks, use `iter_claim_tasks()`, which claims the tasks in chunks,
+ one round trip per chunk, starting with a small chunk so the first tasks are sent
+ right away.
+"""
+
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+
+import botte_dynamodb_tasks
+import datetime_utils
+import log_utils as logger
+
+from ..conf import settings
+from .dynamodb_client import get_client
+
+__all__ = [
+    "claim_tasks",
+    "iter_claim_tasks",
+    "release_sks",
+    "SENT_MARKER_TASK_ID",
+]
+
+SENT_MARKER_TASK_ID = "BOTTE_MESSAGE_SENT"
+# Max number of items in a single DynamoDB TransactWriteItems request.
+TRANSACT_WRITE_MAX_ITEMS = 100
+# In a stream of tasks, the first chunk claimed is this small, so the first tasks are
+#  sent right away, without waiting for a full chunk of tasks to be read; then the
+#  chunk size doubles, up to TRANSACT_WRITE_MAX_ITEMS.
+ITER_CLAIM_FIRST_CHUNK_SIZE = 4
+# Max attempts for a TransactWriteItems request: it is retried without the markers
+#  that already exist, and after transient errors (fi. a transaction conflict).
+TRANSACT_WRITE_MAX_ATTEMPTS = 3
+
+# Global vars so they are re-used across subsequent Lambda invocations (warm starts).
+# The LRU of the claimed SKs.
+_claimed_sks: OrderedDict[str, None] = OrderedDict()
+_lock = threading.Lock()
+
+_Task = botte_dynamodb_tasks.BotteMessageDynamodbTask
+
+
+def claim_tasks(
+    tasks_by_id: dict[str, _Task],
+) -> tuple[dict[str, _Task], list[str]]:
+    """
+    Claim the tasks, so they are sent only once.
+
+    Args:
+        tasks_by_id: tasks by id, fi. the SequenceNumber of the DynamoDB stream record.
+
+    Returns the tasks claimed (to be sent), by id, and the ids of the duplicate tasks
+     (already claimed, so not to be sent).
+    """
+    new_tasks_by_id = {}
+    duplicate_ids = []
+    seen_sks = set()
+    with _lock:
+        for task_id, task in tasks_by_id.items():
+            if task.sk in _claimed_sks:
+                _claimed_sks.move_to_end(task.sk)
+                duplicate_ids.append(task_id)
+                continue
+            # A duplicate within the same batch.
+            if task.sk in seen_sks:
+                duplicate_ids.append(task_id)
+                continue
+            seen_sks.add(task.sk)
+            new_tasks_by_id[task_id] = task
+
+    if new_tasks_by_id:
+        existing_sks = _write_markers(list(new_tasks_by_id.values()))
+        for task_id, task in list(new_tasks_by_id.items()):
+            if task.sk in existing_sks:
+                del new_tasks_by_id[task_id]
+                duplicate_ids.append(task_id)
+
+    with _lock:
+        for task in new_tasks_by_id.values():
+            _claimed_sks[task.sk] = None
+        while len(_claimed_sks) > settings.TASK_DEDUP_LRU_SIZE:
+            _claimed_sks.popitem(last=False)
+
+    if duplicate_ids:
+        logger.info(f"Duplicate tasks not sent: {duplicate_ids}")
+    return new_tasks_by_id, duplicate_ids
+
+
+def iter_claim_tasks(
+    id_and_tasks: Iterable[tuple[str, _Task]],
+) -> Iterator[tuple[str, _Task]]:
+    """
+    Same as `claim_tasks()`, but lazy, for a stream of tasks: the tasks are claimed
+     in chunks (a single TransactWriteItems request per chunk), and yielded as soon
+     as their chunk is claimed.
+    The first chunk has ITER_CLAIM_FIRST_CHUNK_SIZE tasks, so the first sends do not
+     wait for a full chunk to be read and claimed, then the chunk size doubles up to
+     TRANSACT_WRITE_MAX_ITEMS: so a large batch still costs a few round trips.
+    It is pipelined at the chunk level when the consumer sends in other threads (like
+     `dynamodb_task_sender.send_task_stream()`): the next chunk is read and claimed
+     while the tasks of the previous one are being sent.
+
+    Args:
+        id_and_tasks: tasks with their ids, like: [("4444500001357803510521810",
+         task)].
+
+    Yields the tasks claimed (to be sent), with their ids.
+    """
+    chunk_size = ITER_CLAIM_FIRST_CHUNK_SIZE
+    chunk = {}
+    for task_id, task in id_and_tasks:
+        chunk[task_id] = task
+        if len(chunk) >= chunk_size:
+            new_tasks_by_id, _ = claim_tasks(chunk)
+            yield from new_tasks_by_id.items()
+            chunk = {}
+            chunk_size = min(chunk_size * 2, TRANSACT_WRITE_MAX_ITEMS)
+    if chunk:
+        new_tasks_by_id, _ = claim_tasks(chunk)
+        yield from new_tasks_by_id.items()
+
+
+def release_sks(sks: list[str]) -> None:
+    """
+    Release tasks previously claimed, by SK, fi. because their send failed, so they
+     can be claimed again.
+    """
+    if not sks:
+        return
+    with _lock:
+        for sk in sks:
+            _claimed_sks.pop(sk, None)
+
+    table_name = settings.DYNAMODB_TASK_TABLE_NAME
+    chunk_size = botte_dynamodb_tasks.BATCH_WRITE_MAX_ITEMS
+    for i in range(0, len(sks), chunk_size):
+        requests = [
+            {"DeleteRequest": {"Key": _make_marker_key(sk)}}
+            for sk in sks[i : i + chunk_size]
+        ]
+        try:
+            response = get_client().batch_write_item(
+                RequestItems={table_name: requests}
+            )
+        except Exception:
+            logger.exception("Failed to release tasks")
+            continue
+        if response.get("UnprocessedItems", {}).get(table_name):
+            logger.error("Failed to release some tasks: unprocessed items")
+
+
+def _write_markers(tasks: list[_Task]) -> set[str]:
+    """
+    Write the "sent" markers of the tasks, with a condition on their non-existence.
+
+    Returns the SKs of the tasks whose markers already exist (duplicates).
+    """
+    existing_sks = set()
+    for i in range(0, len(tasks), TRANSACT_WRITE_MAX_ITEMS):
+        existing_sks |= _write_markers_chunk(tasks[i : i + TRANSACT_WRITE_MAX_ITEMS])
+    return existing_sks
+
+
+def _write_markers_chunk(tasks: list[_Task]) -> set[str]:
+    client = get_client()
+    table_name = settings.DYNAMODB_TASK_TABLE_NAME
+    expiration_ts = str(
+        round(datetime_utils.now_utc().timestamp())
+        + settings.TASK_SENT_MARKER_TTL_SECONDS
+    )
+    existing_sks = set()
+    for _ in range(TRANSACT_WRITE_MAX_ATTEMPTS):
+        try:
+            client.transact_write_items(
+                TransactItems=[
+                    {
+                        "Put": {
+                            "TableName": table_name,
+                            "Item": {
+                                **_make_marker_key(task.sk),
+                                "TaskId": {"S": SENT_MARKER_TASK_ID},
+                                "ExpirationTs": {"N": expiration_ts},
+                            },
+                            "ConditionExpression": "attribute_not_exists(PK)",
+                        }
+                    }
+                    for task in tasks
+                ]
+            )
+            return existing_sks
+        except client.exceptions.TransactionCanceledException as exc:
+            # One reason per item, in the same order, like:
+            #  [{"Code": "None"}, {"Code": "ConditionalCheckFailed"}]
+            reasons = exc.response.get("CancellationReasons") or []
+            if len(reasons) != len(tasks):
+                # Unexpected: just retry.
+                continue
+            # Retry without the markers that already exist.
+            remaining_tasks = []
+            for task, reason in zip(tasks, reasons, strict=True):
+                if reason.get("Code") == "ConditionalCheckFailed":
+                    existing_sks.add(task.sk)
+                else:
+                    remaining_tasks.append(task)
+            tasks = remaining_tasks
+            if not tasks:
+                return existing_sks
+        except Exception:
+            # Not fatal: the tasks are sent anyway (at-least-once delivery).
+            logger.exception(f"Failed to write sent markers for {len(tasks)} tasks")
+            return existing_sks
+
+    logger.error(f"Failed to write sent markers for {len(tasks)} tasks")
+    return existing_sks
+
+
+def _make_marker_key(sk: str) -> dict[str, dict[str, str]]:
+    return {
+        "PK": {"S": f"{SENT_MARKER_TASK_ID}#{sk}"},
+        "SK": {"S": sk},
+    }
@@ -0,0 +1,149 @@
+"""
+Rate limiter for the Telegram messages sent by the Telegram sender.
+
+Telegram limits (see https://core.telegram.org/bots/faq#my-bot-is-hitting-limits-how-do-i-avoid-this):
+ - about 30 messages per second, globally for a bot;
+ - about 1 message per second in a single chat, with short bursts allowed.
+When a limit is exceeded Telegram responds with a 429 error with the number of secs
+ to wait in `parameters.retry_after`.
+
+The global and per-chat limits are enforced with token buckets, and a 429 pauses
+ all sends until `retry_after` is over.
+Mind that the limiter is per process (so per Lambda execution environment): many
+ concurrent Lambdas can still exceed the global limit, and then the 429 handling
+ kicks in.
+"""
+
+import threading
+import time
+
+from ..conf import settings
+
+__all__ = [
+    "TokenBucket",
+    "TelegramRateLimiter",
+    "BaseTelegramRateLimiterException",
+    "RetryAfterTooLong",
+]
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        """
+        Thread-safe token bucket.
+
+        Args:
+            rate: tokens added per second.
+            capacity: max number of tokens, so the max burst size.
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._last_ts = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Take a token, and return the number of secs to wait before using it.
+        The token is reserved even if the caller has to wait, so concurrent callers
+         are served in order.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._last_ts) * self.rate
+            )
+            self._last_ts = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+
+class TelegramRateLimiter:
+    def __init__(
+        self,
+        global_rate: float | None = None,
+        chat_rate: float | None = None,
+        chat_burst: float | None = None,
+        max_retry_after: float | None = None,
+    ):
+        """
+        Rate limiter for the global and per-chat Telegram limits, and for the
+         `retry_after` in 429 responses.
+
+        Args:
+            global_rate: max messages per second, for all chats, default:
+             settings.TELEGRAM_GLOBAL_RATE_LIMIT.
+            chat_rate: max messages per second, in a single chat, default:
+             settings.TELEGRAM_CHAT_RATE_LIMIT.
+            chat_burst: max burst of messages in a single chat, default:
+             settings.TELEGRAM_CHAT_RATE_LIMIT_BURST.
+            max_retry_after: max secs to wait for a 429 `retry_after`, the send
+             fails if Telegram asks to wait longer, default:
+             settings.TELEGRAM_MAX_RETRY_AFTER.
+        """
+        if global_rate is None:
+            global_rate = settings.TELEGRAM_GLOBAL_RATE_LIMIT
+        self.global_bucket = TokenBucket(rate=global_rate, capacity=global_rate)
+        self.chat_rate = (
+            chat_rate if chat_rate is not None else settings.TELEGRAM_CHAT_RATE_LIMIT
+        )
+        self.chat_burst = (
+            chat_burst
+            if chat_burst is not None
+            else settings.TELEGRAM_CHAT_RATE_LIMIT_BURST
+        )
+        self.max_retry_after = (
+            max_retry_after
+            if max_retry_after is not None
+            else settings.TELEGRAM_MAX_RETRY_AFTER
+        )
+        self._chat_buckets: dict[str, TokenBucket] = {}
+        # Monotonic ts until which all sends are paused, after a 429.
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+        # Metric: total secs spent waiting because of the limits.
+        self.throttled_seconds = 0.0
+
+    def wait(self, chat_id: str) -> float:
+        """
+        Block until a message can be sent to the given chat.
+        Return the number of secs waited.
+        """
+        with self._lock:
+            bucket = self._chat_buckets.get(chat_id)
+            if bucket is None:
+                bucket = TokenBucket(rate=self.chat_rate, capacity=self.chat_burst)
+                self._chat_buckets[chat_id] = bucket
+            paused_for = self._paused_until - time.monotonic()
+
+        delay = max(self.global_bucket.reserve(), bucket.reserve(), paused_for, 0)
+        if delay:
+            time.sleep(delay)
+            self._add_throttled_seconds(delay)
+        return delay
+
+    def pause(self, retry_after: float) -> None:
+        """
+        Pause all sends for `retry_after` secs, after a 429 response.
+        Raise `RetryAfterTooLong` if `retry_after` is greater than `max_retry_after`.
+        """
+        if retry_after > self.max_retry_after:
+            raise RetryAfterTooLong(retry_after)
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+
+    def _add_throttled_seconds(self, seconds: float) -> None:
+        with self._lock:
+            self.throttled_seconds += seconds
+
+
+class BaseTelegramRateLimiterException(Exception):
+    pass
+
+
+class RetryAfterTooLong(BaseTelegramRateLimiterException):
+    def __init__(self, retry_after: float):
+        self.retry_after = retry_after
+        super().__init__(f"Telegram asked to retry after too many secs: {retry_after}")
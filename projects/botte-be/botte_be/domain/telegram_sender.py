@@ -0,0 +1,258 @@
+"""
+Shared Telegram sender used by all views to send Telegram messages.
+
+The sender is created once, during Lambda static init (see
+ `views_utils.lambda_static_init()`), and it owns a keep-alive HTTP session with a
+ connection pool. So warm invocations re-use the TLS connection to api.telegram.org
+ opened by a previous invocation, instead of paying for a new TLS handshake.
+
+All sends go through a rate limiter that honours Telegram limits: the global and
+ per-chat limits, and the `retry_after` in 429 responses (see
+ telegram_rate_limiter.py).
+
+With a `deadline` (see send_deadline.py), each HTTP request times out at the
+ deadline, and a 429 `retry_after` past the deadline fails right away (with
+ `DeadlineExceeded`) instead of waiting.
+
+Texts longer than the Telegram limit for a message are split on line boundaries and
+ sent as many messages, in order (see message_chunker.py). The chunks are sent
+ sequentially, one request at a time, as Telegram does not guarantee the order of
+ concurrent messages. If a chunk fails, the previous ones are already sent: so
+ `ChunkSendError` tells the index of the first chunk not sent, and a retry of the
+ whole text sends the previous chunks again. Texts longer than
+ settings.TELEGRAM_DOCUMENT_MIN_LENGTH are uploaded as a single text document
+ instead, so a very long report takes a single request.
+
+```py
+from botte_be.domain import telegram_sender
+
+sender = telegram_sender.get_sender()
+message = sender.send_message("Hello world!")
+print(message.json)
+```
+"""
+
+import io
+import time
+from collections.abc import Callable
+from functools import partial
+
+import requests
+import telebot
+from requests.adapters import HTTPAdapter
+from telebot import apihelper
+
+from ..conf import settings
+from . import message_chunker
+from .send_deadline import SendDeadline, SendLatencyStats
+from .telegram_rate_limiter import TelegramRateLimiter
+
+__all__ = [
+    "TelegramSender",
+    "get_sender",
+    "ChunkSendError",
+]
+
+# Max number of keep-alive connections to api.telegram.org in the pool. It should be
+#  at least the max number of threads sending concurrently, otherwise the extra
+#  connections are opened and then discarded.
+POOL_MAXSIZE = 10
+
+# The name of the text document with a text too long for messages.
+DOCUMENT_FILE_NAME = "message.txt"
+# Max length of a document caption, for Telegram. Mind that it is measured in chars
+#  here, not in UTF-16 code units, so it is well below the Telegram limit (1024).
+DOCUMENT_CAPTION_MAX_LENGTH = 200
+
+# Global var so it is re-used across subsequent Lambda invocations (warm starts).
+_sender: "TelegramSender | None" = None
+
+
+def get_sender() -> "TelegramSender":
+    """
+    Get the shared sender, create it at the first invocation.
+    """
+    global _sender
+    if _sender is None:
+        _sender = TelegramSender()
+    return _sender
+
+
+class ChunkSendError(Exception):
+    def __init__(self, chunk_index: int, n_chunks: int, exc: Exception):
+        """
+        A chunk of a long text failed, after the previous chunks were sent.
+
+        Attributes:
+            chunk_index: the index of the first chunk not sent, so also the number
+             of chunks sent.
+            n_chunks: the total number of chunks.
+        """
+        self.chunk_index = chunk_index
+        self.n_chunks = n_chunks
+        super().__init__(
+            f"Failed to send chunk {chunk_index} (0-based) of {n_chunks}, the"
+            f" previous ones were sent: {exc}"
+        )
+
+
+class TelegramSender:
+    def __init__(
+        self,
+        pool_maxsize: int = POOL_MAXSIZE,
+        rate_limiter: TelegramRateLimiter | None = None,
+    ):
+        """
+        Sender of Telegram messages, via a keep-alive HTTP session.
+        There should be only one instance per process, so get it with `get_sender()`.
+
+        Args:
+            pool_maxsize: max number of keep-alive connections in the pool.
+            rate_limiter: default: a new `TelegramRateLimiter` with the limits in
+             settings.
+        """
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        # Route all HTTP requests made by telebot through this session. This is a
+        #  global config in telebot, so it applies to any `TeleBot` instance, also
+        #  the one in endpoint_webhook_view.py.
+        # Note: without this, telebot uses a session per thread that is reset every
+        #  10 mins (`apihelper.SESSION_TIME_TO_LIVE`).
+        apihelper.CUSTOM_REQUEST_SENDER = self.session.request
+
+        self.rate_limiter = rate_limiter or TelegramRateLimiter()
+        # Latency of the recent sends, for deadline-aware sends (see
+        #  send_deadline.py).
+        self.latency_stats = SendLatencyStats()
+        self._bot: telebot.TeleBot | None = None
+
+    @property
+    def bot(self) -> telebot.TeleBot:
+        # Read the token at every access, and not in __init__, otherwise the test
+        #  settings and vcr.py will not be able to catch it on time.
+        token = settings.TELEGRAM_TOKEN
+        if self._bot is None or self._bot.token != token:
+            self._bot = telebot.TeleBot(token, threaded=False)
+        return self._bot
+
+    @property
+    def throttled_seconds(self) -> float:
+        """
+        Metric: total secs spent waiting because of Telegram rate limits.
+        """
+        return self.rate_limiter.throttled_seconds
+
+    def send_message(
+        self,
+        text: str,
+        chat_id: str | None = None,
+        deadline: SendDeadline | None = None,
+    ) -> telebot.types.Message:
+        """
+        Send a Telegram message, waiting for the rate limits if necessary.
+        A message that gets a 429 response is retried after `retry_after` secs, up
+         to settings.TELEGRAM_MAX_429_RETRIES times.
+
+        A text longer than settings.TELEGRAM_MAX_MESSAGE_LENGTH is split on line
+         boundaries and sent as many messages, sequentially, in order; and the first
+         message is returned. If a chunk but the first fails, it raises
+         ChunkSendError, with the index of the first chunk not sent. A text longer
+         than settings.TELEGRAM_DOCUMENT_MIN_LENGTH is uploaded as a text document.
+
+        Args:
+            text: the text of the message.
+            chat_id: the target chat, default: settings.PUNTONIM_CHAT_ID.
+            deadline: if given, it raises DeadlineExceeded when the send cannot end
+             before the deadline: each request times out at the deadline, and a 429
+             `retry_after` past the deadline is not waited for.
+        """
+        chat_id = chat_id or settings.PUNTONIM_CHAT_ID
+        # The latency includes the waits for the rate limits and the retries, as
+        #  this is the time it takes to send.
+        start = time.monotonic()
+        try:
+            if message_chunker.get_length(text) > settings.TELEGRAM_DOCUMENT_MIN_LENGTH:
+                return self._send_document(text, chat_id, deadline)
+            chunks = message_chunker.split_text(
+                text, settings.TELEGRAM_MAX_MESSAGE_LENGTH
+            )
+            # Sequentially, as Telegram does not guarantee the order of concurrent
+            #  messages. They all go over the same keep-alive connection.
+            messages = []
+            for i, chunk in enumerate(chunks):
+                try:
+                    message = self._send(
+                        chat_id,
+                        partial(self.bot.send_message, text=chunk, chat_id=chat_id),
+                        deadline=deadline,
+                    )
+                except Exception as exc:
+                    if not messages:
+                        # Nothing sent yet.
+                        raise
+                    raise ChunkSendError(i, len(chunks), exc) from exc
+                messages.append(message)
+            return messages[0]
+        finally:
+            self.latency_stats.record(time.monotonic() - start)
+
+    def _send_document(
+        self, text: str, chat_id: str, deadline: SendDeadline | None = None
+    ) -> telebot.types.Message:
+        # The first line as caption, so the document has some context in the chat.
+        first_line = text.lstrip().split("\n", 1)[0]
+        caption = first_line
+        if len(caption) > DOCUMENT_CAPTION_MAX_LENGTH:
+            caption = caption[: DOCUMENT_CAPTION_MAX_LENGTH - 1] + "…"
+        document = io.BytesIO(text.encode())
+        return self._send(
+            chat_id,
+            partial(
+                self.bot.send_document,
+                chat_id=chat_id,
+                document=document,
+                visible_file_name=DOCUMENT_FILE_NAME,
+                caption=caption,
+            ),
+            # Rewind the file, in case of retry.
+            before_retry=partial(document.seek, 0),
+            deadline=deadline,
+        )
+
+    def _send(
+        self,
+        chat_id: str,
+        request: Callable[..., telebot.types.Message],
+        before_retry: Callable | None = None,
+        deadline: SendDeadline | None = None,
+    ) -> telebot.types.Message:
+        n_retries = 0
+        while True:
+            self.rate_limiter.wait(chat_id)
+            kwargs = {}
+            if deadline is not None:
+                # The timeout of the HTTP request (both connect and read), so a slow
+                #  Telegram cannot make the send end past the deadline.
+                kwargs["timeout"] = deadline.check()
+            try:
+                return request(**kwargs)
+            except apihelper.ApiTelegramException as exc:
+                if (
+                    exc.error_code != 429
+                    or n_retries >= settings.TELEGRAM_MAX_429_RETRIES
+                ):
+                    raise
+                retry_after = (exc.result_json.get("parameters") or {}).get(
+                    "retry_after", 1
+                )
+                if deadline is not None:
+                    # Fail fast, instead of waiting to end past the deadline anyway.
+                    deadline.check(retry_after)
+                # It raises RetryAfterTooLong if Telegram asks to wait too long.
+                self.rate_limiter.pause(retry_after)
+                n_retries += 1
+                if before_retry is not None:
+                    before_retry()
@@ -2,10 +2,16 @@ from typing import Any
 
 import botte_dynamodb_tasks
 import log_utils as logger
-import telebot
 from aws_lambda_powertools.utilities.typing import LambdaContext
 
 from ..conf import settings
+from ..domain import (
+    dynamodb_task_sender,
+    send_deadline,
+    stale_task_policy,
+    task_deduplicator,
+    telegram_sender,
+)
 from .views_utils import lambda_static_init
 
 # Objects declared outside the Lambda's handler method are part of Lambda's
@@ -19,14 +25,16 @@ from .views_utils import lambda_static_init
 # See: https://docs.aws.amazon.com/lambda/latest/dg/lambda-runtime-environment.html#static-initialization
 
 # This Lambda is configured with 0 retries. So do raise exceptions in the view.
+# But, for single records that fail, do not raise: report them in the partial batch
+#  response instead (`batchItemFailures`).
 
-lambda_static_init()
+lambda_static_init(do_init_telegram_sender=True)
 
 logger.info("DYNAMODB MESSAGE: LOADING")
 
 
 @logger.get_adapter().inject_lambda_context(log_event=True)
-def lambda_handler(event: dict[str, Any], context: LambdaContext) -> None:
+def lambda_handler(event: dict[str, Any], context: LambdaContext) -> dict:
     """
     Handler for the Lambda function triggered by an INSERT in a DynamoDB table event.
     The DynamoDB table serves as a task queue.
@@ -120,6 +128,11 @@ def lambda_handler(event: dict[str, Any], context: LambdaContext) -> None:
         }
     More info here: https://docs.aws.amazon.com/lambda/latest/dg/python-context.html
 
+    The returned dict is a partial batch response, with the SequenceNumber of the
+     records that failed (invalid, not sent, or not sent because there was not enough
+     time left before the Lambda timeout), like:
+        {"batchItemFailures": [{"itemIdentifier": "4444500001357803510521810"}]}
+
     Example:
         To trigger this Lambda, write to the DynamoDB table arn:aws:dynamodb:eu-south-1:477353422995:table/botte-be-task-prod
          a record like:
@@ -149,18 +162,86 @@ def lambda_handler(event: dict[str, Any], context: LambdaContext) -> None:
     # Cast the event to the proper Lambda Powertools class.
     # dynamodb_event = DynamoDBStreamEvent(event)
 
-    messages = []
+    # A streaming pipeline: the records are parsed lazily, and each task goes through
+    #  the next stages as soon as it is parsed, so the first PK group starts sending
+    #  before the whole batch is parsed. The records with the same PK are in sequence
+    #  order in the batch, so no need to sort them.
+    # It raises ValidationError only if the whole event is malformed.
+    parsed_records = botte_dynamodb_tasks.BotteMessageDynamodbTask.iter_parse_event(
+        event
+    )
+
+    # Report only the failed records, so one bad record does not make the whole batch
+    #  fail (and so re-sent or sent to the onFailure destination).
+    failed_ids = []
+
+    def iter_valid_tasks():
+        for parsed in parsed_records:
+            if parsed.error:
+                logger.error(
+                    f"Invalid record with SequenceNumber {parsed.sequence_number}"
+                    f" and PK {parsed.pk}: {parsed.error}"
+                )
+                failed_ids.append(parsed.sequence_number)
+                continue
+            yield parsed.sequence_number, parsed.task
+
+    # Drop the expired tasks (they count as processed, not failed), and merge the
+    #  stale ones in a digest per PK, so a backlog drains in a few Telegram calls.
+    policy = stale_task_policy.StaleTaskPolicy()
+    id_and_tasks = policy.filter_tasks(iter_valid_tasks())
+    # The SKs of the claimed tasks, by id, to release the ones not sent. Only the SKs,
+    #  so the tasks (and their texts) are not held in memory after they are sent.
+    claimed_sks_by_id = {}
+
+    def iter_claimed_tasks(id_and_tasks):
+        for task_id, task in task_deduplicator.iter_claim_tasks(id_and_tasks):
+            claimed_sks_by_id[task_id] = task.sk
+            yield task_id, task
+
+    # Skip the tasks already sent, fi. re-delivered by the DynamoDB stream. They are
+    #  not reported as failed. It runs after the policy, so the expired tasks are not
+    #  claimed, and the digests are claimed as a whole.
+    if settings.DO_DEDUP_TASKS:
+        id_and_tasks = iter_claimed_tasks(id_and_tasks)
+
+    # Tasks with different PKs are sent concurrently, while tasks with the same PK
+    #  are sent sequentially (FIFO).
+    # The tasks that cannot be sent before the Lambda timeout are reported as failed,
+    #  so they are retried, instead of timing out in the middle of the batch.
+    sender = telegram_sender.get_sender()
+    deadline = send_deadline.SendDeadline.from_context(context, sender.latency_stats)
+    throttled_seconds = sender.throttled_seconds
+    not_sent_ids = None
     try:
-        for task in botte_dynamodb_tasks.BotteMessageDynamodbTask.yield_from_event(
-            event
-        ):
-            messages.append({"ksuid": task.ksuid, "text": task.text})
-    except botte_dynamodb_tasks.ValidationError:
-        raise
-    messages.sort(key=lambda x: x["ksuid"])
-
-    bot = telebot.TeleBot(settings.TELEGRAM_TOKEN, threaded=False)
-    for message in messages:
-        message = bot.send_message(
-            text=message["text"], chat_id=settings.PUNTONIM_CHAT_ID
+        not_sent_ids = dynamodb_task_sender.send_task_stream(
+            id_and_tasks, deadline=deadline
+        )
+    finally:
+        # Release the claims of the tasks not sent, so they can be sent again, if
+        #  retried. If the sends raised, release all the claims: some tasks might be
+        #  sent twice, but none is lost.
+        # Mind that if the Lambda crashes or times out, this is not executed, and the
+        #  claimed tasks are skipped as duplicates when retried (until the markers
+        #  expire): lost. The deadline makes timeouts unlikely.
+        release_ids = claimed_sks_by_id if not_sent_ids is None else not_sent_ids
+        task_deduplicator.release_sks(
+            [claimed_sks_by_id[x] for x in release_ids if x in claimed_sks_by_id]
         )
+    # A failed digest fails all the tasks merged in it.
+    not_sent_ids = policy.expand_ids(not_sent_ids)
+    failed_ids += not_sent_ids
+    # Metrics.
+    logger.info(f"DYNAMODB MESSAGE: EXPIRED TASKS {len(policy.expired_ids)}")
+    logger.info(f"DYNAMODB MESSAGE: DIGESTED TASKS {policy.n_merged}")
+    # Metric: secs spent waiting for Telegram rate limits in this invocation.
+    throttled_seconds = sender.throttled_seconds - throttled_seconds
+    logger.info(f"DYNAMODB MESSAGE: THROTTLED SECONDS {throttled_seconds:.3f}")
+
+    # Partial batch response.
+    # Docs: https://docs.aws.amazon.com/lambda/latest/dg/services-ddb-batchfailurereporting.html
+    return {
+        "batchItemFailures": [
+            {"itemIdentifier": sequence_number} for sequence_number in failed_ids
+        ]
+    }
@@ -2,13 +2,23 @@ from json import JSONDecodeError
 from typing import Any
 
 import log_utils as logger
-import telebot
 from aws_lambda_powertools.utilities.data_classes import APIGatewayProxyEventV2
 from aws_lambda_powertools.utilities.typing import LambdaContext
 from aws_utils import aws_lambda_utils
 
 from ..conf import settings
-from .views_utils import lambda_static_init
+from ..domain import (
+    dynamodb_task_enqueuer,
+    message_batch_sender,
+    send_deadline,
+    telegram_sender,
+)
+from .views_utils import (
+    accepted_202_response,
+    gateway_timeout_504_response,
+    lambda_static_init,
+    service_unavailable_503_response,
+)
 
 # Objects declared outside the Lambda's handler method are part of Lambda's
 # *execution environment*. This execution environment is sometimes reused for subsequent
@@ -22,7 +32,10 @@ from .views_utils import lambda_static_init
 
 # This Lambda is configured with 0 retries. So do raise exceptions in the view.
 
-lambda_static_init()
+lambda_static_init(do_init_telegram_sender=True)
+
+# Used as task SenderApp when the request has no `sender_app`.
+DEFAULT_SENDER_APP = "BOTTE_HTTP_ENDPOINT"
 
 logger.info("ENDPOINT MESSAGE: LOADING")
 
@@ -134,6 +147,41 @@ def lambda_handler(event: dict[str, Any], context: LambdaContext) -> dict:
           "date": 1698264386,
           "text": "Hello World"
         }
+        If the message cannot be sent before the Lambda timeout (fi. Telegram asks
+         to retry after too many secs), the response is a 504, like:
+        {"error": "Not sent: ..."}
+
+    Example, to send many messages with a single request:
+        $ curl -X POST https://5t325uqwq7.execute-api.eu-south-1.amazonaws.com/messages \
+           -H 'Authorization: XXX' \
+           -d '[{"text": "Hello 1"}, {"text": "Hello 2"}]'
+        {
+          "results": [
+            {"status_code": 200, "message": {"message_id": 9, ...}},
+            {"status_code": 400, "error": "..."}
+          ]
+        }
+        The messages that cannot be sent before the Lambda timeout are not sent and
+         their result is: {"status_code": 504, "error": "..."}.
+        The body can also be an object, to send the messages in parallel (so they
+         might be delivered in any order):
+           -d '{"messages": [{"text": "Hello 1"}], "do_send_in_order": false}'
+
+    Example, async mode: with `"do_enqueue": true` the message is written as a task
+     to the DynamoDB task queue and the response is a 202 right away, without
+     waiting for Telegram. The message is then sent by the DynamoDB stream consumer
+     (dynamodb_message_view.py):
+        $ curl -X POST https://5t325uqwq7.execute-api.eu-south-1.amazonaws.com/message \
+           -H 'Authorization: XXX' \
+           -d '{"text": "Hello World", "do_enqueue": true}'
+        {"task_id": "34sVCw69dftbK1MSWtRkv6T8vGp"}
+        It works with many messages too (with `do_send_in_order` the tasks are
+         processed in FIFO order):
+           -d '{"messages": [{"text": "Hello 1"}], "do_enqueue": true}'
+        {"task_ids": ["34sVCw69dftbK1MSWtRkv6T8vGp"]}
+        If DynamoDB fails, the response is a 503 with the ids of the tasks already
+         written (they will be sent anyway), so the caller can retry only the others:
+        {"error": "...", "task_ids": ["34sVCw69dftbK1MSWtRkv6T8vGp"]}
     """
     logger.info("ENDPOINT MESSAGE: START")
 
@@ -149,19 +197,93 @@ def lambda_handler(event: dict[str, Any], context: LambdaContext) -> dict:
             "Body must be JSON encoded"
         ).to_dict()
 
+    if api_event.path.endswith("/messages"):
+        return _send_many(body, context)
+
     # `text` POST body param.
-    text = body.get("text")
+    text = body.get("text") if isinstance(body, dict) else None
     if not text:
         return aws_lambda_utils.BadRequest400Response(
             "Body parameter 'text' required"
         ).to_dict()
 
     # `sender_app` POST body param: it's optional and just used for logging purpose
-    #  (logging is done in the lambda_handler() decorator).
-    # sender_app = body.get("sender_app")
+    #  (logging is done in the lambda_handler() decorator), and as task SenderApp.
+    if body.get("do_enqueue") is True:
+        try:
+            task = dynamodb_task_enqueuer.enqueue_message(
+                text, sender_app=_get_sender_app(body)
+            )
+        except dynamodb_task_enqueuer.EnqueueError as exc:
+            return _enqueue_error_response(exc)
+        return accepted_202_response({"task_id": task.sk})
 
-    bot = telebot.TeleBot(settings.TELEGRAM_TOKEN, threaded=False)
-    message = bot.send_message(text=text, chat_id=settings.PUNTONIM_CHAT_ID)
+    # The send fails fast, instead of timing out, if it cannot end before the Lambda
+    #  timeout: fi. if Telegram asks to retry after too many secs.
+    sender = telegram_sender.get_sender()
+    deadline = send_deadline.SendDeadline.from_context(context, sender.latency_stats)
+    try:
+        message = sender.send_message(text, deadline=deadline)
+    except send_deadline.DeadlineExceeded as exc:
+        logger.exception("Failed to send the message")
+        return gateway_timeout_504_response({"error": f"Not sent: {exc}"})
     response_body = message.json
 
     return aws_lambda_utils.Ok200Response(response_body).to_dict()
+
+
+def _send_many(body: list | dict, context: LambdaContext) -> dict:
+    do_send_in_order = True
+    do_enqueue = False
+    messages = body
+    if isinstance(body, dict):
+        messages = body.get("messages")
+        do_send_in_order = body.get("do_send_in_order", True)
+        do_enqueue = body.get("do_enqueue") is True
+
+    texts = message_batch_sender.validate_messages(
+        messages, settings.MAX_MESSAGES_PER_REQUEST
+    )
+    if texts is None:
+        return aws_lambda_utils.BadRequest400Response(
+            f"Body must be a list of 1 to {settings.MAX_MESSAGES_PER_REQUEST} items"
+            ' like: {"text": "Hello world"}'
+        ).to_dict()
+
+    if do_enqueue:
+        try:
+            tasks = dynamodb_task_enqueuer.enqueue_messages(
+                texts,
+                sender_app=_get_sender_app(body),
+                do_process_task_fifo=do_send_in_order,
+            )
+        except dynamodb_task_enqueuer.EnqueueError as exc:
+            return _enqueue_error_response(exc)
+        return accepted_202_response({"task_ids": [task.sk for task in tasks]})
+
+    # The messages that cannot be sent before the Lambda timeout are reported as
+    #  not sent (504), instead of timing out in the middle of the batch.
+    deadline = send_deadline.SendDeadline.from_context(
+        context, telegram_sender.get_sender().latency_stats
+    )
+    results = message_batch_sender.send_messages(
+        texts, do_send_in_order=do_send_in_order, deadline=deadline
+    )
+    return aws_lambda_utils.Ok200Response({"results": results}).to_dict()
+
+
+def _enqueue_error_response(exc: dynamodb_task_enqueuer.EnqueueError) -> dict:
+    logger.exception("Failed to enqueue the messages")
+    return service_unavailable_503_response(
+        {
+            "error": f"{exc}: {exc.__cause__}",
+            "task_ids": [task.sk for task in exc.written_tasks],
+        }
+    )
+
+
+def _get_sender_app(body: dict) -> str:
+    sender_app = body.get("sender_app")
+    if not sender_app or not isinstance(sender_app, str):
+        return DEFAULT_SENDER_APP
+    return sender_app
@@ -22,7 +22,7 @@ from .views_utils import lambda_static_init
 
 # This Lambda is configured with 0 retries. So do raise exceptions in the view.
 
-lambda_static_init()
+lambda_static_init(do_init_telegram_sender=True)
 
 logger.info("ENDPOINT TELEGRAM WEBHOOK: LOADING")
 
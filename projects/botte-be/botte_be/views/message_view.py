@@ -1,12 +1,12 @@
 from typing import Any
 
 import log_utils as logger
-import telebot
 from aws_lambda_powertools.utilities.typing import LambdaContext
 from aws_utils import aws_lambda_utils
 
 from ..conf import settings
-from .views_utils import lambda_static_init
+from ..domain import message_batch_sender, send_deadline, telegram_sender
+from .views_utils import gateway_timeout_504_response, lambda_static_init
 
 # Objects declared outside the Lambda's handler method are part of Lambda's
 # *execution environment*. This execution environment is sometimes reused for subsequent
@@ -20,7 +20,7 @@ from .views_utils import lambda_static_init
 
 # This Lambda is configured with 0 retries. So do raise exceptions in the view.
 
-lambda_static_init()
+lambda_static_init(do_init_telegram_sender=True)
 
 logger.info("MESSAGE: LOADING")
 
@@ -42,6 +42,25 @@ def lambda_handler(event: dict[str, Any], context: LambdaContext) -> dict:
             "text": "Hello world from aws-lambda-client pytests!",
             "sender_app": "AWS_LAMBDA_CLIENT"  # sender_app is optional.
         }
+    Or, to send many messages with a single invocation:
+        {
+            "messages": [{"text": "Hello 1"}, {"text": "Hello 2"}],
+            "sender_app": "AWS_LAMBDA_CLIENT",  # sender_app is optional.
+            # Optional, default True; False to send the messages in parallel (so they
+            #  might be delivered in any order).
+            "do_send_in_order": True
+        }
+    In this case the response body has the result of each message, in the same
+     order, like:
+        {
+            "results": [
+                {"status_code": 200, "message": {...}},  # The Telegram message.
+                {"status_code": 400, "error": "..."},
+            ]
+        }
+    The messages that cannot be sent before the Lambda timeout are not sent and
+     their result is: {"status_code": 504, "error": "..."}.
+    Same for a single message: the response is a 504, like: {"error": "..."}.
 
     The `context` is a `LambdaContext` instance with properties similar to:
         {
@@ -61,6 +80,9 @@ def lambda_handler(event: dict[str, Any], context: LambdaContext) -> dict:
     """
     logger.info("MESSAGE: START")
 
+    if "messages" in event:
+        return _send_many(event, context)
+
     # `text` event param.
     text = event.get("text")
     if not text:
@@ -74,10 +96,39 @@ def lambda_handler(event: dict[str, Any], context: LambdaContext) -> dict:
     #  (logging is done in the lambda_handler() decorator).
     # sender_app = event.get("sender_app")
 
-    bot = telebot.TeleBot(settings.TELEGRAM_TOKEN, threaded=False)
-    message = bot.send_message(text=text, chat_id=settings.PUNTONIM_CHAT_ID)
+    # The send fails fast, instead of timing out, if it cannot end before the Lambda
+    #  timeout: fi. if Telegram asks to retry after too many secs.
+    sender = telegram_sender.get_sender()
+    deadline = send_deadline.SendDeadline.from_context(context, sender.latency_stats)
+    try:
+        message = sender.send_message(text, deadline=deadline)
+    except send_deadline.DeadlineExceeded as exc:
+        logger.exception("Failed to send the message")
+        return gateway_timeout_504_response({"error": f"Not sent: {exc}"})
     response_body = message.json
 
     # This is a Lambda direct invocation interface, but it returns the same response
     #  as the HTTP interface.
     return aws_lambda_utils.Ok200Response(response_body).to_dict()
+
+
+def _send_many(event: dict[str, Any], context: LambdaContext) -> dict:
+    texts = message_batch_sender.validate_messages(
+        event["messages"], settings.MAX_MESSAGES_PER_REQUEST
+    )
+    if texts is None:
+        return aws_lambda_utils.BadRequest400Response(
+            "Payload parameter 'messages' must be a list of 1 to"
+            f" {settings.MAX_MESSAGES_PER_REQUEST} items like:"
+            ' {"text": "Hello world"}'
+        ).to_dict()
+
+    # The messages that cannot be sent before the Lambda timeout are reported as
+    #  not sent (504), instead of timing out in the middle of the batch.
+    deadline = send_deadline.SendDeadline.from_context(
+        context, telegram_sender.get_sender().latency_stats
+    )
+    results = message_batch_sender.send_messages(
+        texts, do_send_in_order=event.get("do_send_in_order", True), deadline=deadline
+    )
+    return aws_lambda_utils.Ok200Response({"results": results}).to_dict()
@@ -1,3 +1,5 @@
+import json
+
 import log_utils as logger
 
 from ..__version__ import __version__
@@ -10,7 +12,7 @@ powertools_logger = logger.PowertoolsLoggerAdapter()
 _IS_LOGGER_CONFIGURED = False
 
 
-def lambda_static_init():
+def lambda_static_init(do_init_telegram_sender: bool = False):
     """
     To be used across al Lambdas in this repo.
 
@@ -21,9 +23,51 @@ def lambda_static_init():
     Typical use cases: database connection and log init. The same db connection can be
      re-used in some subsequent function invocations. It is recommended though to add
      logic to check if a connection already exists before creating a new one.
+
+    Args:
+        do_init_telegram_sender: True for Lambdas that send Telegram messages, to
+         create the shared Telegram sender (and its keep-alive HTTP session).
     """
     _log_init()
     # _db_init()  # Great place where to init the db.
+    if do_init_telegram_sender:
+        _telegram_sender_init()
+
+
+def accepted_202_response(body) -> dict:
+    """
+    A 202 Accepted response for API Gateway, with a JSON body, in the same format as
+     `aws_lambda_utils.Ok200Response(body).to_dict()`.
+    Used when a request is accepted and processed later (fi. enqueued).
+    """
+    return _json_response(202, body)
+
+
+def service_unavailable_503_response(body) -> dict:
+    """
+    A 503 Service Unavailable response for API Gateway, with a JSON body, in the same
+     format as `accepted_202_response()`.
+    Used when a dependency (fi. DynamoDB) fails, so the request can be retried.
+    """
+    return _json_response(503, body)
+
+
+def gateway_timeout_504_response(body) -> dict:
+    """
+    A 504 Gateway Timeout response for API Gateway, with a JSON body, in the same
+     format as `accepted_202_response()`.
+    Used when a message is not sent because there is not enough time left before the
+     Lambda timeout, so the request can be retried.
+    """
+    return _json_response(504, body)
+
+
+def _json_response(status_code: int, body) -> dict:
+    return {
+        "statusCode": status_code,
+        "headers": {"Content-Type": "application/json"},
+        "body": json.dumps(body),
+    }
 
 
 def _log_init():
@@ -56,3 +100,12 @@ def _log_init():
         ) from exc
     logger.debug("Logger initialized")
     _IS_LOGGER_CONFIGURED = True
+
+
+def _telegram_sender_init():
+    # Import here, so Lambdas that do not send Telegram messages (like the authorizer)
+    #  do not pay the import time of telebot.
+    from ..domain import telegram_sender
+
+    # It is a no-op if the sender already exists (warm start).
+    telegram_sender.get_sender()
@@ -1,7 +1,13 @@
 import json
 import os
 import re
+import threading
+import time
+from collections import defaultdict
 from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
 
 import pytest
 from _pytest.fixtures import SubRequest
@@ -11,6 +17,7 @@ from vcr.cassette import Cassette
 from vcr.errors import CannotOverwriteExistingCassetteException
 
 from botte_be.conf import settings_module
+from botte_be.domain import telegram_rate_limiter, telegram_sender
 from botte_be.views.views_utils import powertools_logger
 
 IS_VCR_EPISODE_OR_ERROR = True  # False to record new cassettes.
@@ -277,6 +284,218 @@ def monkeysession(request):
     mpatch.undo()
 
 
+@pytest.fixture(autouse=True, scope="function")
+def reset_telegram_rate_limiter(monkeypatch):
+    """
+    Use a new rate limiter in the shared Telegram sender for each test, otherwise the
+     tokens consumed by a test would throttle the next tests.
+    """
+    monkeypatch.setattr(
+        telegram_sender.get_sender(),
+        "rate_limiter",
+        telegram_rate_limiter.TelegramRateLimiter(),
+    )
+
+
+class FakeTelegramServer:
+    """
+    A local stand-in for api.telegram.org, to be used via the fixture
+     `fake_telegram_server`.
+
+    It counts the TCP connections it accepted, so tests can check that connections
+     are re-used, and it records all the requests it accepted (so not those that
+     got a 429 response).
+    """
+
+    def __init__(self, delay: float = 0):
+        # Seconds to wait before responding to each request.
+        self.delay = delay
+        # Texts of the messages for which a 400 error is returned.
+        self.error_texts: set[str] = set()
+        # Respond 429 to the next `n_429` requests, with this `retry_after`.
+        self.n_429 = 0
+        self.retry_after = 1
+        # Respond 429 when more than `max_rate` requests are received within 1 sec,
+        #  like Telegram does.
+        self.max_rate: int | None = None
+        self.n_429_sent = 0
+        self.n_connections = 0
+        self.requests: list[dict] = []
+        self._lock = threading.Lock()
+        self._message_id = 0
+
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # HTTP/1.1 to support keep-alive connections.
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                # One handler instance per TCP connection.
+                super().setup()
+                with fake._lock:
+                    fake.n_connections += 1
+
+            def do_POST(self):  # noqa: N802
+                status, body = fake._handle(self)
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST  # noqa: N815
+
+            def log_message(self, *args, **kwargs):
+                pass
+
+        self._server = ThreadingHTTPServer(("localhost", 0), Handler)
+        self.port = self._server.server_address[1]
+        # The format expected by `telebot.apihelper.API_URL`.
+        self.api_url = f"http://localhost:{self.port}/bot{{0}}/{{1}}"
+
+    def _handle(self, handler: BaseHTTPRequestHandler) -> tuple[int, dict]:
+        url = urlparse(handler.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        length = int(handler.headers.get("Content-Length") or 0)
+        if length:
+            handler.rfile.read(length)
+        with self._lock:
+            now = time.time()
+            is_429 = self.n_429 > 0 or (
+                self.max_rate is not None
+                and len([r for r in self.requests if r["ts"] > now - 1])
+                >= self.max_rate
+            )
+            if is_429:
+                self.n_429 = max(self.n_429 - 1, 0)
+                self.n_429_sent += 1
+            else:
+                self.requests.append(
+                    dict(method=url.path.rsplit("/", 1)[-1], params=params, ts=now)
+                )
+            self._message_id += 1
+            message_id = self._message_id
+        if is_429:
+            return 429, {
+                "ok": False,
+                "error_code": 429,
+                "description": "Too Many Requests: retry after 1",
+                "parameters": {"retry_after": self.retry_after},
+            }
+        if self.delay:
+            time.sleep(self.delay)
+        if params.get("text") in self.error_texts:
+            return 400, {
+                "ok": False,
+                "error_code": 400,
+                "description": "Bad Request: fake error",
+            }
+        return 200, {
+            "ok": True,
+            "result": {
+                "message_id": message_id,
+                "from": {"id": 1, "is_bot": True, "first_name": "Botte"},
+                "chat": {"id": int(params.get("chat_id", 0)), "type": "private"},
+                "date": int(time.time()),
+                "text": params.get("text"),
+            },
+        }
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def fake_telegram_server(monkeypatch) -> Iterator[FakeTelegramServer]:
+    """
+    Route all Telegram requests to a local stand-in server. Mark the test with
+     `novcr`, as there are no HTTP interactions to record.
+    Example in tests/domain/test_telegram_sender.py.
+    """
+    from telebot import apihelper
+
+    server = FakeTelegramServer()
+    server.start()
+    monkeypatch.setattr(apihelper, "API_URL", server.api_url)
+    with mock.patch(
+        "settings_utils.get_string_from_env_or_aws_parameter_store",
+        return_value="123:FAKE",
+    ):
+        yield server
+    server.stop()
+
+
+class FakeDynamodbClient:
+    """
+    A stand-in for the low-level Boto3 DynamoDB client, to be used via the fixture
+     `fake_dynamodb_client`. It stores the items in memory, by (PK, SK).
+    """
+
+    class exceptions:  # noqa: N801
+        class TransactionCanceledException(Exception):
+            def __init__(self, reasons: list[dict]):
+                super().__init__("Transaction cancelled")
+                self.response = {"CancellationReasons": reasons}
+
+    def __init__(self):
+        self.items: dict[tuple[str, str], dict] = {}
+        # Num of requests, by operation name.
+        self.n_requests: dict[str, int] = defaultdict(int)
+
+    @staticmethod
+    def _get_key(item: dict) -> tuple[str, str]:
+        return item["PK"]["S"], item["SK"]["S"]
+
+    def put_item(self, TableName: str, Item: dict):  # noqa: N803
+        self.n_requests["put_item"] += 1
+        self.items[self._get_key(Item)] = Item
+        return {}
+
+    def batch_write_item(self, RequestItems: dict):  # noqa: N803
+        self.n_requests["batch_write_item"] += 1
+        for requests in RequestItems.values():
+            for request in requests:
+                if "PutRequest" in request:
+                    item = request["PutRequest"]["Item"]
+                    self.items[self._get_key(item)] = item
+                else:
+                    key = request["DeleteRequest"]["Key"]
+                    self.items.pop(self._get_key(key), None)
+        return {"UnprocessedItems": {}}
+
+    def transact_write_items(self, TransactItems: list[dict]):  # noqa: N803
+        # Only conditional puts with `attribute_not_exists(PK)`.
+        self.n_requests["transact_write_items"] += 1
+        reasons = [
+            {"Code": "ConditionalCheckFailed"}
+            if self._get_key(x["Put"]["Item"]) in self.items
+            else {"Code": "None"}
+            for x in TransactItems
+        ]
+        if any(x["Code"] != "None" for x in reasons):
+            raise self.exceptions.TransactionCanceledException(reasons)
+        for x in TransactItems:
+            self.items[self._get_key(x["Put"]["Item"])] = x["Put"]["Item"]
+        return {}
+
+
+@pytest.fixture
+def fake_dynamodb_client() -> Iterator[FakeDynamodbClient]:
+    """
+    Route all DynamoDB requests to an in-memory stand-in. Mark the test with `novcr`,
+     as there are no HTTP interactions to record.
+    """
+    client = FakeDynamodbClient()
+    with mock.patch("botte_be.domain.dynamodb_client._client", client):
+        yield client
+
+
 # @pytest.fixture(autouse=True, scope="function")
 # def mock_aws_credentials(monkeypatch, request):
 #     """
@@ -0,0 +1,134 @@
+import time
+from datetime import timedelta
+
+import botte_dynamodb_tasks
+import datetime_utils
+import pytest
+from ksuid import KsuidMs
+
+from botte_be.domain import dynamodb_task_sender, send_deadline
+
+
+def _make_task(text: str, i: int, **kwargs):
+    return botte_dynamodb_tasks.BotteMessageDynamodbTask(
+        text=text,
+        sender_app="BOTTE_BE_PYTEST",
+        ksuid=KsuidMs(datetime_utils.now_utc() + timedelta(seconds=i)),
+        **kwargs,
+    )
+
+
+@pytest.mark.novcr
+class TestSendTasks:
+    def test_group_tasks_by_pk(self):
+        t1 = _make_task("1", 1, do_process_task_fifo=True)
+        t2 = _make_task("2", 2)
+        t3 = _make_task("3", 3, do_process_task_fifo=True, fifo_group_id="G1")
+        t4 = _make_task("4", 4, do_process_task_fifo=True)
+        t5 = _make_task("5", 5, do_process_task_fifo=True, fifo_group_id="G1")
+        groups = dynamodb_task_sender.group_tasks_by_pk(
+            {t.text: t for t in (t5, t4, t3, t2, t1)}
+        )
+        assert sorted([[t.text for _, t in g] for g in groups]) == [
+            ["1", "4"],
+            ["2"],
+            ["3", "5"],
+        ]
+
+    def test_fifo_order_within_pk(self, fake_telegram_server):
+        tasks = [
+            _make_task(f"G1 {i}", i, do_process_task_fifo=True, fifo_group_id="G1")
+            for i in range(5)
+        ]
+        tasks += [
+            _make_task(f"FIFO {i}", i, do_process_task_fifo=True) for i in range(5)
+        ]
+        tasks += [_make_task(f"NO FIFO {i}", i) for i in range(5)]
+        # Reverse, so sorting by KSUID is required.
+        dynamodb_task_sender.send_tasks({str(t.ksuid): t for t in reversed(tasks)})
+
+        texts = [r["params"]["text"] for r in fake_telegram_server.requests]
+        assert len(texts) == 15
+        assert [x for x in texts if x.startswith("G1")] == [f"G1 {i}" for i in range(5)]
+        assert [x for x in texts if x.startswith("FIFO")] == [
+            f"FIFO {i}" for i in range(5)
+        ]
+
+    def test_distinct_pks_sent_concurrently(self, fake_telegram_server):
+        fake_telegram_server.delay = 0.2
+        tasks = [_make_task(f"Hello world {i}", i) for i in range(5)]
+
+        start = time.perf_counter()
+        dynamodb_task_sender.send_tasks({str(t.ksuid): t for t in tasks})
+        elapsed = time.perf_counter() - start
+
+        assert len(fake_telegram_server.requests) == 5
+        # Sequentially it would take 5 * 0.2 = 1 sec.
+        assert elapsed < 0.5
+
+    def test_same_pk_sent_sequentially(self, fake_telegram_server):
+        fake_telegram_server.delay = 0.1
+        tasks = [
+            _make_task(f"Hello {i}", i, do_process_task_fifo=True) for i in range(3)
+        ]
+
+        start = time.perf_counter()
+        dynamodb_task_sender.send_tasks({str(t.ksuid): t for t in tasks})
+        elapsed = time.perf_counter() - start
+
+        assert elapsed >= 0.3
+
+    def test_failed_send(self, fake_telegram_server):
+        fake_telegram_server.error_texts = {"FIFO 1", "NO FIFO 1"}
+        tasks = [
+            _make_task(f"FIFO {i}", i, do_process_task_fifo=True) for i in range(4)
+        ]
+        tasks += [_make_task(f"NO FIFO {i}", i) for i in range(3)]
+        tasks_by_id = {task.text: task for task in tasks}
+
+        failed_ids = dynamodb_task_sender.send_tasks(tasks_by_id)
+
+        # In the FIFO group, the tasks after the failed one are not sent.
+        assert sorted(failed_ids) == ["FIFO 1", "FIFO 2", "FIFO 3", "NO FIFO 1"]
+        texts = sorted(r["params"]["text"] for r in fake_telegram_server.requests)
+        assert texts == ["FIFO 0", "FIFO 1", "NO FIFO 0", "NO FIFO 1", "NO FIFO 2"]
+
+    def test_deadline(self, fake_telegram_server):
+        fake_telegram_server.delay = 0.2
+        latency_stats = send_deadline.SendLatencyStats()
+        latency_stats.record(0.2)
+        deadline = send_deadline.SendDeadline(
+            0.5, latency_stats, safety_margin_seconds=0
+        )
+        tasks = [
+            _make_task(f"FIFO {i}", i, do_process_task_fifo=True) for i in range(5)
+        ]
+        tasks_by_id = {task.text: task for task in tasks}
+
+        failed_ids = dynamodb_task_sender.send_tasks(tasks_by_id, deadline=deadline)
+
+        # Only 2 sends fit in the time left, the others are reported as not sent.
+        assert failed_ids == ["FIFO 2", "FIFO 3", "FIFO 4"]
+        texts = [r["params"]["text"] for r in fake_telegram_server.requests]
+        assert texts == ["FIFO 0", "FIFO 1"]
+
+    def test_send_task_stream(self, fake_telegram_server):
+        tasks = [
+            _make_task(f"FIFO {i}", i, do_process_task_fifo=True) for i in range(3)
+        ]
+        n_sent_while_reading = []
+
+        def iter_tasks():
+            for task in tasks:
+                yield task.text, task
+                # Slow reading, like parsing a large batch.
+                time.sleep(0.1)
+                n_sent_while_reading.append(len(fake_telegram_server.requests))
+
+        failed_ids = dynamodb_task_sender.send_task_stream(iter_tasks())
+
+        assert failed_ids == []
+        # The first task is sent before the next ones are read.
+        assert n_sent_while_reading[0] >= 1
+        texts = [r["params"]["text"] for r in fake_telegram_server.requests]
+        assert texts == ["FIFO 0", "FIFO 1", "FIFO 2"]
@@ -0,0 +1,60 @@
+import time
+
+import pytest
+
+from botte_be.domain import message_batch_sender, send_deadline
+
+
+@pytest.mark.novcr
+class TestSendMessages:
+    def test_in_order(self, fake_telegram_server):
+        texts = [f"Hello {i}" for i in range(5)]
+        results = message_batch_sender.send_messages(texts)
+        assert [x["status_code"] for x in results] == [200] * 5
+        assert [x["message"]["text"] for x in results] == texts
+        assert [x["params"]["text"] for x in fake_telegram_server.requests] == texts
+
+    def test_parallel(self, fake_telegram_server):
+        fake_telegram_server.delay = 0.2
+        texts = [f"Hello {i}" for i in range(5)]
+        start = time.perf_counter()
+        results = message_batch_sender.send_messages(texts, do_send_in_order=False)
+        assert time.perf_counter() - start < 0.5
+        # Results are in the same order as the texts.
+        assert [x["message"]["text"] for x in results] == texts
+
+    def test_failed_message(self, fake_telegram_server):
+        fake_telegram_server.error_texts = {"Hello 1"}
+        results = message_batch_sender.send_messages(["Hello 0", "Hello 1", "Hello 2"])
+        assert [x["status_code"] for x in results] == [200, 400, 200]
+        assert results[1]["error"] == "Bad Request: fake error"
+
+    def test_deadline(self, fake_telegram_server):
+        latency_stats = send_deadline.SendLatencyStats()
+        latency_stats.record(1.0)
+        deadline = send_deadline.SendDeadline(
+            0.5, latency_stats, safety_margin_seconds=0
+        )
+        results = message_batch_sender.send_messages(
+            ["Hello 0", "Hello 1"], deadline=deadline
+        )
+        assert [x["status_code"] for x in results] == [504, 504]
+        assert fake_telegram_server.requests == []
+
+
+class TestValidateMessages:
+    def test_valid(self):
+        assert message_batch_sender.validate_messages(
+            [{"text": "Hello 1"}, {"text": "Hello 2"}], max_messages=2
+        ) == ["Hello 1", "Hello 2"]
+
+    def test_invalid(self):
+        for messages in (
+            [],
+            "Hello",
+            [{"text": "Hello 1"}, {"text": "Hello 2"}, {"text": "Hello 3"}],
+            [{"text": ""}],
+            [{"text": 1}],
+            ["Hello"],
+        ):
+            assert message_batch_sender.validate_messages(messages, 2) is None
@@ -0,0 +1,35 @@
+from botte_be.domain import message_chunker
+
+
+class TestSplitText:
+    def test_short_text(self):
+        assert message_chunker.split_text("Hello world", max_length=20) == [
+            "Hello world"
+        ]
+
+    def test_split_on_line_boundaries(self):
+        text = "\n".join(f"Line {i}" for i in range(10))
+        chunks = message_chunker.split_text(text, max_length=20)
+        assert chunks == [
+            "Line 0\nLine 1",
+            "Line 2\nLine 3",
+            "Line 4\nLine 5",
+            "Line 6\nLine 7",
+            "Line 8\nLine 9",
+        ]
+        assert "\n".join(chunks) == text
+
+    def test_long_line(self):
+        chunks = message_chunker.split_text("x" * 25 + "\nHello", max_length=10)
+        assert chunks == ["x" * 10, "x" * 10, "x" * 5, "Hello"]
+
+    def test_utf16_length(self):
+        # Telegram counts an emoji as 2 chars.
+        assert message_chunker.get_length("😀") == 2
+        chunks = message_chunker.split_text("😀" * 15, max_length=10)
+        assert chunks == ["😀" * 5, "😀" * 5, "😀" * 5]
+
+    def test_blank_chunks_skipped(self):
+        text = "Hello\n" + "\n" * 30 + "World"
+        chunks = message_chunker.split_text(text, max_length=10)
+        assert chunks == ["Hello", "World"]
@@ -0,0 +1,69 @@
+import time
+
+import pytest
+
+from botte_be.domain import send_deadline
+
+
+class _FakeContext:
+    def __init__(self, remaining_ms: int):
+        self.remaining_ms = remaining_ms
+
+    def get_remaining_time_in_millis(self) -> int:
+        return self.remaining_ms
+
+
+class TestSendLatencyStats:
+    def test_p99(self):
+        stats = send_deadline.SendLatencyStats(window_size=200)
+        for i in range(1, 201):
+            stats.record(i / 100)
+        assert stats.p99 == 1.98
+
+    def test_rolling_window(self):
+        stats = send_deadline.SendLatencyStats(window_size=2)
+        for latency in (5.0, 0.1, 0.2):
+            stats.record(latency)
+        assert stats.p99 == 0.2
+
+    def test_no_sends(self, monkeypatch):
+        monkeypatch.setattr(send_deadline.settings, "DEFAULT_SEND_LATENCY_SECONDS", 3.0)
+        assert send_deadline.SendLatencyStats().p99 == 3.0
+
+
+class TestSendDeadline:
+    def setup_method(self):
+        self.latency_stats = send_deadline.SendLatencyStats()
+        self.latency_stats.record(0.1)
+
+    def test_has_time_for_send(self):
+        deadline = send_deadline.SendDeadline(
+            0.3, self.latency_stats, safety_margin_seconds=0.1
+        )
+        assert deadline.has_time_for_send()
+        time.sleep(0.15)
+        assert not deadline.has_time_for_send()
+
+    def test_from_context(self):
+        deadline = send_deadline.SendDeadline.from_context(
+            _FakeContext(10_000), self.latency_stats
+        )
+        assert 8 < deadline.remaining_seconds <= 10
+
+    def test_from_context_no_remaining_time(self):
+        assert (
+            send_deadline.SendDeadline.from_context(_FakeContext(0), self.latency_stats)
+            is None
+        )
+        assert (
+            send_deadline.SendDeadline.from_context(object(), self.latency_stats)
+            is None
+        )
+
+    def test_check(self):
+        deadline = send_deadline.SendDeadline(
+            1, self.latency_stats, safety_margin_seconds=0
+        )
+        assert 0.5 < deadline.check(0.5) <= 1
+        with pytest.raises(send_deadline.DeadlineExceeded):
+            deadline.check(5)
@@ -0,0 +1,132 @@
+from datetime import timedelta
+
+import botte_dynamodb_tasks
+import datetime_utils
+import pytest
+from ksuid import KsuidMs
+
+from botte_be.conf import settings_module
+from botte_be.domain import stale_task_policy
+
+
+def _make_task(text: str, age_secs: float, **kwargs):
+    return botte_dynamodb_tasks.BotteMessageDynamodbTask(
+        text=text,
+        sender_app="BOTTE_BE_PYTEST",
+        ksuid=KsuidMs(datetime_utils.now_utc() - timedelta(seconds=age_secs)),
+        **kwargs,
+    )
+
+
+@pytest.fixture(autouse=True)
+def enable_policy(monkeypatch):
+    monkeypatch.setattr(settings_module.test_settings, "DO_DROP_EXPIRED_TASKS", True)
+    monkeypatch.setattr(settings_module.test_settings, "STALE_TASK_AGE_SECONDS", 60)
+
+
+class TestStaleTaskPolicy:
+    def test_fresh_tasks(self):
+        tasks_by_id = {f"id{i}": _make_task(f"Hello {i}", i) for i in range(3)}
+        policy = stale_task_policy.StaleTaskPolicy()
+        tasks = dict(policy.filter_tasks(tasks_by_id.items()))
+        assert tasks == tasks_by_id
+        assert policy.expired_ids == []
+        assert policy.n_merged == 0
+
+    def test_expired_tasks(self):
+        # The default expiration is 1 hour after the KSUID ts.
+        tasks_by_id = {
+            "expired": _make_task("Expired", 2 * 60 * 60),
+            "fresh": _make_task("Fresh", 0),
+        }
+        policy = stale_task_policy.StaleTaskPolicy()
+        tasks = dict(policy.filter_tasks(tasks_by_id.items()))
+        assert list(tasks) == ["fresh"]
+        assert policy.expired_ids == ["expired"]
+
+    def test_stale_tasks_merged_per_pk(self):
+        tasks_by_id = {
+            "fifo1": _make_task("FIFO 1", 200, do_process_task_fifo=True),
+            "fifo0": _make_task("FIFO 0", 300, do_process_task_fifo=True),
+            "fifo2": _make_task("FIFO 2", 0, do_process_task_fifo=True),
+            "g1": _make_task("G1", 300, do_process_task_fifo=True, fifo_group_id="G1"),
+            "nofifo0": _make_task("NO FIFO 0", 400),
+            "nofifo1": _make_task("NO FIFO 1", 100),
+        }
+        policy = stale_task_policy.StaleTaskPolicy()
+        tasks = dict(policy.filter_tasks(tasks_by_id.items()))
+
+        # The digest id is the id of the oldest task merged.
+        assert policy.merged_ids_by_digest_id == {
+            "fifo0": ["fifo0", "fifo1"],
+            "nofifo0": ["nofifo0", "nofifo1"],
+        }
+        assert policy.n_merged == 4
+        assert sorted(tasks) == ["fifo0", "fifo2", "g1", "nofifo0"]
+        # A single stale task in its PK is not merged.
+        assert tasks["g1"] is tasks_by_id["g1"]
+
+        digest = tasks["fifo0"]
+        assert digest.text.startswith("2 delayed messages:\n")
+        assert digest.text.index("FIFO 0") < digest.text.index("FIFO 1")
+        assert digest.sender_app == stale_task_policy.DIGEST_SENDER_APP
+        # Same PK and KSUID as the oldest task, so the FIFO order is preserved.
+        assert digest.pk == tasks_by_id["fifo0"].pk
+        assert digest.ksuid == tasks_by_id["fifo0"].ksuid
+
+    def test_stale_fifo_and_not_fifo_tasks_not_merged_together(self):
+        # A FIFO task with no group has PK "BOTTE_MESSAGE".
+        tasks_by_id = {
+            "nofifo0": _make_task("NO FIFO 0", 400),
+            "fifo0": _make_task("FIFO 0", 300, do_process_task_fifo=True),
+            "nofifo1": _make_task("NO FIFO 1", 200),
+            "fifo1": _make_task("FIFO 1", 100, do_process_task_fifo=True),
+        }
+        policy = stale_task_policy.StaleTaskPolicy()
+        tasks = dict(policy.filter_tasks(tasks_by_id.items()))
+
+        assert policy.merged_ids_by_digest_id == {
+            "nofifo0": ["nofifo0", "nofifo1"],
+            "fifo0": ["fifo0", "fifo1"],
+        }
+        assert tasks["fifo0"].do_process_task_fifo is True
+        assert tasks["fifo0"].pk == botte_dynamodb_tasks.BOTTE_MESSAGE_TASK_ID
+        assert tasks["nofifo0"].do_process_task_fifo is False
+
+    def test_digest_before_fresh_task_with_same_pk(self):
+        tasks_by_id = {
+            "stale0": _make_task("Stale 0", 300, do_process_task_fifo=True),
+            "stale1": _make_task("Stale 1", 200, do_process_task_fifo=True),
+            "fresh0": _make_task("Fresh 0", 1, do_process_task_fifo=True),
+            "fresh1": _make_task("Fresh 1", 0, do_process_task_fifo=True),
+        }
+        policy = stale_task_policy.StaleTaskPolicy()
+        id_and_tasks = policy.filter_tasks(tasks_by_id.items())
+        # Lazy: the digest is yielded as soon as the first fresh task is read.
+        digest_id, digest = next(id_and_tasks)
+        assert digest_id == "stale0"
+        assert digest.text.startswith("2 delayed messages:")
+        assert [task_id for task_id, _ in id_and_tasks] == ["fresh0", "fresh1"]
+
+    def test_expand_ids(self):
+        tasks_by_id = {f"id{i}": _make_task(f"Hello {i}", 300 - i) for i in range(3)}
+        tasks_by_id["fresh"] = _make_task("Fresh", 0)
+        policy = stale_task_policy.StaleTaskPolicy()
+        list(policy.filter_tasks(tasks_by_id.items()))
+        assert policy.expand_ids(["id0", "fresh"]) == ["id0", "id1", "id2", "fresh"]
+
+    def test_disabled(self, monkeypatch):
+        monkeypatch.setattr(
+            settings_module.test_settings, "DO_DROP_EXPIRED_TASKS", False
+        )
+        monkeypatch.setattr(
+            settings_module.test_settings, "STALE_TASK_AGE_SECONDS", None
+        )
+        tasks_by_id = {
+            "expired": _make_task("Expired", 2 * 60 * 60),
+            "stale0": _make_task("Stale 0", 300),
+            "stale1": _make_task("Stale 1", 200),
+        }
+        policy = stale_task_policy.StaleTaskPolicy()
+        tasks = dict(policy.filter_tasks(tasks_by_id.items()))
+        assert tasks == tasks_by_id
@@ -0,0 +1,116 @@
+from datetime import timedelta
+
+import botte_dynamodb_tasks
+import datetime_utils
+import pytest
+from ksuid import KsuidMs
+
+from botte_be.domain import task_deduplicator
+
+
+def _make_task(text: str, i: int):
+    return botte_dynamodb_tasks.BotteMessageDynamodbTask(
+        text=text,
+        sender_app="BOTTE_BE_PYTEST",
+        ksuid=KsuidMs(datetime_utils.now_utc() + timedelta(seconds=i)),
+    )
+
+
+@pytest.fixture(autouse=True)
+def clear_lru():
+    task_deduplicator._claimed_sks.clear()
+    yield
+    task_deduplicator._claimed_sks.clear()
+
+
+@pytest.mark.novcr
+class TestClaimTasks:
+    def test_happy_flow(self, fake_dynamodb_client):
+        tasks = {f"id{i}": _make_task(f"Hello {i}", i) for i in range(3)}
+        new_tasks, duplicate_ids = task_deduplicator.claim_tasks(tasks)
+        assert new_tasks == tasks
+        assert duplicate_ids == []
+        # A single round trip for the whole batch.
+        assert fake_dynamodb_client.n_requests == {"transact_write_items": 1}
+        assert len(fake_dynamodb_client.items) == 3
+
+    def test_redelivery_warm(self, fake_dynamodb_client):
+        tasks = {f"id{i}": _make_task(f"Hello {i}", i) for i in range(3)}
+        task_deduplicator.claim_tasks(tasks)
+        new_tasks, duplicate_ids = task_deduplicator.claim_tasks(tasks)
+        assert new_tasks == {}
+        assert sorted(duplicate_ids) == ["id0", "id1", "id2"]
+        # The LRU hit: no more round trips.
+        assert fake_dynamodb_client.n_requests == {"transact_write_items": 1}
+
+    def test_redelivery_other_container(self, fake_dynamodb_client):
+        tasks = {f"id{i}": _make_task(f"Hello {i}", i) for i in range(3)}
+        task_deduplicator.claim_tasks({"id0": tasks["id0"]})
+        # Like another container: empty LRU.
+        task_deduplicator._claimed_sks.clear()
+        new_tasks, duplicate_ids = task_deduplicator.claim_tasks(tasks)
+        assert list(new_tasks) == ["id1", "id2"]
+        assert duplicate_ids == ["id0"]
+        # Retried without the existing marker.
+        assert fake_dynamodb_client.n_requests == {"transact_write_items": 3}
+
+    def test_duplicate_in_batch(self, fake_dynamodb_client):
+        task = _make_task("Hello", 0)
+        new_tasks, duplicate_ids = task_deduplicator.claim_tasks(
+            {"id0": task, "id1": task}
+        )
+        assert list(new_tasks) == ["id0"]
+        assert duplicate_ids == ["id1"]
+
+    def test_release(self, fake_dynamodb_client):
+        task = _make_task("Hello", 0)
+        task_deduplicator.claim_tasks({"id0": task})
+        task_deduplicator.release_sks([task.sk])
+        assert fake_dynamodb_client.items == {}
+        new_tasks, _ = task_deduplicator.claim_tasks({"id0": task})
+        assert list(new_tasks) == ["id0"]
+
+    def test_dynamodb_error(self, fake_dynamodb_client):
+        def raise_error(**kwargs):
+            raise ValueError("boom")
+
+        fake_dynamodb_client.transact_write_items = raise_error
+        tasks = {"id0": _make_task("Hello", 0)}
+        # Not fatal: the tasks are sent anyway.
+        new_tasks, duplicate_ids = task_deduplicator.claim_tasks(tasks)
+        assert new_tasks == tasks
+        assert duplicate_ids == []
+
+    def test_iter_claim_tasks(self, fake_dynamodb_client):
+        tasks = {f"id{i}": _make_task(f"Hello {i}", i) for i in range(250)}
+        # Duplicates of an already claimed task.
+        task_deduplicator.claim_tasks({"id0": tasks["id0"]})
+        fake_dynamodb_client.n_requests.clear()
+        id_and_tasks = list(tasks.items()) + [("dup", tasks["id1"])]
+
+        claimed = list(task_deduplicator.iter_claim_tasks(id_and_tasks))
+
+        assert [task_id for task_id, _ in claimed] == [f"id{i}" for i in range(1, 250)]
+        # One round trip per chunk, the chunk size doubling from 4 up to 100:
+        #  [id0...id3], [id4...id11], ..., [id124...id223], [id224...id249, dup].
+        #  The LRU hits cost no round trip.
+        assert fake_dynamodb_client.n_requests == {"transact_write_items": 7}
+
+    def test_iter_claim_tasks_lazy(self, fake_dynamodb_client):
+        tasks = {f"id{i}": _make_task(f"Hello {i}", i) for i in range(150)}
+        read_ids = []
+
+        def iter_tasks():
+            for task_id, task in tasks.items():
+                read_ids.append(task_id)
+                yield task_id, task
+
+        claimed = task_deduplicator.iter_claim_tasks(iter_tasks())
+
+        # Only the 1st (small) chunk is read and claimed before its tasks are yielded.
+        assert next(claimed)[0] == "id0"
+        assert len(read_ids) == task_deduplicator.ITER_CLAIM_FIRST_CHUNK_SIZE
+        assert fake_dynamodb_client.n_requests == {"transact_write_items": 1}
+        assert len(list(claimed)) == 149
+        # Chunks: 4, 8, 16, 32, 64 and the remaining 26.
+        assert fake_dynamodb_client.n_requests == {"transact_write_items": 6}
@@ -0,0 +1,112 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from botte_be.domain import telegram_sender
+from botte_be.domain.telegram_rate_limiter import (
+    RetryAfterTooLong,
+    TelegramRateLimiter,
+    TokenBucket,
+)
+
+
+class TestTokenBucket:
+    def test_burst_then_rate(self):
+        bucket = TokenBucket(rate=10, capacity=3)
+        assert [bucket.reserve() for _ in range(3)] == [0, 0, 0]
+        assert bucket.reserve() == pytest.approx(0.1, abs=0.01)
+        # The token is reserved, so the next caller waits longer.
+        assert bucket.reserve() == pytest.approx(0.2, abs=0.01)
+
+
+class TestTelegramRateLimiter:
+    def test_chat_limit(self):
+        limiter = TelegramRateLimiter(global_rate=100, chat_rate=10, chat_burst=2)
+        assert limiter.wait("1") == 0
+        assert limiter.wait("1") == 0
+        assert limiter.wait("1") == pytest.approx(0.1, abs=0.02)
+        # Another chat has its own bucket.
+        assert limiter.wait("2") == 0
+        assert limiter.throttled_seconds == pytest.approx(0.1, abs=0.02)
+
+    def test_pause(self):
+        limiter = TelegramRateLimiter(max_retry_after=1)
+        limiter.pause(0.1)
+        assert limiter.wait("1") == pytest.approx(0.1, abs=0.02)
+
+    def test_pause_too_long(self):
+        limiter = TelegramRateLimiter(max_retry_after=1)
+        with pytest.raises(RetryAfterTooLong):
+            limiter.pause(2)
+
+
+@pytest.mark.novcr
+class TestSendWithRateLimiter:
+    def test_429_retry_after(self, fake_telegram_server):
+        fake_telegram_server.n_429 = 1
+        fake_telegram_server.retry_after = 1
+        sender = telegram_sender.get_sender()
+
+        message = sender.send_message("Hello world")
+
+        assert message.text == "Hello world"
+        assert fake_telegram_server.n_429_sent == 1
+        assert sender.throttled_seconds == pytest.approx(1, abs=0.1)
+
+    def test_429_retry_after_too_long(self, fake_telegram_server):
+        fake_telegram_server.n_429 = 1
+        fake_telegram_server.retry_after = 60
+        with pytest.raises(RetryAfterTooLong):
+            telegram_sender.get_sender().send_message("Hello world")
+        assert len(fake_telegram_server.requests) == 0
+
+    @pytest.mark.slow
+    def test_benchmark(self, fake_telegram_server, monkeypatch):
+        """
+        Benchmark: send a burst of messages, from 10 threads, to a fake Telegram that
+         responds 429 to more than 20 msgs per sec, with and without the rate limiter.
+        Run it with:
+        $ pytest -s -m slow tests/domain/test_telegram_rate_limiter.py
+        """
+        fake_telegram_server.max_rate = 20
+        sender = telegram_sender.get_sender()
+        n_messages = 60
+
+        def send_burst() -> float:
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=10) as executor:
+                list(
+                    executor.map(
+                        lambda i: sender.send_message(f"Hello {i}"), range(n_messages)
+                    )
+                )
+            return time.perf_counter() - start
+
+        # No rate limiter: only the 429 handling.
+        monkeypatch.setattr(
+            sender,
+            "rate_limiter",
+            TelegramRateLimiter(
+                global_rate=10_000, chat_rate=10_000, chat_burst=10_000
+            ),
+        )
+        elapsed_no_limiter = send_burst()
+        n_429_no_limiter = fake_telegram_server.n_429_sent
+        time.sleep(1)
+
+        fake_telegram_server.n_429_sent = 0
+        monkeypatch.setattr(
+            sender,
+            "rate_limiter",
+            TelegramRateLimiter(global_rate=30, chat_rate=18, chat_burst=1),
+        )
+        elapsed_limiter = send_burst()
+        n_429_limiter = fake_telegram_server.n_429_sent
+
+        print(
+            f"\nNo rate limiter: {elapsed_no_limiter:.2f} sec, {n_429_no_limiter} 429s"
+            f"\nRate limiter: {elapsed_limiter:.2f} sec, {n_429_limiter} 429s,"
+            f" {sender.throttled_seconds:.2f} sec throttled"
+        )
+        assert n_429_limiter < n_429_no_limiter
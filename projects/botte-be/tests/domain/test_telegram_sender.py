@@ -0,0 +1,150 @@
+import time
+
+import pytest
+import requests
+from aws_utils.aws_testfactories.lambda_context_factory import LambdaContextFactory
+
+from botte_be.conf import settings
+from botte_be.domain import send_deadline, telegram_sender
+from botte_be.views import message_view
+
+
+@pytest.mark.novcr
+class TestTelegramSender:
+    def test_send_message(self, fake_telegram_server):
+        sender = telegram_sender.get_sender()
+        message = sender.send_message("Hello world from botte-be pytests!")
+        assert message.text == "Hello world from botte-be pytests!"
+        assert message.chat.id == int(settings.PUNTONIM_CHAT_ID)
+        assert fake_telegram_server.requests[0]["method"] == "sendMessage"
+
+    def test_connection_reused(self, fake_telegram_server):
+        sender = telegram_sender.get_sender()
+        for i in range(5):
+            sender.send_message(f"Hello world {i}")
+        assert len(fake_telegram_server.requests) == 5
+        assert fake_telegram_server.n_connections == 1
+
+    def test_get_sender_singleton(self):
+        assert telegram_sender.get_sender() is telegram_sender.get_sender()
+
+    def test_warm_invocations_reuse_connection(self, fake_telegram_server):
+        """
+        The goal is to test that subsequent invocations of a Lambda (warm starts)
+         re-use the connection opened by the 1st invocation.
+        """
+        context = LambdaContextFactory().make()
+        for i in range(3):
+            response = message_view.lambda_handler(
+                dict(text=f"Hello world {i}", sender_app="BOTTE_BE_PYTESTS"), context
+            )
+            assert response["statusCode"] == 200
+        assert len(fake_telegram_server.requests) == 3
+        assert fake_telegram_server.n_connections == 1
+
+    def test_long_text_split(self, fake_telegram_server, monkeypatch):
+        monkeypatch.setattr(settings, "TELEGRAM_MAX_MESSAGE_LENGTH", 20)
+        sender = telegram_sender.get_sender()
+        text = "\n".join(f"Line {i}" for i in range(6))
+        message = sender.send_message(text)
+        # The first chunk is returned.
+        assert message.text == "Line 0\nLine 1"
+        assert [r["params"]["text"] for r in fake_telegram_server.requests] == [
+            "Line 0\nLine 1",
+            "Line 2\nLine 3",
+            "Line 4\nLine 5",
+        ]
+        # Over the same connection.
+        assert fake_telegram_server.n_connections == 1
+
+    def test_very_long_text_as_document(self, fake_telegram_server, monkeypatch):
+        monkeypatch.setattr(settings, "TELEGRAM_DOCUMENT_MIN_LENGTH", 50)
+        sender = telegram_sender.get_sender()
+        sender.send_message("Report\n" + "x" * 100)
+        (request,) = fake_telegram_server.requests
+        assert request["method"] == "sendDocument"
+        # Not truncated: no ellipsis.
+        assert request["params"]["caption"] == "Report"
+
+    def test_very_long_text_as_document_long_first_line(
+        self, fake_telegram_server, monkeypatch
+    ):
+        monkeypatch.setattr(settings, "TELEGRAM_DOCUMENT_MIN_LENGTH", 50)
+        monkeypatch.setattr(telegram_sender, "DOCUMENT_CAPTION_MAX_LENGTH", 10)
+        sender = telegram_sender.get_sender()
+        sender.send_message("Report " + "x" * 100)
+        (request,) = fake_telegram_server.requests
+        assert request["params"]["caption"] == "Report xx…"
+
+    def test_long_text_chunks_sent_in_order(self, fake_telegram_server, monkeypatch):
+        """
+        The chunks are sent sequentially: each one after the response to the previous
+         one, so Telegram receives them in order.
+        """
+        monkeypatch.setattr(settings, "TELEGRAM_MAX_MESSAGE_LENGTH", 20)
+        fake_telegram_server.delay = 0.1
+        sender = telegram_sender.get_sender()
+        sender.send_message("\n".join(f"Line {i}" for i in range(6)))
+        requests_ = fake_telegram_server.requests
+        assert [r["params"]["text"] for r in requests_] == [
+            "Line 0\nLine 1",
+            "Line 2\nLine 3",
+            "Line 4\nLine 5",
+        ]
+        for previous, request in zip(requests_, requests_[1:], strict=False):
+            assert request["ts"] - previous["ts"] >= 0.1
+
+    def test_long_text_chunk_failed(self, fake_telegram_server, monkeypatch):
+        monkeypatch.setattr(settings, "TELEGRAM_MAX_MESSAGE_LENGTH", 20)
+        fake_telegram_server.error_texts = {"Line 2\nLine 3"}
+        sender = telegram_sender.get_sender()
+        with pytest.raises(telegram_sender.ChunkSendError) as exc_info:
+            sender.send_message("\n".join(f"Line {i}" for i in range(6)))
+        assert exc_info.value.chunk_index == 1
+        assert exc_info.value.n_chunks == 3
+        # The 2nd chunk failed, so the 3rd one was not sent.
+        assert [r["params"]["text"] for r in fake_telegram_server.requests] == [
+            "Line 0\nLine 1",
+            "Line 2\nLine 3",
+        ]
+
+
+@pytest.mark.novcr
+class TestTelegramSenderDeadline:
+    def _make_deadline(self, remaining_seconds: float) -> send_deadline.SendDeadline:
+        return send_deadline.SendDeadline(
+            remaining_seconds,
+            send_deadline.SendLatencyStats(),
+            safety_margin_seconds=0,
+        )
+
+    def test_send_message(self, fake_telegram_server):
+        sender = telegram_sender.get_sender()
+        message = sender.send_message("Hello", deadline=self._make_deadline(10))
+        assert message.text == "Hello"
+
+    def test_deadline_passed(self, fake_telegram_server):
+        sender = telegram_sender.get_sender()
+        with pytest.raises(send_deadline.DeadlineExceeded):
+            sender.send_message("Hello", deadline=self._make_deadline(0))
+        assert fake_telegram_server.requests == []
+
+    def test_429_retry_after_past_deadline(self, fake_telegram_server):
+        fake_telegram_server.n_429 = 1
+        fake_telegram_server.retry_after = 5
+        sender = telegram_sender.get_sender()
+        start = time.monotonic()
+        with pytest.raises(send_deadline.DeadlineExceeded):
+            sender.send_message("Hello", deadline=self._make_deadline(2))
+        # Not waited for the retry_after.
+        assert time.monotonic() - start < 1
+        assert fake_telegram_server.n_429_sent == 1
+        assert fake_telegram_server.requests == []
+
+    def test_request_timeout_at_deadline(self, fake_telegram_server):
+        fake_telegram_server.delay = 1
+        sender = telegram_sender.get_sender()
+        start = time.monotonic()
+        with pytest.raises(requests.exceptions.Timeout):
+            sender.send_message("Hello", deadline=self._make_deadline(0.2))
+        assert time.monotonic() - start < 0.8
@@ -1,3 +1,6 @@
+import copy
+from unittest import mock
+
 import botte_dynamodb_tasks
 import pytest
 from aws_utils.aws_testfactories.dynamodb_event_to_lambda_factory import (
@@ -6,6 +9,8 @@ from aws_utils.aws_testfactories.dynamodb_event_to_lambda_factory import (
 from aws_utils.aws_testfactories.lambda_context_factory import LambdaContextFactory
 from ksuid import KsuidMs
 
+from botte_be.conf import settings_module
+from botte_be.domain import dynamodb_task_sender, task_deduplicator
 from botte_be.views.dynamodb_message_view import lambda_handler
 
 
@@ -28,21 +33,22 @@ class TestDynamodbMessageView:
             "ExpirationTs": {"N": 1698672903},
         }
 
+    def _make_event(self, sequence_number: str = "4444500001357803510521810"):
+        event = DynamodbEventToLambdaFactory.make_for_insert(new_image=self.new_image)
+        event["Records"][0]["dynamodb"]["SequenceNumber"] = sequence_number
+        return event
+
     def test_happy_flow(self):
-        lambda_handler(
-            DynamodbEventToLambdaFactory.make_for_insert(new_image=self.new_image),
-            self.context,
-        )
+        response = lambda_handler(self._make_event(), self.context)
+        assert response == {"batchItemFailures": []}
 
     def test_fifo(self):
         """
         The goal is to test a message sent with the FIFO order option.
         """
         self.new_image["PK"] = {"S": botte_dynamodb_tasks.BOTTE_MESSAGE_TASK_ID}
-        lambda_handler(
-            DynamodbEventToLambdaFactory.make_for_insert(new_image=self.new_image),
-            self.context,
-        )
+        response = lambda_handler(self._make_event(), self.context)
+        assert response == {"batchItemFailures": []}
 
     def test_fifo_group_id(self):
         """
@@ -50,81 +56,179 @@ class TestDynamodbMessageView:
          group id = "G1".
         """
         self.new_image["PK"] = {"S": botte_dynamodb_tasks.BOTTE_MESSAGE_TASK_ID + "#G1"}
-        lambda_handler(
-            DynamodbEventToLambdaFactory.make_for_insert(new_image=self.new_image),
-            self.context,
-        )
+        response = lambda_handler(self._make_event(), self.context)
+        assert response == {"batchItemFailures": []}
 
     def test_invalid_pk(self):
         self.new_image["PK"] = {"S": "XXX"}
-        with pytest.raises(botte_dynamodb_tasks.ValidationError):
-            lambda_handler(
-                DynamodbEventToLambdaFactory.make_for_insert(new_image=self.new_image),
-                self.context,
-            )
+        response = lambda_handler(self._make_event(), self.context)
+        assert response == {
+            "batchItemFailures": [{"itemIdentifier": "4444500001357803510521810"}]
+        }
 
     def test_no_pk(self):
         del self.new_image["PK"]
-        with pytest.raises(botte_dynamodb_tasks.ValidationError):
-            lambda_handler(
-                DynamodbEventToLambdaFactory.make_for_insert(new_image=self.new_image),
-                self.context,
-            )
+        response = lambda_handler(self._make_event(), self.context)
+        assert response == {
+            "batchItemFailures": [{"itemIdentifier": "4444500001357803510521810"}]
+        }
 
     def test_invalid_sk(self):
         self.new_image["SK"] = {"S": "XXX"}
-        with pytest.raises(botte_dynamodb_tasks.ValidationError):
-            lambda_handler(
-                DynamodbEventToLambdaFactory.make_for_insert(new_image=self.new_image),
-                self.context,
-            )
+        response = lambda_handler(self._make_event(), self.context)
+        assert response == {
+            "batchItemFailures": [{"itemIdentifier": "4444500001357803510521810"}]
+        }
 
     def test_no_sk(self):
         del self.new_image["SK"]
-        with pytest.raises(botte_dynamodb_tasks.ValidationError):
-            lambda_handler(
-                DynamodbEventToLambdaFactory.make_for_insert(new_image=self.new_image),
-                self.context,
-            )
+        response = lambda_handler(self._make_event(), self.context)
+        assert response == {
+            "batchItemFailures": [{"itemIdentifier": "4444500001357803510521810"}]
+        }
 
     def test_invalid_task_id(self):
         self.new_image["TaskId"] = {
             "S": botte_dynamodb_tasks.BOTTE_MESSAGE_TASK_ID + "XXX"
         }
-        with pytest.raises(botte_dynamodb_tasks.ValidationError):
-            lambda_handler(
-                DynamodbEventToLambdaFactory.make_for_insert(new_image=self.new_image),
-                self.context,
-            )
+        response = lambda_handler(self._make_event(), self.context)
+        assert response == {
+            "batchItemFailures": [{"itemIdentifier": "4444500001357803510521810"}]
+        }
 
     def test_no_task_id(self):
         del self.new_image["TaskId"]
-        with pytest.raises(botte_dynamodb_tasks.ValidationError):
-            lambda_handler(
-                DynamodbEventToLambdaFactory.make_for_insert(new_image=self.new_image),
-                self.context,
-            )
+        response = lambda_handler(self._make_event(), self.context)
+        assert response == {
+            "batchItemFailures": [{"itemIdentifier": "4444500001357803510521810"}]
+        }
 
     def test_no_text(self):
         del self.new_image["Payload"]["M"]["text"]
-        with pytest.raises(botte_dynamodb_tasks.ValidationError):
-            lambda_handler(
-                DynamodbEventToLambdaFactory.make_for_insert(new_image=self.new_image),
-                self.context,
-            )
+        response = lambda_handler(self._make_event(), self.context)
+        assert response == {
+            "batchItemFailures": [{"itemIdentifier": "4444500001357803510521810"}]
+        }
 
     def test_invalid_expiration_ts(self):
         self.new_image["ExpirationTs"] = {"N": "XXX"}
-        with pytest.raises(botte_dynamodb_tasks.ValidationError):
-            lambda_handler(
-                DynamodbEventToLambdaFactory.make_for_insert(new_image=self.new_image),
-                self.context,
-            )
+        response = lambda_handler(self._make_event(), self.context)
+        assert response == {
+            "batchItemFailures": [{"itemIdentifier": "4444500001357803510521810"}]
+        }
 
     def test_no_expiration_ts(self):
         del self.new_image["ExpirationTs"]
-        with pytest.raises(botte_dynamodb_tasks.ValidationError):
-            lambda_handler(
-                DynamodbEventToLambdaFactory.make_for_insert(new_image=self.new_image),
-                self.context,
-            )
+        response = lambda_handler(self._make_event(), self.context)
+        assert response == {
+            "batchItemFailures": [{"itemIdentifier": "4444500001357803510521810"}]
+        }
+
+    @pytest.mark.novcr
+    def test_partial_batch_failure(self, fake_telegram_server):
+        """
+        The goal is to test that only the failed records are reported, while the
+         other records in the batch are sent.
+        """
+        event = self._make_event(sequence_number="1")
+        fake_telegram_server.error_texts = {"Not sent"}
+        for sequence_number, text in (("2", "Not sent"), ("3", None)):
+            ksuid = KsuidMs()
+            new_image = copy.deepcopy(self.new_image)
+            new_image["PK"] = {
+                "S": botte_dynamodb_tasks.BOTTE_MESSAGE_TASK_ID + f"#{ksuid}"
+            }
+            new_image["SK"] = {"S": str(ksuid)}
+            if text:
+                new_image["Payload"]["M"]["text"] = {"S": text}
+            else:
+                del new_image["Payload"]["M"]["text"]
+            record = DynamodbEventToLambdaFactory.make_for_insert(new_image=new_image)[
+                "Records"
+            ][0]
+            record["dynamodb"]["SequenceNumber"] = sequence_number
+            event["Records"].append(record)
+
+        response = lambda_handler(event, self.context)
+
+        assert sorted(x["itemIdentifier"] for x in response["batchItemFailures"]) == [
+            "2",
+            "3",
+        ]
+        texts = sorted(r["params"]["text"] for r in fake_telegram_server.requests)
+        assert texts == [
+            "Hello world from (botte-monorepo) botte-be pytests!",
+            "Not sent",
+        ]
+
+    @pytest.mark.novcr
+    def test_producer_task_with_prod_policy(self, fake_telegram_server, monkeypatch):
+        """
+        A task built like the producers do (fi. botte-dynamodb-client) must not be
+         dropped as expired by the production staleness policy.
+        """
+        monkeypatch.setattr(
+            settings_module.test_settings, "DO_DROP_EXPIRED_TASKS", True
+        )
+        monkeypatch.setattr(
+            settings_module.test_settings, "STALE_TASK_AGE_SECONDS", 5 * 60
+        )
+        task = botte_dynamodb_tasks.BotteMessageDynamodbTask(
+            text="Hello world from (botte-monorepo) botte-be pytests!",
+            sender_app="BOTTE_BE_PYTEST",
+        )
+        event = DynamodbEventToLambdaFactory.make_for_insert(
+            new_image=task.to_dynamodb_item()
+        )
+
+        response = lambda_handler(event, self.context)
+
+        assert response == {"batchItemFailures": []}
+        assert [r["params"]["text"] for r in fake_telegram_server.requests] == [
+            "Hello world from (botte-monorepo) botte-be pytests!"
+        ]
+
+    @pytest.mark.novcr
+    def test_dedup_release_when_send_raises(
+        self, fake_telegram_server, fake_dynamodb_client, monkeypatch
+    ):
+        """
+        The claims are released when the sends raise, so the tasks are not skipped as
+         duplicates when retried.
+        """
+        monkeypatch.setattr(settings_module.test_settings, "DO_DEDUP_TASKS", True)
+        task_deduplicator._claimed_sks.clear()
+
+        def send_task_stream(id_and_tasks, *args, **kwargs):
+            list(id_and_tasks)
+            raise RuntimeError("Crash")
+
+        with (
+            mock.patch.object(
+                dynamodb_task_sender, "send_task_stream", send_task_stream
+            ),
+            pytest.raises(RuntimeError),
+        ):
+            lambda_handler(self._make_event(), self.context)
+        assert fake_dynamodb_client.items == {}
+
+        # Retried.
+        response = lambda_handler(self._make_event(), self.context)
+        assert response == {"batchItemFailures": []}
+        assert len(fake_telegram_server.requests) == 1
+
+    @pytest.mark.novcr
+    def test_dedup_expired_task_not_claimed(
+        self, fake_telegram_server, fake_dynamodb_client, monkeypatch
+    ):
+        monkeypatch.setattr(settings_module.test_settings, "DO_DEDUP_TASKS", True)
+        monkeypatch.setattr(
+            settings_module.test_settings, "DO_DROP_EXPIRED_TASKS", True
+        )
+        task_deduplicator._claimed_sks.clear()
+
+        response = lambda_handler(self._make_event(), self.context)
+
+        assert response == {"batchItemFailures": []}
+        assert fake_telegram_server.requests == []
+        assert fake_dynamodb_client.n_requests == {}
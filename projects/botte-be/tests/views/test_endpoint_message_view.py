@@ -1,6 +1,9 @@
 import json
+import time
 from unittest import mock
 
+import botocore.exceptions
+import pytest
 from aws_utils.aws_testfactories.api_gateway_event_to_lambda_factory import (
     ApiGatewayV2EventToLambdaFactory,
 )
@@ -8,6 +11,7 @@ from aws_utils.aws_testfactories.lambda_context_factory import (
     LambdaContextFactory,
 )
 
+from botte_be.domain import dynamodb_task_enqueuer
 from botte_be.views.endpoint_message_view import APIGatewayProxyEventV2, lambda_handler
 
 
@@ -28,6 +32,28 @@ class TestEndpointMessageView:
         body = json.loads(response["body"])
         assert body["text"] == self.text
 
+    @pytest.mark.novcr
+    def test_retry_after_past_deadline(self, fake_telegram_server):
+        """
+        A 429 with a Retry-After longer than the time left before the Lambda timeout
+         fails fast with a 504, instead of waiting and timing out.
+        """
+        fake_telegram_server.n_429 = 1
+        fake_telegram_server.retry_after = 5
+        self.context.get_remaining_time_in_millis = lambda: 3000
+        start = time.monotonic()
+        response = lambda_handler(
+            ApiGatewayV2EventToLambdaFactory.make_for_post_request(
+                path="/message",
+                body_dict={"text": self.text},
+            ),
+            self.context,
+        )
+        assert time.monotonic() - start < 1
+        assert response["statusCode"] == 504
+        assert json.loads(response["body"])["error"].startswith("Not sent:")
+        assert fake_telegram_server.requests == []
+
     def test_missing_text(self):
         response = lambda_handler(
             ApiGatewayV2EventToLambdaFactory.make_for_post_request(
@@ -80,3 +106,171 @@ class TestEndpointMessageView:
         body = json.loads(response["body"])
         assert body["text"] == self.text
         assert mock_obj.call_args[0][0]["headers"]["authorization"] == "m**REDACTED**"
+
+
+@pytest.mark.novcr
+class TestEndpointMessagesView:
+    def setup_method(self):
+        self.context = LambdaContextFactory().make()
+
+    def test_happy_flow(self, fake_telegram_server):
+        fake_telegram_server.error_texts = {"Hello 1"}
+        response = lambda_handler(
+            ApiGatewayV2EventToLambdaFactory.make_for_post_request(
+                path="/messages",
+                body_dict=[{"text": f"Hello {i}"} for i in range(3)],
+            ),
+            self.context,
+        )
+        assert response["statusCode"] == 200
+        results = json.loads(response["body"])["results"]
+        assert [x["status_code"] for x in results] == [200, 400, 200]
+        assert results[2]["message"]["text"] == "Hello 2"
+        assert fake_telegram_server.n_connections == 1
+
+    def test_parallel(self, fake_telegram_server):
+        response = lambda_handler(
+            ApiGatewayV2EventToLambdaFactory.make_for_post_request(
+                path="/messages",
+                body_dict={
+                    "messages": [{"text": f"Hello {i}"} for i in range(3)],
+                    "do_send_in_order": False,
+                },
+            ),
+            self.context,
+        )
+        assert response["statusCode"] == 200
+        results = json.loads(response["body"])["results"]
+        assert [x["message"]["text"] for x in results] == [
+            "Hello 0",
+            "Hello 1",
+            "Hello 2",
+        ]
+
+    def test_invalid(self):
+        for body in ([], [{"textXXX": "Hello"}], {"text": "Hello"}):
+            response = lambda_handler(
+                ApiGatewayV2EventToLambdaFactory.make_for_post_request(
+                    path="/messages", body_dict=body
+                ),
+                self.context,
+            )
+            assert response["statusCode"] == 400
+
+
+@pytest.mark.novcr
+class TestEndpointMessageViewEnqueue:
+    def setup_method(self):
+        self.context = LambdaContextFactory().make()
+
+    def test_message(self, fake_telegram_server, fake_dynamodb_client):
+        response = lambda_handler(
+            ApiGatewayV2EventToLambdaFactory.make_for_post_request(
+                path="/message",
+                body_dict={"text": "Hello", "do_enqueue": True},
+            ),
+            self.context,
+        )
+        assert response["statusCode"] == 202
+        body = json.loads(response["body"])
+        items = list(fake_dynamodb_client.items.values())
+        assert [item["SK"]["S"] for item in items] == [body["task_id"]]
+        assert items[0]["Payload"] == {"M": {"text": {"S": "Hello"}}}
+        assert items[0]["SenderApp"] == {"S": "BOTTE_HTTP_ENDPOINT"}
+        # Not sent via Telegram.
+        assert fake_telegram_server.requests == []
+
+    def test_messages(self, fake_telegram_server, fake_dynamodb_client):
+        response = lambda_handler(
+            ApiGatewayV2EventToLambdaFactory.make_for_post_request(
+                path="/messages",
+                body_dict={
+                    "messages": [{"text": f"Hello {i}"} for i in range(3)],
+                    "sender_app": "PYTEST",
+                    "do_enqueue": True,
+                },
+            ),
+            self.context,
+        )
+        assert response["statusCode"] == 202
+        task_ids = json.loads(response["body"])["task_ids"]
+        items = list(fake_dynamodb_client.items.values())
+        assert [item["SK"]["S"] for item in items] == task_ids
+        # FIFO, by default, so all tasks share the same PK: a FIFO group for this
+        #  request only, not the global FIFO group.
+        (pk,) = {item["PK"]["S"] for item in items}
+        assert pk.startswith("BOTTE_MESSAGE#") and pk not in task_ids
+        assert fake_dynamodb_client.n_requests == {"batch_write_item": 1}
+        assert fake_telegram_server.requests == []
+
+    def test_messages_fifo_group_per_request(
+        self, fake_telegram_server, fake_dynamodb_client
+    ):
+        for i in range(2):
+            response = lambda_handler(
+                ApiGatewayV2EventToLambdaFactory.make_for_post_request(
+                    path="/messages",
+                    body_dict={
+                        "messages": [{"text": f"Hello {i}"}, {"text": f"Bye {i}"}],
+                        "do_enqueue": True,
+                    },
+                ),
+                self.context,
+            )
+            assert response["statusCode"] == 202
+        # The tasks of different requests are sent concurrently.
+        pks = {item["PK"]["S"] for item in fake_dynamodb_client.items.values()}
+        assert len(pks) == 2
+
+    def test_message_dynamodb_error(self, fake_telegram_server, fake_dynamodb_client):
+        def put_item(**kwargs):
+            raise botocore.exceptions.ClientError(
+                {"Error": {"Code": "InternalServerError", "Message": "XXX"}},
+                "PutItem",
+            )
+
+        fake_dynamodb_client.put_item = put_item
+        response = lambda_handler(
+            ApiGatewayV2EventToLambdaFactory.make_for_post_request(
+                path="/message",
+                body_dict={"text": "Hello", "do_enqueue": True},
+            ),
+            self.context,
+        )
+        assert response["statusCode"] == 503
+        body = json.loads(response["body"])
+        assert "InternalServerError" in body["error"]
+        assert body["task_ids"] == []
+        assert fake_telegram_server.requests == []
+
+    def test_messages_unprocessed_items(
+        self, fake_telegram_server, fake_dynamodb_client, monkeypatch
+    ):
+        monkeypatch.setattr(time, "sleep", lambda _: None)
+        batch_write_item = fake_dynamodb_client.batch_write_item
+
+        def batch_write_first_item(RequestItems):  # noqa: N803
+            # Only the first item is written, the others are always unprocessed.
+            ((table_name, requests),) = RequestItems.items()
+            batch_write_item({table_name: requests[:1]})
+            return {"UnprocessedItems": {table_name: requests[1:]}}
+
+        fake_dynamodb_client.batch_write_item = batch_write_first_item
+        response = lambda_handler(
+            ApiGatewayV2EventToLambdaFactory.make_for_post_request(
+                path="/messages",
+                body_dict={
+                    "messages": [{"text": f"Hello {i}"} for i in range(10)],
+                    "do_enqueue": True,
+                },
+            ),
+            self.context,
+        )
+        assert response["statusCode"] == 503
+        body = json.loads(response["body"])
+        assert "not processed by BatchWriteItem" in body["error"]
+        # The first try and 3 retries, each writing 1 item.
+        items = list(fake_dynamodb_client.items.values())
+        assert len(items) == dynamodb_task_enqueuer.BATCH_WRITE_MAX_RETRIES + 1
+        assert body["task_ids"] == [item["SK"]["S"] for item in items]
+        assert fake_telegram_server.requests == []
@@ -1,5 +1,7 @@
 import json
+import time
 
+import pytest
 from aws_utils.aws_testfactories.lambda_context_factory import (
     LambdaContextFactory,
 )
@@ -31,3 +33,65 @@ class TestMessageView:
         assert response["statusCode"] == 400
         body = json.loads(response["body"])
         assert body == "Payload parameter 'text' required"
+
+    @pytest.mark.novcr
+    def test_retry_after_past_deadline(self, fake_telegram_server):
+        """
+        A 429 with a Retry-After longer than the time left before the Lambda timeout
+         fails fast with a 504, instead of waiting and timing out.
+        """
+        fake_telegram_server.n_429 = 1
+        fake_telegram_server.retry_after = 5
+        self.context.get_remaining_time_in_millis = lambda: 3000
+        start = time.monotonic()
+        response = lambda_handler(self.payload, self.context)
+        assert time.monotonic() - start < 1
+        assert response["statusCode"] == 504
+        assert json.loads(response["body"])["error"].startswith("Not sent:")
+        assert fake_telegram_server.requests == []
+
+    @pytest.mark.novcr
+    def test_many_messages(self, fake_telegram_server):
+        fake_telegram_server.error_texts = {"Hello 1"}
+        response = lambda_handler(
+            dict(
+                messages=[{"text": f"Hello {i}"} for i in range(3)],
+                sender_app="BOTTE_BE_PYTESTS",
+            ),
+            self.context,
+        )
+        assert response["statusCode"] == 200
+        results = json.loads(response["body"])["results"]
+        assert [x["status_code"] for x in results] == [200, 400, 200]
+        assert results[0]["message"]["text"] == "Hello 0"
+        assert [x["params"]["text"] for x in fake_telegram_server.requests] == [
+            "Hello 0",
+            "Hello 1",
+            "Hello 2",
+        ]
+        # All sent via the same connection.
+        assert fake_telegram_server.n_connections == 1
+
+    @pytest.mark.novcr
+    def test_many_messages_parallel(self, fake_telegram_server):
+        response = lambda_handler(
+            dict(
+                messages=[{"text": f"Hello {i}"} for i in range(3)],
+                do_send_in_order=False,
+            ),
+            self.context,
+        )
+        assert response["statusCode"] == 200
+        results = json.loads(response["body"])["results"]
+        assert [x["message"]["text"] for x in results] == [
+            "Hello 0",
+            "Hello 1",
+            "Hello 2",
+        ]
+
+    def test_many_messages_invalid(self):
+        response = lambda_handler(
+            dict(messages=[{"text": ""}], sender_app="BOTTE_BE_PYTESTS"),
+            self.context,
+        )
+        assert response["statusCode"] == 400